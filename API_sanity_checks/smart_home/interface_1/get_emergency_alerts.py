@@ -16,7 +16,15 @@ class GetEmergencyAlerts(Tool):
         alerts = data.get("emergency_alerts", {})
         results = []
 
-        for alert in alerts.values():
+        # Narrow to the matching alert index groups when available
+        index = getattr(data, "alert_index", None)
+        rows = alerts.values()
+        if index is not None:
+            narrow_resolved = resolved_by_user is not None and resolved_by_user != "None"
+            rows = index.alerts(home_id=home_id, alert_type=alert_type,
+                                status="resolved" if narrow_resolved else None)
+
+        for alert in rows:
             if home_id is not None and str(alert.get("home_id")) != home_id:
                 continue
             if device_id is not None and str(alert.get("device_id")) != device_id:
@@ -7,7 +7,10 @@ class GetEnergyTariffsInfo(Tool):
     def invoke(data: Dict[str, Any],
                home_id: str) -> str:
         tariffs = data.get("energy_tariffs", {})
-        results = [t for t in tariffs.values() if t.get("home_id") == home_id]
+        # Visit only the home's tariffs when the schedule is available
+        schedule = getattr(data, "tariff_schedule", None)
+        rows = schedule.home_tariffs(home_id) if schedule is not None else tariffs.values()
+        results = [t for t in rows if t.get("home_id") == home_id]
         return json.dumps(results)
 
     @staticmethod
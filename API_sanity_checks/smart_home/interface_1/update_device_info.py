@@ -55,6 +55,9 @@ class UpdateDeviceInfo(Tool):
 
         device["updated_at"] = timestamp
 
+        if hasattr(devices, "reindex"):
+            devices.reindex(device_id)
+
         # Prepare return data
         result = dict(device)
 
@@ -67,6 +70,8 @@ class UpdateDeviceInfo(Tool):
                 if color is not None:
                     bulb["color"] = color
                 bulb["updated_at"] = timestamp
+                if hasattr(smart_bulbs, "reindex"):
+                    smart_bulbs.reindex(device_id)
 
                 result["brightness_level"] = bulb.get("brightness_level")
                 result["color"] = bulb.get("color")
@@ -24,6 +24,10 @@ class UpdateHomeInfo(Tool):
             home["home_type"] = home_type
 
         home["updated_at"] = timestamp
+
+        if hasattr(homes, "reindex"):
+            homes.reindex(str(home_id))
+
         return json.dumps(home)
 
     @staticmethod
@@ -12,6 +12,8 @@ class AddCommand(Tool):
                thermostat_new_current_temperature: float = None) -> str:
         
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             if not table:
                 return "1"
             return str(max(int(k) for k in table.keys()) + 1)
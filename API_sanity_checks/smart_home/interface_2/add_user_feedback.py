@@ -11,6 +11,8 @@ class AddUserFeedback(Tool):
                rating: int) -> str:
 
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             return str(max([int(k) for k in table.keys()], default=0) + 1)
 
         timestamp = "2025-10-01T00:00:00"
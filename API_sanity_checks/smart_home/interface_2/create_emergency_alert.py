@@ -12,6 +12,8 @@ class CreateEmergencyAlert(Tool):
                triggered_at: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             return str(max([int(k) for k in table.keys()] or [0]) + 1)
 
         alerts = data.setdefault("emergency_alerts", {})
@@ -11,7 +11,11 @@ class GetAlertsByAlertType(Tool):
         alerts = data.get("emergency_alerts", {})
         results = []
 
-        for alert in alerts.values():
+        # Narrow to the matching alert index groups when available
+        index = getattr(data, "alert_index", None)
+        rows = index.alerts(home_id=home_id, alert_type=alert_type) if index is not None else alerts.values()
+
+        for alert in rows:
             if alert.get("alert_type") == alert_type and str(alert.get("home_id")) == home_id:
                 results.append(alert)
 
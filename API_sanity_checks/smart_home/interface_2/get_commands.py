@@ -16,10 +16,14 @@ class GetCommand(Tool):
             ("thermostat_commands", "thermostat_command", "thermostat_command_id", {"current_temperature": "current_temperature"})
         ]
         
+        # Read only the device's or routine's partition of the command log when available
+        log = getattr(data, "command_log", None)
+
         for table_name, command_type, id_field, specific_fields in tables:
             commands = data.get(table_name, {})
+            rows = log.commands(table_name, routine_id, device_id) if log is not None else commands.values()
             
-            for cmd in commands.values():
+            for cmd in rows:
                 # Apply filters based on the three cases
                 if routine_id and device_id:
                     # Case 3: Both parameters given
@@ -11,7 +11,11 @@ class GetEnergyTariffsDetails(Tool):
         tariffs = data.get("energy_tariffs", {})
         results = []
 
-        for tariff in tariffs.values():
+        # Visit only the home's tariffs when the schedule is available
+        schedule = getattr(data, "tariff_schedule", None)
+        rows = schedule.home_tariffs(home_id) if schedule is not None else tariffs.values()
+
+        for tariff in rows:
             if tariff.get("home_id") != home_id:
                 continue
 
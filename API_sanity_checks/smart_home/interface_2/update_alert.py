@@ -34,6 +34,9 @@ class UpdateAlert(Tool):
             alert["resolved_by_user"] = resolved_by_user
             alert["resolved_at"] = resolved_at or default_time
 
+        if hasattr(alerts, "reindex"):
+            alerts.reindex(alert_id)
+
         return json.dumps(alert)
 
     @staticmethod
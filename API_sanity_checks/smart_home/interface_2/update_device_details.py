@@ -55,6 +55,9 @@ class UpdateDeviceDetails(Tool):
             device["daily_rated_power_consumption_kWh"] = daily_rated_power_consumption_kWh
         device["updated_at"] = timestamp
 
+        if hasattr(devices, "reindex"):
+            devices.reindex(device_id)
+
         result = dict(device)
 
         # If thermostat, update and include smart_thermostat info
@@ -70,6 +73,8 @@ class UpdateDeviceDetails(Tool):
                 if last_adjustment_time is not None:
                     thermo["last_adjustment_time"] = last_adjustment_time
                 thermo["updated_at"] = timestamp
+                if hasattr(thermostats, "reindex"):
+                    thermostats.reindex(device_id)
 
                 result.update({
                     "current_temperate": thermo.get("current_temperate"),
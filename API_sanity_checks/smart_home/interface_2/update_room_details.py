@@ -31,6 +31,10 @@ class UpdateRoomDetails(Tool):
                     room["status"] = "occupied"
 
         room["updated_at"] = timestamp
+
+        if hasattr(rooms, "reindex"):
+            rooms.reindex(str(room_id))
+
         return json.dumps(room)
 
     @staticmethod
@@ -14,6 +14,8 @@ class AddAlert(Tool):
         alerts = data.setdefault("emergency_alerts", {})
 
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             return str(max([int(k) for k in table.keys()] or [0]) + 1)
 
         alert_id = generate_id(alerts)
@@ -13,7 +13,15 @@ class FetchAlertsInfo(Tool):
         alerts = data.get("emergency_alerts", {})
         results = []
 
-        for alert in alerts.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = alerts.values()
+        if hasattr(alerts, "candidates"):
+            filters = {"device_id": device_id}
+            if isinstance(severity_level, str):
+                filters["severity_level"] = severity_level
+            rows = alerts.candidates(filters, include_missing=True)
+
+        for alert in rows:
             if device_id is not None and str(alert.get("device_id")) != device_id:
                 continue
             if severity_level is not None and alert.get("severity_level") != severity_level:
@@ -17,7 +17,14 @@ class FetchDevicesInfo(Tool):
         devices = data.get("devices", {})
         results = []
 
-        for d in devices.values():
+        # Let the planner pick the most selective ID or size cut-off when indexes are available
+        rows = devices.values()
+        if hasattr(devices, "range_candidates"):
+            rows = devices.range_candidates(
+                [("width_ft", "<", less_than_width_ft), ("length_ft", "<", less_than_length_ft)],
+                {"device_id": device_id, "room_id": room_id})
+
+        for d in rows:
             if device_id and str(d.get("device_id")) != device_id:
                 continue
             if room_id and d.get("room_id") != room_id:
@@ -43,6 +43,9 @@ class UpdateDeviceInfo(Tool):
 
         device["updated_at"] = timestamp
 
+        if hasattr(devices, "reindex"):
+            devices.reindex(device_id)
+
         return json.dumps({
             "success": True,
             "device_id": device_id,
@@ -32,6 +32,9 @@ class UpdateRoomInfo(Tool):
             room["status"] = status
 
         room["updated_at"] = timestamp
+
+        if hasattr(rooms, "reindex"):
+            rooms.reindex(str(room_id))
         return json.dumps(room)
 
     @staticmethod
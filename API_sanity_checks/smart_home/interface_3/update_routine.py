@@ -35,6 +35,9 @@ class UpdateRoutine(Tool):
 
         routine["updated_at"] = timestamp
 
+        if hasattr(routines, "reindex"):
+            routines.reindex(str(routine_id))
+
         return json.dumps(routine)
 
     @staticmethod
@@ -42,6 +42,9 @@ class UpdateUserInfo(Tool):
         # Always update the timestamp
         user["updated_at"] = "2025-10-01T00:00:00"
 
+        if hasattr(users, "reindex"):
+            users.reindex(user_id)
+
         return json.dumps(user)
 
     @staticmethod
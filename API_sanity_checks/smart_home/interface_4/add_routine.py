@@ -13,6 +13,8 @@ class AddRoutine(Tool):
                action_interval: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             return str(max([int(k) for k in table.keys()] or [0]) + 1)
 
         routines = data.setdefault("automated_routines", {})
@@ -17,7 +17,19 @@ class FetchDevicesDetails(Tool):
         cameras = data.get("security_cameras", {})
         results = []
 
-        for d in devices.values():
+        # Only visit the devices of the requested room when the hierarchy is available,
+        # otherwise let the planner pick the most selective ID or size/price cut-off
+        rows = devices.values()
+        hierarchy = getattr(data, "home_hierarchy", None)
+        if hierarchy is not None and room_id:
+            rows = hierarchy.device_candidates(room_id=room_id)
+        elif hasattr(devices, "range_candidates"):
+            rows = devices.range_candidates(
+                [("width_ft", "<", less_than_width_ft), ("length_ft", "<", less_than_length_ft),
+                 ("price", "<=", price)],
+                {"device_id": device_id, "room_id": room_id})
+
+        for d in rows:
             if device_id and str(d.get("device_id")) != device_id:
                 continue
             if room_id and d.get("room_id") != room_id:
@@ -16,6 +16,13 @@ class FetchHistoricalEnergyConsumptionByHome(Tool):
         if not home_id:
             return json.dumps({"total_power_used_kWh": 0.0})
 
+        # Answered from the columnar store when it can reproduce the scan exactly
+        store = getattr(data, "energy_store", None)
+        if store is not None:
+            total = store.home_total(home_id, date=date, month=month)
+            if total is not None:
+                return json.dumps({"total_power_used_kWh": total})
+
         filtered = [r for r in records.values() if str(r.get("home_id")) == home_id]
 
         if date:
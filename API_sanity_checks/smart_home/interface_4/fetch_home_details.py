@@ -13,8 +13,12 @@ class FetchHomeDetails(Tool):
         users = data.get("users", {})
         rooms = data.get("rooms", {})
 
+        # Walk the maintained home hierarchy instead of whole tables when available
+        hierarchy = getattr(data, "home_hierarchy", None)
+        home_rows = hierarchy.home_candidates(home_id, owner_id) if hierarchy is not None else homes.values()
+
         home = next(
-            (h for h in homes.values()
+            (h for h in home_rows
              if h.get("home_id") == home_id and
                 h.get("owner_id") == owner_id),
             None
@@ -25,13 +29,13 @@ class FetchHomeDetails(Tool):
 
         address_id = home.get("address_id")
         total_users = sum(
-            1 for u in users.values()
+            1 for u in (hierarchy.residents(address_id) if hierarchy is not None else users.values())
             if u.get("primary_address_id") == address_id
         )
 
         list_rooms = [
             {"room_id": r.get("room_id")}
-            for r in rooms.values()
+            for r in (hierarchy.home_rooms(home_id) if hierarchy is not None else rooms.values())
             if r.get("home_id") == home_id
         ]
 
@@ -15,7 +15,11 @@ class FetchRoutine(Tool):
         routines = data.get("automated_routines", {})
         results = []
 
-        for r in routines.values():
+        # Narrow to the smallest routine index group when available
+        index = getattr(data, "routine_index", None)
+        rows = index.candidates(routine_id, user_id) if index is not None else routines.values()
+
+        for r in rows:
             if routine_id and r.get("routine_id") != routine_id:
                 continue
             if user_id and r.get("user_id") != user_id:
@@ -15,7 +15,15 @@ class ListAlertIds(Tool):
         emergency_alerts = data.get("emergency_alerts", {})
         result = []
 
-        for alert_id, alert in emergency_alerts.items():
+        # Narrow to the matching alert index groups when available
+        index = getattr(data, "alert_index", None)
+        items = emergency_alerts.items()
+        if index is not None:
+            narrow_resolved = bool(resolved_by_user) and resolved_by_user != "None"
+            items = index.alert_items(alert_type=alert_type or None,
+                                      status="resolved" if narrow_resolved else None)
+
+        for alert_id, alert in items:
             if alert_type and alert.get("alert_type") != alert_type:
                 continue
             if acknowledged_by_user and str(alert.get("acknowledged_by_user")) != acknowledged_by_user:
@@ -12,7 +12,13 @@ class ListFeedbacks(Tool):
         feedbacks = data.get("user_feedbacks", {})
         results: List[Dict[str, Any]] = []
 
-        for feedback in feedbacks.values():
+        # Only visit the device's own feedbacks when the rating aggregates are available
+        rows = feedbacks.values()
+        aggregates = getattr(data, "rating_aggregates", None)
+        if aggregates is not None and device_id:
+            rows = aggregates.feedbacks(device_id)
+
+        for feedback in rows:
             if user_id and str(feedback.get("user_id")) != user_id:
                 continue
             if device_id and str(feedback.get("device_id")) != device_id:
@@ -19,6 +19,9 @@ class MarkUserInactive(Tool):
         user["status"] = new_status
         user["updated_at"] = "2025-10-01T00:00:00"
 
+        if hasattr(users, "reindex"):
+            users.reindex(user_id)
+
         return json.dumps(user)
 
     @staticmethod
@@ -33,6 +33,9 @@ class UpdateAlert(Tool):
         if severity_level is not None:
             alert["severity_level"] = severity_level
 
+        if hasattr(alerts, "reindex"):
+            alerts.reindex(alert_id)
+
         return json.dumps(alert)
 
     @staticmethod
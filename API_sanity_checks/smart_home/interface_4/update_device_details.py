@@ -47,6 +47,10 @@ class UpdateDeviceDetails(Tool):
             device["daily_rated_power_consumption_kWh"] = daily_rated_power_consumption_kWh
 
         device["updated_at"] = timestamp
+
+        if hasattr(devices, "reindex"):
+            devices.reindex(device_id)
+
         result = {
             "device_id": device["device_id"],
             "device_type": device.get("device_type"),
@@ -68,6 +72,8 @@ class UpdateDeviceDetails(Tool):
                 if last_activity_timestamp is not None:
                     camera["last_activity_timestamp"] = last_activity_timestamp
                 camera["updated_at"] = timestamp
+                if hasattr(cameras, "reindex"):
+                    cameras.reindex(device_id)
 
                 result["resolution"] = camera.get("resolution")
                 result["last_activity_timestamp"] = camera.get("last_activity_timestamp")
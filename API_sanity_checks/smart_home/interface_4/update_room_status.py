@@ -26,6 +26,9 @@ class UpdateRoomStatus(Tool):
             room["status"] = status
 
         room["updated_at"] = timestamp
+
+        if hasattr(rooms, "reindex"):
+            rooms.reindex(str(room_id))
         return json.dumps(room)
 
     @staticmethod
@@ -10,6 +10,14 @@ class AverageRatingDevice(Tool):
         Compute the average rating for the specified device based on user feedback.
         """
         feedbacks = data.get("user_feedbacks", {})
+
+        # Running per-device totals answer in O(1) when available
+        aggregates = getattr(data, "rating_aggregates", None)
+        if aggregates is not None:
+            average = aggregates.average(device_id)
+            if average is not None:
+                return json.dumps({"average_rating": average})
+
         total_rating = 0
         count = 0
 
@@ -11,6 +11,8 @@ class CreateCommand(Tool):
                device_status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             if not table:
                 return "1"
             return str(max(int(k) for k in table.keys()) + 1)
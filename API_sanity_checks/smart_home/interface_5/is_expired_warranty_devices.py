@@ -26,7 +26,14 @@ class IsExpiredWarrantyDevices(Tool):
 
         result = []
 
-        for device in devices.values():
+        # The cached expiry timeline answers "expired as of current_date" with one bisect when available
+        items = devices.items()
+        expired = None
+        timeline = getattr(data, "warranty_timeline", None)
+        if timeline is not None:
+            items, expired = timeline.split(current_date_obj, home_id=home_id, room_id=room_id)
+
+        for key, device in items:
             if device_id and str(device.get("device_id")) != device_id:
                 continue
             if home_id and str(device.get("home_id")) != home_id:
@@ -34,12 +41,15 @@ class IsExpiredWarrantyDevices(Tool):
             if room_id and str(device.get("room_id")) != room_id:
                 continue
 
-            insurance_str = device.get("insurance_expiry_date")
-            try:
-                insurance_date = datetime.strptime(insurance_str, "%Y-%m-%d").date()
-                is_expired = insurance_date < current_date_obj
-            except Exception:
-                is_expired = True  # treat invalid date as expired
+            if expired is not None:
+                is_expired = key in expired
+            else:
+                insurance_str = device.get("insurance_expiry_date")
+                try:
+                    insurance_date = datetime.strptime(insurance_str, "%Y-%m-%d").date()
+                    is_expired = insurance_date < current_date_obj
+                except Exception:
+                    is_expired = True  # treat invalid date as expired
 
             result.append({
                 "device_id": str(device.get("device_id")),
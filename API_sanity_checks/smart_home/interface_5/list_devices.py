@@ -19,7 +19,19 @@ class ListDevices(Tool):
         devices = data.get("devices", {})
         result = []
 
-        for device in devices.values():
+        # Only visit the devices of the requested home or room when the hierarchy is available,
+        # otherwise let the planner pick the most selective size/price cut-off
+        rows = devices.values()
+        hierarchy = getattr(data, "home_hierarchy", None)
+        if hierarchy is not None and (home_id or room_id):
+            rows = hierarchy.device_candidates(home_id=home_id, room_id=room_id)
+        elif hasattr(devices, "range_candidates"):
+            rows = devices.range_candidates(
+                [("width_ft", "<", less_than_width_ft), ("length_ft", "<", less_than_length_ft),
+                 ("price", "==", price)],
+                {"home_id": home_id, "room_id": room_id})
+
+        for device in rows:
             if home_id and str(device.get("home_id")) != home_id:
                 continue
             if room_id and str(device.get("room_id")) != room_id:
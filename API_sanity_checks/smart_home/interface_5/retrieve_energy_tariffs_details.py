@@ -7,7 +7,10 @@ class RetrieveEnergyTariffsDetails(Tool):
     def invoke(data: Dict[str, Any],
                home_id: str) -> str:
         tariffs = data.get("energy_tariffs", {})
-        results = [tariff for tariff in tariffs.values() if tariff.get("home_id") == home_id]
+        # Visit only the home's tariffs when the schedule is available
+        schedule = getattr(data, "tariff_schedule", None)
+        rows = schedule.home_tariffs(home_id) if schedule is not None else tariffs.values()
+        results = [tariff for tariff in rows if tariff.get("home_id") == home_id]
         return json.dumps(results)
 
     @staticmethod
@@ -17,6 +17,13 @@ class RetrieveHistoricalEnergyConsumptionByDevice(Tool):
         if not device_id:
             return json.dumps({"total_power_used_kWh": 0.0})
 
+        # Answered from the columnar store when it can reproduce the scan exactly
+        store = getattr(data, "energy_store", None)
+        if store is not None:
+            total = store.device_total(device_id, date=date, month=month)
+            if total is not None:
+                return json.dumps({"total_power_used_kWh": total})
+
         # Filter records by device_id (as string)
         filtered = [
             r for r in records.values()
@@ -30,7 +30,14 @@ class RetrieveUserProfile(Tool):
         target_phone = normalize_phone(phone_number)
         target_email = email.lower() if email else None
 
-        for user in users.values():
+        # Use the maintained phone index when available
+        user_rows = users.values()
+        if phone_number and target_phone:
+            phones = getattr(data, "phone_index", None)
+            if phones is not None:
+                user_rows = phones.suffix_matches(target_phone)
+
+        for user in user_rows:
             # Apply filters
             if user_id and user.get("user_id") != user_id:
                 continue
@@ -56,7 +63,13 @@ class RetrieveUserProfile(Tool):
             # Find the home whose address_id matches this user's primary_address_id
             primary_addr_id = user.get("primary_address_id")
             primary_home: Optional[Dict[str, Any]] = None
-            for h in homes.values():
+            home_rows = homes.values()
+            if isinstance(primary_addr_id, str):
+                # Use the maintained address -> home links when available
+                hierarchy = getattr(data, "home_hierarchy", None)
+                if hierarchy is not None:
+                    home_rows = hierarchy.address_homes(primary_addr_id)
+            for h in home_rows:
                 if h.get("address_id") == primary_addr_id:
                     primary_home = h
                     break
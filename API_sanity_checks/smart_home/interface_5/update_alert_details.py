@@ -35,6 +35,9 @@ class UpdateAlertDetails(Tool):
         if severity_level is not None:
             alert["severity_level"] = severity_level
 
+        if hasattr(alerts, "reindex"):
+            alerts.reindex(alert_id)
+
         return json.dumps(alert)
 
     @staticmethod
@@ -0,0 +1,10 @@
+from . import instrumentation
+from .columnar import ColumnarTable, columnar_data
+from .id_allocator import IdAllocator
+from .indexed_data import IndexedData, index_data
+from .indexed_table import HashIndex, IndexedTable
+from .loader import load_data_dir, load_table, parse_json
+from .memo import ToolCache, memoize_tool, normalize_args
+from .overlay import OverlayData, OverlayTable, overlay_data
+from .streaming import iter_json_array, iter_pages, paginate, write_json_array
+from .table_view import KeyBuckets, TableView
@@ -0,0 +1,243 @@
+"""
+Columnar storage for large, append-mostly environment tables.
+
+A loaded table is a ``Dict[str, Dict]`` in which every row repeats its keys
+and holds its own boxed floats, ints and copies of enum strings (``status``,
+``side``, ``currency``...). ``ColumnarTable`` keeps the same rows as:
+
+- one column per field: ``array('d')`` for floats, ``array('q')`` for ints
+  and a list for anything else, with strings interned so repeated enum
+  values share one object
+- one interned *shape* per row: the tuple of its field names in order, so
+  rows with missing or reordered fields round-trip exactly
+
+It is a ``dict`` subclass that still behaves like ``Dict[str, Dict]`` for the
+tools, ``json.dumps`` and ``tau_bench``'s ``to_hashable``:
+
+- the dict storage maps each key to its row slot, so ``len``, ``in``, key
+  iteration and order are the native ones
+- ``table[key]``/``get``/``setdefault`` return a real ``dict``; that row then
+  stays *hot* (kept as the object itself) so in-place edits persist
+- rows written with ``table[key] = row`` are kept hot as well
+- ``values()``/``items()`` yield hot rows or rows rebuilt from the columns;
+  rebuilt rows are transient, so edit a row through ``table[key]``
+
+``compact()`` folds hot rows back into the columns. Column types are picked
+from the values and widened to a list when a value does not fit.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _typecode(value: Any) -> Optional[str]:
+    """Array typecode able to store ``value`` exactly, if any."""
+    if type(value) is float:
+        return "d"
+    if type(value) is int and _INT64_MIN <= value <= _INT64_MAX:
+        return "q"
+    return None
+
+
+class Column:
+    """Values of one field for every row slot."""
+
+    __slots__ = ("typecode", "values")
+
+    def __init__(self, typecode: Optional[str], size: int):
+        self.typecode = typecode
+        if typecode is None:
+            self.values = [None] * size
+        else:
+            self.values = array(typecode, bytes(array(typecode).itemsize * size))
+
+    def append(self, value: Any) -> None:
+        if self.typecode is not None and _typecode(value) != self.typecode:
+            # Widen to a plain list; the stored numbers keep their values
+            self.values = list(self.values)
+            self.typecode = None
+        if self.typecode is None and type(value) is str:
+            value = sys.intern(value)
+        self.values.append(value)
+
+    def pad(self) -> None:
+        self.values.append(None if self.typecode is None else 0)
+
+
+class ColumnarTable(dict):
+    """``dict`` of rows stored column-wise."""
+
+    def __init__(self, rows: Optional[Dict[Hashable, Any]] = None):
+        super().__init__()
+        self._load(rows or {})
+
+    def _load(self, rows: Dict[Hashable, Any]) -> None:
+        dict.clear(self)
+        self._columns: Dict[Hashable, Column] = {}
+        self._shapes: List[Tuple[Hashable, ...]] = []
+        self._shape_ids: Dict[Tuple[Hashable, ...], int] = {}
+        # Shape ID per slot; -1 marks a slot whose row is only kept hot
+        self._row_shapes = array("l")
+        self._hot: Dict[int, Any] = {}
+        for key, row in rows.items():
+            slot = len(self._row_shapes)
+            dict.__setitem__(self, key, slot)
+            if isinstance(row, dict):
+                self._append_row(slot, row)
+            else:
+                self._row_shapes.append(-1)
+                self._hot[slot] = row
+                for column in self._columns.values():
+                    column.pad()
+
+    def _append_row(self, slot: int, row: Dict[Hashable, Any]) -> None:
+        shape = tuple(row)
+        shape_id = self._shape_ids.get(shape)
+        if shape_id is None:
+            shape_id = self._shape_ids[shape] = len(self._shapes)
+            self._shapes.append(shape)
+        self._row_shapes.append(shape_id)
+        for name, value in row.items():
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = Column(_typecode(value), slot)
+            column.append(value)
+        for name, column in self._columns.items():
+            if len(column.values) == slot:
+                column.pad()
+
+    def _row(self, slot: int) -> Any:
+        row = self._hot.get(slot)
+        if row is not None or slot in self._hot:
+            return row
+        columns = self._columns
+        return {name: columns[name].values[slot] for name in self._shapes[self._row_shapes[slot]]}
+
+    def _hot_row(self, slot: int) -> Any:
+        if slot not in self._hot:
+            self._hot[slot] = self._row(slot)
+        return self._hot[slot]
+
+    # ---- dict API ----
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._hot_row(dict.__getitem__(self, key))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        slot = dict.get(self, key)
+        if slot is None:
+            return default
+        return self._hot_row(slot)
+
+    def __setitem__(self, key: Hashable, row: Any) -> None:
+        slot = dict.get(self, key)
+        if slot is None:
+            slot = len(self._row_shapes)
+            self._row_shapes.append(-1)
+            for column in self._columns.values():
+                column.pad()
+            dict.__setitem__(self, key, slot)
+        self._hot[slot] = row
+
+    def __delitem__(self, key: Hashable) -> None:
+        self._hot.pop(dict.pop(self, key), None)
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        if dict.__contains__(self, key):
+            row = self[key]
+            del self[key]
+            return row
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, row in dict(*args, **kwargs).items():
+            self[key] = row
+
+    def __ior__(self, other: Any) -> "ColumnarTable":
+        self.update(other)
+        return self
+
+    def __or__(self, other: Any) -> Dict[Hashable, Any]:
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other: Any) -> Dict[Hashable, Any]:
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = dict(other)
+        merged.update(self.items())
+        return merged
+
+    def clear(self) -> None:
+        self._load({})
+
+    def __iter__(self) -> Iterator[Hashable]:
+        # Defined so dict(table) and {**table} go through keys() and __getitem__
+        return iter(dict.keys(self))
+
+    def values(self) -> List[Any]:
+        return [self._row(slot) for slot in dict.values(self)]
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        return [(key, self._row(slot)) for key, slot in dict.items(self)]
+
+    def copy(self) -> Dict[Hashable, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, dict):
+            return NotImplemented
+        if isinstance(other, ColumnarTable):
+            other = other.copy()
+        return self.copy() == other
+
+    def __ne__(self, other: Any) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def __reduce__(self):
+        return (self.__class__, (self.copy(),))
+
+    # ---- columnar ----
+
+    def compact(self) -> None:
+        """Fold hot rows back into the columns and drop deleted slots."""
+        self._load(self.copy())
+
+    def hot_rows(self) -> int:
+        """Number of rows currently kept as ``dict`` objects."""
+        return len(self._hot)
+
+
+def columnar_data(data: Dict[str, Any], tables: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Store ``tables`` of ``data`` (default: every dict-of-rows table) column-wise, in place."""
+    for name in (tables if tables is not None else list(data)):
+        table = data.get(name)
+        if isinstance(table, dict) and not isinstance(table, ColumnarTable):
+            data[name] = ColumnarTable(table)
+    return data
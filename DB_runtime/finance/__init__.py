@@ -0,0 +1,4 @@
+from .finance_data import FinanceData, index_finance_data
+from .fulfillment import CommitmentRollup
+from .holdings_view import HoldingsView
+from .price_series import PriceSeries
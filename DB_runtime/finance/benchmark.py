@@ -0,0 +1,385 @@
+"""
+Benchmark of every ``finance/interface_1..5`` tool on scaled datasets.
+
+Loads ``DB_sanity_checks/finance/data``, scales it with ``scale_data``
+(1x, 10x and 100x by default, foreign keys from ``relationships.yaml``)
+and times each tool's ``invoke`` with arguments picked from the scaled data:
+
+- enum parameters take a value from the schema's ``enum``
+- other parameters take the value of the same-named column, from one
+  seeded sample row of the table covering most parameters, else from any
+  table holding that column; required ones fall back to a typed default
+- arguments a tool rejects with ``Must be one of [...]`` are replaced by
+  the first allowed value
+- ``--args FILE`` (JSON ``{"tool_name": {...}}``) overrides the picked
+  arguments of the listed tools
+
+A first call on a copy-on-write overlay tells reads from writes and, for
+writes, which rows they touch. Every call is timed on the benchmarked data
+itself, so ``--indexed`` writes keep their indexes, ID allocators and
+stores; after each write the touched rows are put back through the table's
+dict API (outside the timed section) so it never changes what later tools
+see. Results go to a JSON file; ``--baseline`` compares the
+median times with an earlier result file and exits with status 1 when a
+tool got slower than ``--tolerance`` allows:
+
+    python -m DB_runtime.finance.benchmark --scales 1 10 --output bench.json
+    python -m DB_runtime.finance.benchmark --baseline bench.json
+"""
+
+import argparse
+import ast
+import copy
+import glob
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from ..loader import load_data_dir
+from ..overlay import overlay_data
+from ..scaling import load_relationships, scale_data
+from .finance_data import index_finance_data
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(REPO_ROOT, "DB_sanity_checks", "finance", "data")
+RELATIONSHIPS_FILE = os.path.join(REPO_ROOT, "DB_sanity_checks", "finance", "relationships.yaml")
+TOOLS_DIR = os.path.join(REPO_ROOT, "finance")
+INTERFACE_DIR_NAMES = [f"interface_{i}" for i in range(1, 6)]
+
+DEFAULT_SCALES = [1, 10, 100]
+# Rows sampled per table when collecting argument values
+SAMPLE_ROWS = 200
+
+# Parameters named differently from the column holding their values
+PARAMETER_COLUMNS = {
+    "date": ["price_date", "nav_date"],
+    "email": ["email", "contact_email"],
+    "class_": ["class"],
+    "class_name": ["class"],
+    "start_date": ["trade_date", "price_date"],
+    "end_date": ["trade_date", "price_date"],
+    "recipient_id": ["user_id"],
+}
+
+_ALLOWED_VALUES = re.compile(r"one of (\[.*?\])", re.IGNORECASE)
+
+TYPE_DEFAULTS = {"string": "1", "integer": 1, "number": 1.0, "boolean": True, "object": {}, "array": []}
+
+
+# -------------------- tools --------------------
+
+def load_tools(tools_dir: str = TOOLS_DIR) -> List[Tuple[str, Type[Any]]]:
+    """``(interface, Tool class)`` for every tool file, imported by path."""
+    from tau_bench.envs.tool import Tool
+
+    tools = []
+    for interface in INTERFACE_DIR_NAMES:
+        for path in sorted(glob.glob(os.path.join(tools_dir, interface, "*.py"))):
+            if os.path.basename(path) == "__init__.py":
+                continue
+            module_name = f"finance_{interface}_{os.path.splitext(os.path.basename(path))[0]}"
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            for obj in vars(module).values():
+                if inspect.isclass(obj) and issubclass(obj, Tool) and obj is not Tool \
+                        and obj.__module__ == module_name:
+                    tools.append((interface, obj))
+    return tools
+
+
+def tool_name(tool: Type[Any]) -> str:
+    return tool.get_info()["function"]["name"]
+
+
+# -------------------- arguments --------------------
+
+def column_values(data: Dict[str, Any], seed: int = 0) -> Dict[str, Any]:
+    """Seeded sample of every table's rows, and the scalar values per column name."""
+    rng = random.Random(seed)
+    rows_by_table: Dict[str, List[Dict[str, Any]]] = {}
+    values: Dict[str, List[Any]] = {}
+    for name, table in data.items():
+        if not isinstance(table, dict) or not table:
+            continue
+        rows = [row for row in rng.sample(list(table.values()), min(SAMPLE_ROWS, len(table)))
+                if isinstance(row, dict)]
+        rows_by_table[name] = rows
+        for row in rows:
+            for column, value in row.items():
+                if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                    values.setdefault(column, []).append(value)
+    return {"rows": rows_by_table, "values": values}
+
+
+def _coerce(value: Any, kind: Optional[str]) -> Any:
+    if kind == "string":
+        return str(value)
+    if kind in ("number", "integer") and isinstance(value, str):
+        try:
+            return float(value) if kind == "number" else int(value)
+        except ValueError:
+            return TYPE_DEFAULTS[kind]
+    return value
+
+
+def pick_arguments(tool: Type[Any], samples: Dict[str, Any], seed: int = 0) -> Dict[str, Any]:
+    """Arguments for ``tool`` built from its ``get_info()`` schema and ``column_values`` samples.
+
+    Parameters found in one table are taken from the same row, so related
+    arguments (``user_id`` and ``email``, ``fund_id`` and ``investor_id``)
+    match each other.
+    """
+    rng = random.Random(f"{seed}:{tool_name(tool)}")
+    parameters = tool.get_info()["function"].get("parameters", {})
+    properties = parameters.get("properties", {})
+    required = set(parameters.get("required", []))
+    columns = {name: PARAMETER_COLUMNS.get(name, [name]) for name, spec in properties.items()
+               if not spec.get("enum") and spec.get("type") not in ("object", "array")}
+
+    row: Dict[str, Any] = {}
+    best = 0
+    for rows in samples["rows"].values():
+        covered = sum(1 for names in columns.values() if any(column in rows[0] for column in names))
+        if covered > best:
+            best, row = covered, rng.choice(rows)
+
+    arguments = {}
+    for name, spec in properties.items():
+        kind = spec.get("type")
+        if spec.get("enum"):
+            arguments[name] = rng.choice(spec["enum"])
+        elif name in columns:
+            in_row = [row[column] for column in columns[name] if row.get(column) is not None]
+            pool = [value for column in columns[name] for value in samples["values"].get(column, [])]
+            if in_row or pool:
+                arguments[name] = _coerce(in_row[0] if in_row else rng.choice(pool), kind)
+            elif name in required:
+                arguments[name] = TYPE_DEFAULTS.get(kind, "1")
+        elif name in required:
+            arguments[name] = TYPE_DEFAULTS.get(kind, "1")
+    return arguments
+
+
+def refine_arguments(tool: Type[Any], data: Dict[str, Any], arguments: Dict[str, Any],
+                     attempts: int = 5) -> Dict[str, Any]:
+    """Fix arguments rejected with a ``... Must be one of [...]`` validation error.
+
+    Tools validate many values (currencies, statuses, types) that their
+    schema does not list; the allowed values are taken from the message and
+    the first one is used for the argument it names.
+    """
+    arguments = dict(arguments)
+    for _ in range(attempts):
+        try:
+            tool.invoke(overlay_data(data), **dict(arguments))
+            break
+        except Exception as e:
+            message = str(e)
+        match = _ALLOWED_VALUES.search(message)
+        if match is None:
+            break
+        try:
+            allowed = ast.literal_eval(match.group(1))
+        except (SyntaxError, ValueError):
+            break
+        subject = message[:match.start()].lower()
+        names = [name for name in arguments
+                 if name in subject or name.replace("_", " ") in subject]
+        invalid = re.search(r"invalid (\w+)", subject)
+        if not names and invalid:
+            # "Invalid currency" for base_currency
+            names = [name for name in arguments if invalid.group(1) in name]
+        if not allowed or not names or arguments[names[-1]] == allowed[0]:
+            break
+        arguments[names[-1]] = allowed[0]
+    return arguments
+
+
+# -------------------- timing --------------------
+
+def _call(tool: Type[Any], data: Dict[str, Any], arguments: Dict[str, Any]) -> Tuple[int, str, int]:
+    """``(duration ns, status, output bytes)`` of one call."""
+    start = time.perf_counter_ns()
+    try:
+        output = tool.invoke(data, **arguments)
+        status = "ok"
+    except Exception as e:
+        output = ""
+        status = type(e).__name__
+    duration = time.perf_counter_ns() - start
+    return duration, status, len(output) if isinstance(output, str) else 0
+
+
+_MISSING = object()
+
+
+def _snapshot(data: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """What ``_restore`` needs to undo a write whose overlay ``diff()`` was ``changes``."""
+    saved = {}
+    for name, change in changes.items():
+        table = dict.get(data, name, _MISSING)
+        if "replaced" in change or "removed" in change or not isinstance(table, dict):
+            saved[name] = {"table": copy.deepcopy(table)}
+            continue
+        touched = [*change["updated"], *change["deleted"]]
+        saved[name] = {
+            "keys": set(table) if change["added"] else None,
+            "rows": {key: copy.deepcopy(dict.__getitem__(table, key)) for key in touched},
+            "order": list(table) if change["deleted"] else None,
+        }
+    return saved
+
+
+def _restore(data: Dict[str, Any], saved: Dict[str, Any]) -> None:
+    """Put the tables of ``_snapshot`` back, keeping indexed tables and their views."""
+    stores = list(getattr(data, "_stores", ()))
+    for name, state in saved.items():
+        if "table" in state:
+            if state["table"] is _MISSING:
+                if name in data:
+                    del data[name]
+            else:
+                data[name] = state["table"]
+            continue
+        table = dict.__getitem__(data, name)
+        if state["keys"] is not None:
+            for key in [key for key in table if key not in state["keys"]]:
+                del table[key]
+        if state["order"] is None:
+            for key, row in state["rows"].items():
+                table[key] = row
+        else:
+            rows = {**table, **state["rows"]}
+            table.clear()
+            table.update((key, rows[key]) for key in state["order"])
+    # Rebuild the derived stores a replaced table dropped before the next timed call
+    for name in stores:
+        getattr(data, name, None)
+
+
+def time_tool(tool: Type[Any], data: Dict[str, Any], arguments: Dict[str, Any],
+              repeat: int) -> Dict[str, Any]:
+    """Time ``repeat`` calls on ``data``; writes are undone after each call."""
+    probe = overlay_data(data)
+    _, status, output_bytes = _call(tool, probe, dict(arguments))
+    changes = probe.diff()
+
+    durations = []
+    for _ in range(repeat):
+        saved = _snapshot(data, changes) if changes else None
+        duration, status, output_bytes = _call(tool, data, dict(arguments))
+        durations.append(duration)
+        if saved is not None:
+            _restore(data, saved)
+    return {
+        "kind": "write" if changes else "read",
+        "status": status,
+        "output_bytes": output_bytes,
+        "calls": repeat,
+        "min_ms": min(durations) / 1e6,
+        "median_ms": statistics.median(durations) / 1e6,
+        "mean_ms": statistics.fmean(durations) / 1e6,
+        "max_ms": max(durations) / 1e6,
+    }
+
+
+def run(scales: List[int], repeat: int = 5, seed: int = 0, indexed: bool = False,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+        tools: Optional[List[Tuple[str, Type[Any]]]] = None) -> Dict[str, Any]:
+    """Benchmark every tool at every scale; returns the JSON-serializable results."""
+    tools = tools if tools is not None else load_tools()
+    overrides = overrides or {}
+    base = load_data_dir(DATA_DIR)
+    relationships = load_relationships(RELATIONSHIPS_FILE)
+
+    results: Dict[str, Any] = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "indexed": indexed,
+        "scales": {},
+    }
+    for scale in scales:
+        start = time.perf_counter()
+        data = scale_data(base, scale, relationships)
+        if indexed:
+            data = index_finance_data(data)
+        print(f"[INFO] {scale}x: {sum(len(t) for t in data.values() if isinstance(t, dict))} rows "
+              f"built in {time.perf_counter() - start:.1f}s")
+        samples = column_values(data, seed)
+        scale_results = {}
+        for interface, tool in tools:
+            name = tool_name(tool)
+            arguments = overrides.get(name)
+            if arguments is None:
+                arguments = refine_arguments(tool, data, pick_arguments(tool, samples, seed))
+            entry = time_tool(tool, data, arguments, repeat)
+            entry["arguments"] = arguments
+            scale_results[f"{interface}.{name}"] = entry
+            print(f"[INFO] {scale}x {interface}.{name}: {entry['median_ms']:.3f} ms ({entry['status']})")
+        results["scales"][str(scale)] = {
+            "rows": {name: len(table) for name, table in data.items() if isinstance(table, dict)},
+            "tools": scale_results,
+        }
+    return results
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.25,
+            min_ms: float = 0.05) -> List[Dict[str, Any]]:
+    """Tools whose median time grew by more than ``tolerance`` (and ``min_ms``) since ``baseline``."""
+    regressions = []
+    for scale, scale_results in current["scales"].items():
+        previous = baseline.get("scales", {}).get(scale, {}).get("tools", {})
+        for name, entry in scale_results["tools"].items():
+            before = previous.get(name)
+            if before is None:
+                continue
+            after_ms, before_ms = entry["median_ms"], before["median_ms"]
+            if after_ms > before_ms * (1 + tolerance) and after_ms - before_ms > min_ms:
+                regressions.append({"scale": scale, "tool": name, "baseline_ms": before_ms,
+                                    "median_ms": after_ms, "ratio": after_ms / before_ms if before_ms else None})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the finance tools on scaled datasets.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Scale factors")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed calls per tool")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the argument sampling")
+    parser.add_argument("--indexed", action="store_true", help="Run on index_finance_data(data)")
+    parser.add_argument("--args", help="JSON file of per-tool argument overrides")
+    parser.add_argument("--output", default="finance_benchmark.json", help="Result file")
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    args = parser.parse_args()
+
+    overrides = None
+    if args.args:
+        with open(args.args, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    results = run(args.scales, args.repeat, args.seed, args.indexed, overrides)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"[INFO] Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(json.load(f), results, args.tolerance)
+        for regression in regressions:
+            print(f"[FAIL] {regression['scale']}x {regression['tool']}: "
+                  f"{regression['baseline_ms']:.3f} -> {regression['median_ms']:.3f} ms")
+        if regressions:
+            sys.exit(1)
+        print("[PASS] No regressions")
@@ -0,0 +1,57 @@
+"""
+Indexed container for the finance database.
+
+``FinanceData`` is an ``IndexedData`` that also exposes the finance-specific
+derived stores. Each store is built on first access and then follows the
+table it is attached to.
+"""
+
+from typing import Any, Dict, Optional
+
+from ..indexed_data import IndexedData
+from .fulfillment import CommitmentRollup
+from .holdings_view import HoldingsView
+from .price_series import PriceSeries
+
+try:
+    from .nav_series import NavSeries
+except ImportError:  # NumPy is optional; NAV tools then keep their scans
+    NavSeries = None
+
+
+class FinanceData(IndexedData):
+    """Finance ``data`` dict with derived lookup stores."""
+
+    writes_reindexed = True
+
+    @property
+    def price_series(self) -> PriceSeries:
+        """``instrument_prices`` grouped by instrument and date."""
+        return self._store("price_series", lambda: PriceSeries(self.table("instrument_prices")),
+                           ("instrument_prices",))
+
+    @property
+    def commitment_rollup(self) -> CommitmentRollup:
+        """Completed-payment totals per invoice and per commitment."""
+        return self._store("commitment_rollup",
+                           lambda: CommitmentRollup(self.table("invoices"), self.table("payments")),
+                           ("invoices", "payments"))
+
+    @property
+    def holdings_view(self) -> HoldingsView:
+        """Portfolios and holdings per investor."""
+        return self._store("holdings_view",
+                           lambda: HoldingsView(self.table("portfolios"), self.table("portfolio_holdings")),
+                           ("portfolios", "portfolio_holdings"))
+
+    @property
+    def nav_series(self) -> Optional["NavSeries"]:
+        """Per-fund ``nav_records`` series, or ``None`` without NumPy."""
+        if NavSeries is None:
+            return None
+        return self._store("nav_series", lambda: NavSeries(self.table("nav_records")), ("nav_records",))
+
+
+def index_finance_data(data: Dict[str, Any]) -> FinanceData:
+    """Wrap a loaded finance database for indexed lookups."""
+    return FinanceData(data)
@@ -0,0 +1,182 @@
+"""
+Commitment -> invoice -> completed payment rollup.
+
+``get_commitment_fulfillment_percentage`` collects a commitment's invoices
+and, for each of them, scans ``payments`` for completed payments, which is
+O(invoices x payments) per call. ``CommitmentRollup`` keeps:
+
+- invoice keys grouped by ``commitment_id`` (and by ``invoice_id``)
+- completed payment keys grouped by ``invoice_id``
+- cached ``Decimal`` totals per invoice and per commitment
+
+Both sides are ``TableView``s, so ``issue_invoice``/``create_invoice``,
+``register_payment``/``record_payment``, deletes and the ``reindex`` calls of
+``update_invoice``/``update_payment_details`` drop exactly the cached totals
+they affect. Totals are computed on demand with the tool's own expression,
+``Decimal(str(payment.get("amount", 0)))``, summed in table order, so results
+stay Decimal-exact and a malformed amount raises when it is queried, as
+before.
+
+Grouping uses the raw column values (``==`` semantics, like the tool's
+filters); callers query with string IDs.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Hashable, List, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+
+_UNLINKED = object()
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class _InvoiceLinks(TableView):
+    """Invoices grouped by ``commitment_id`` and by ``invoice_id``."""
+
+    def __init__(self, rollup: "CommitmentRollup", table: IndexedTable):
+        self.rollup = rollup
+        self.table = table
+        self.by_commitment = KeyBuckets(table)
+        self.by_invoice_id = KeyBuckets(table)
+        self.row_links: Dict[Hashable, Tuple[Any, Any]] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def reset(self) -> None:
+        self.by_commitment.clear()
+        self.by_invoice_id.clear()
+        self.row_links.clear()
+        self.rollup._commitment_totals.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            return
+        commitment_id, invoice_id = row.get("commitment_id"), row.get("invoice_id")
+        if not _hashable(commitment_id):
+            # Such an invoice can never match a string commitment ID
+            return
+        if not _hashable(invoice_id):
+            # Its payments are found by the scan over unhashable payment links
+            invoice_id = _UNLINKED
+        self.by_commitment.add(commitment_id, key)
+        self.by_invoice_id.add(invoice_id, key)
+        self.row_links[key] = (commitment_id, invoice_id)
+        self.rollup._commitment_totals.pop(commitment_id, None)
+
+    def discard(self, key: Hashable) -> None:
+        links = self.row_links.pop(key, None)
+        if links is None:
+            return
+        commitment_id, invoice_id = links
+        self.by_commitment.remove(commitment_id, key)
+        self.by_invoice_id.remove(invoice_id, key)
+        self.rollup._commitment_totals.pop(commitment_id, None)
+
+
+class _CompletedPayments(TableView):
+    """Completed payments grouped by ``invoice_id``."""
+
+    def __init__(self, rollup: "CommitmentRollup", table: IndexedTable):
+        self.rollup = rollup
+        self.table = table
+        self.by_invoice_id = KeyBuckets(table)
+        self.row_invoice: Dict[Hashable, Any] = {}
+        # Completed payments whose invoice_id cannot be hashed; matched by scan
+        self.unhashable: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def reset(self) -> None:
+        self.by_invoice_id.clear()
+        self.row_invoice.clear()
+        self.unhashable.clear()
+        self.rollup._invoice_totals.clear()
+        self.rollup._commitment_totals.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict) or row.get("status") != "completed":
+            return
+        invoice_id = row.get("invoice_id")
+        if not _hashable(invoice_id):
+            self.unhashable[key] = None
+            self.rollup._invoice_totals.clear()
+            self.rollup._commitment_totals.clear()
+            return
+        self.by_invoice_id.add(invoice_id, key)
+        self.row_invoice[key] = invoice_id
+        self.rollup._invalidate_invoice(invoice_id)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.unhashable:
+            del self.unhashable[key]
+            self.rollup._invoice_totals.clear()
+            self.rollup._commitment_totals.clear()
+            return
+        if key not in self.row_invoice:
+            return
+        invoice_id = self.row_invoice.pop(key)
+        self.by_invoice_id.remove(invoice_id, key)
+        self.rollup._invalidate_invoice(invoice_id)
+
+
+class CommitmentRollup:
+    """Completed-payment totals per invoice and per commitment."""
+
+    def __init__(self, invoices: IndexedTable, payments: IndexedTable):
+        self._invoice_totals: Dict[Hashable, Decimal] = {}
+        self._commitment_totals: Dict[Hashable, Decimal] = {}
+        self.invoices = _InvoiceLinks(self, invoices)
+        self.payments = _CompletedPayments(self, payments)
+
+    def _invalidate_invoice(self, invoice_id: Hashable) -> None:
+        self._invoice_totals.pop(invoice_id, None)
+        for key in self.invoices.by_invoice_id.keys(invoice_id):
+            self._commitment_totals.pop(self.invoices.row_links[key][0], None)
+
+    def invoices_for(self, commitment_id: Any) -> List[Dict[str, Any]]:
+        """Invoices whose ``commitment_id == commitment_id``, in table order."""
+        if not _hashable(commitment_id):
+            return []
+        table = self.invoices.table
+        return [dict.__getitem__(table, key) for key in self.invoices.by_commitment.keys(commitment_id)]
+
+    def paid_for_invoice(self, invoice_id: Any) -> Decimal:
+        """Sum of completed payment amounts whose ``invoice_id == invoice_id``."""
+        hashable = _hashable(invoice_id)
+        if hashable and invoice_id in self._invoice_totals:
+            return self._invoice_totals[invoice_id]
+        table = self.payments.table
+        keys = list(self.payments.by_invoice_id.keys(invoice_id)) if hashable else []
+        if self.payments.unhashable:
+            keys = sorted(keys + list(self.payments.unhashable), key=table.position)
+        total = Decimal("0")
+        for key in keys:
+            payment = dict.__getitem__(table, key)
+            if payment.get("invoice_id") == invoice_id:
+                total += Decimal(str(payment.get("amount", 0)))
+        if hashable:
+            self._invoice_totals[invoice_id] = total
+        return total
+
+    def total_paid(self, commitment_id: Any) -> Decimal:
+        """Completed payments over all invoices of ``commitment_id``."""
+        if not _hashable(commitment_id):
+            return Decimal("0")
+        total = self._commitment_totals.get(commitment_id)
+        if total is None:
+            total = Decimal("0")
+            for invoice in self.invoices_for(commitment_id):
+                total += self.paid_for_invoice(invoice.get("invoice_id"))
+            self._commitment_totals[commitment_id] = total
+        return total
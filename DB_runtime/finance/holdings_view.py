@@ -0,0 +1,174 @@
+"""
+Investor -> portfolios -> holdings view.
+
+``get_investor_portfolio``, ``get_investor_portfolio_holdings``,
+``fetch_investor_portfolio`` and ``fetch_investors_with_portfolio_holdings``
+join ``portfolios`` and ``portfolio_holdings`` by scanning them for every
+investor and portfolio. ``HoldingsView`` keeps:
+
+- portfolio keys grouped by ``investor_id`` and by ``portfolio_id``
+- holding keys grouped by ``portfolio_id``
+- the joined ``[(portfolio key, [holding keys])]`` list per investor,
+  materialized on first read
+
+Both sides are ``TableView``s, so ``create_portfolio``, ``add_new_holding``,
+``remove_holding``/``delete_holding`` and the ``reindex`` call of
+``update_investor_portfolio_holding`` update the groups and drop only the
+joined lists of the investors they touch. Rows are returned as the table's
+own objects, so in-place edits show without any invalidation; instrument
+details are still looked up by the tools at read time.
+
+Grouping uses the raw column values (``==`` semantics, like the tools'
+filters). Rows whose ``portfolio_id`` cannot be hashed are kept aside and
+matched by scan.
+"""
+
+from typing import Any, Dict, Hashable, List, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+_UNHASHABLE = object()
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class _PortfolioLinks(TableView):
+    """Portfolios grouped by ``investor_id`` and by ``portfolio_id``."""
+
+    def __init__(self, view: "HoldingsView", table: IndexedTable):
+        self.view = view
+        self.table = table
+        self.by_investor = KeyBuckets(table)
+        self.by_portfolio_id = KeyBuckets(table)
+        self.row_links: Dict[Hashable, Tuple[Any, Any]] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def reset(self) -> None:
+        self.by_investor.clear()
+        self.by_portfolio_id.clear()
+        self.row_links.clear()
+        self.view._joined.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            return
+        investor_id, portfolio_id = row.get("investor_id"), row.get("portfolio_id")
+        if not _hashable(investor_id):
+            # Such a portfolio can never match an investor ID
+            return
+        if not _hashable(portfolio_id):
+            portfolio_id = _UNHASHABLE
+        self.by_investor.add(investor_id, key)
+        self.by_portfolio_id.add(portfolio_id, key)
+        self.row_links[key] = (investor_id, portfolio_id)
+        self.view._joined.pop(investor_id, None)
+
+    def discard(self, key: Hashable) -> None:
+        links = self.row_links.pop(key, None)
+        if links is None:
+            return
+        investor_id, portfolio_id = links
+        self.by_investor.remove(investor_id, key)
+        self.by_portfolio_id.remove(portfolio_id, key)
+        self.view._joined.pop(investor_id, None)
+
+
+class _HoldingLinks(TableView):
+    """Holdings grouped by ``portfolio_id``."""
+
+    def __init__(self, view: "HoldingsView", table: IndexedTable):
+        self.view = view
+        self.table = table
+        self.by_portfolio_id = KeyBuckets(table)
+        self.row_portfolio: Dict[Hashable, Any] = {}
+        # Holdings whose portfolio_id cannot be hashed; matched by scan
+        self.unhashable: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def reset(self) -> None:
+        self.by_portfolio_id.clear()
+        self.row_portfolio.clear()
+        self.unhashable.clear()
+        self.view._joined.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            return
+        portfolio_id = row.get("portfolio_id")
+        if not _hashable(portfolio_id):
+            self.unhashable[key] = None
+            self.view._joined.clear()
+            return
+        self.by_portfolio_id.add(portfolio_id, key)
+        self.row_portfolio[key] = portfolio_id
+        self.view._invalidate_portfolio(portfolio_id)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.unhashable:
+            del self.unhashable[key]
+            self.view._joined.clear()
+            return
+        if key not in self.row_portfolio:
+            return
+        portfolio_id = self.row_portfolio.pop(key)
+        self.by_portfolio_id.remove(portfolio_id, key)
+        self.view._invalidate_portfolio(portfolio_id)
+
+
+class HoldingsView:
+    """Portfolios and their holdings per investor."""
+
+    def __init__(self, portfolios: IndexedTable, holdings: IndexedTable):
+        self._joined: Dict[Hashable, List[Tuple[Hashable, List[Hashable]]]] = {}
+        self.portfolios = _PortfolioLinks(self, portfolios)
+        self.holdings = _HoldingLinks(self, holdings)
+
+    def _invalidate_portfolio(self, portfolio_id: Hashable) -> None:
+        for key in self.portfolios.by_portfolio_id.keys(portfolio_id):
+            self._joined.pop(self.portfolios.row_links[key][0], None)
+
+    def _holding_keys(self, portfolio_id: Any) -> List[Hashable]:
+        table = self.holdings.table
+        keys = list(self.holdings.by_portfolio_id.keys(portfolio_id)) if _hashable(portfolio_id) else []
+        if self.holdings.unhashable:
+            keys = sorted(keys + list(self.holdings.unhashable), key=table.position)
+            keys = [key for key in keys if dict.__getitem__(table, key).get("portfolio_id") == portfolio_id]
+        return keys
+
+    def portfolios_of(self, investor_id: Any) -> List[Dict[str, Any]]:
+        """Portfolios whose ``investor_id == investor_id``, in table order."""
+        if not _hashable(investor_id):
+            return []
+        table = self.portfolios.table
+        return [dict.__getitem__(table, key) for key in self.portfolios.by_investor.keys(investor_id)]
+
+    def holdings_of(self, portfolio_id: Any) -> List[Dict[str, Any]]:
+        """Holdings whose ``portfolio_id == portfolio_id``, in table order."""
+        table = self.holdings.table
+        return [dict.__getitem__(table, key) for key in self._holding_keys(portfolio_id)]
+
+    def investor_holdings(self, investor_id: Any) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """``(portfolio, holdings)`` pairs of ``investor_id``, both in table order."""
+        if not _hashable(investor_id):
+            return []
+        joined = self._joined.get(investor_id)
+        if joined is None:
+            joined = []
+            for key in self.portfolios.by_investor.keys(investor_id):
+                portfolio = dict.__getitem__(self.portfolios.table, key)
+                joined.append((key, self._holding_keys(portfolio.get("portfolio_id"))))
+            self._joined[investor_id] = joined
+        portfolios, holdings = self.portfolios.table, self.holdings.table
+        return [(dict.__getitem__(portfolios, key), [dict.__getitem__(holdings, h) for h in holding_keys])
+                for key, holding_keys in joined]
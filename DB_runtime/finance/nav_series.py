@@ -0,0 +1,217 @@
+"""
+Per-fund NAV time series over the finance ``nav_records`` table.
+
+The NAV tools filter every record of a fund, sort them by ``nav_date`` and
+walk the list to find a date and the record before it, on every call.
+``NavSeries`` keeps each fund's records grouped and, once a fund is queried,
+its date-sorted series as NumPy arrays:
+
+- ``dates``: the sorted ``nav_date`` strings
+- ``values``: ``float(nav_value)`` as float64 (NaN where it does not parse)
+- ``keys``: the matching table keys
+
+Inserts, deletes and ``reindex`` calls only mark the touched fund dirty; its
+arrays are rebuilt on its next query. Lookups by date are then a
+``searchsorted`` (bisect) and the batch P&L is computed for many funds and
+dates with array operations.
+
+Funds are grouped by their raw ``fund_id`` (``==`` semantics, not ``str``).
+Records are sorted with the tools' own key, ``row.get("nav_date", "")``, as a
+stable sort, so ties keep table order and incomparable dates raise the same
+``TypeError`` the tools would.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class FundSeries:
+    """Date-sorted NAV arrays of one fund."""
+
+    def __init__(self, keys: List[Hashable], rows: List[Dict[str, Any]]):
+        order = sorted(range(len(rows)), key=lambda i: rows[i].get("nav_date", ""))
+        self.keys = [keys[i] for i in order]
+        self.rows = [rows[i] for i in order]
+        dates = [row.get("nav_date", "") for row in self.rows]
+        # Only plain string dates can be searched as a NumPy string array
+        self.dates = np.array(dates) if all(isinstance(d, str) for d in dates) else None
+        self.values = np.array([_as_float(row.get("nav_value", 0)) for row in self.rows],
+                               dtype=np.float64)
+
+    def first_on(self, nav_date: Any) -> int:
+        """Sorted position of the first record dated ``nav_date``, or -1."""
+        if self.dates is not None and isinstance(nav_date, str):
+            i = int(np.searchsorted(self.dates, nav_date, side="left"))
+            if i < len(self.rows) and self.rows[i].get("nav_date") == nav_date:
+                return i
+            return -1
+        for i, row in enumerate(self.rows):
+            if row.get("nav_date") == nav_date:
+                return i
+        return -1
+
+
+class NavSeries(TableView):
+    """Per-fund NAV series over ``nav_records``."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._by_fund = KeyBuckets(table)
+        self._by_fund_date = KeyBuckets(table)
+        self._row_slots: Dict[Hashable, Tuple[Hashable, Optional[Hashable]]] = {}
+        self._series: Dict[Hashable, FundSeries] = {}
+        self._dirty: Set[Hashable] = set()
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._by_fund.clear()
+        self._by_fund_date.clear()
+        self._row_slots.clear()
+        self._series.clear()
+        self._dirty.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            return
+        fund_id = row.get("fund_id")
+        if not _hashable(fund_id):
+            return
+        nav_date = row.get("nav_date")
+        slot = (fund_id, nav_date) if _hashable(nav_date) else None
+        self._by_fund.add(fund_id, key)
+        if slot is not None:
+            self._by_fund_date.add(slot, key)
+        self._row_slots[key] = (fund_id, slot)
+        self._dirty.add(fund_id)
+
+    def discard(self, key: Hashable) -> None:
+        slots = self._row_slots.pop(key, None)
+        if slots is None:
+            return
+        fund_id, slot = slots
+        self._by_fund.remove(fund_id, key)
+        if slot is not None:
+            self._by_fund_date.remove(slot, key)
+        self._dirty.add(fund_id)
+
+    # ---- lookups ----
+
+    def series(self, fund_id: Any) -> Optional[FundSeries]:
+        """Sorted arrays of ``fund_id``, rebuilt if the fund changed."""
+        if not _hashable(fund_id) or fund_id not in self._by_fund:
+            return None
+        if fund_id in self._dirty or fund_id not in self._series:
+            keys = list(self._by_fund.keys(fund_id))
+            rows = [dict.__getitem__(self.table, key) for key in keys]
+            self._series[fund_id] = FundSeries(keys, rows)
+            self._dirty.discard(fund_id)
+        return self._series[fund_id]
+
+    def records(self, fund_id: Any) -> List[Dict[str, Any]]:
+        """Records of ``fund_id`` sorted by ``nav_date`` (ties in table order)."""
+        series = self.series(fund_id)
+        return list(series.rows) if series is not None else []
+
+    def nav_on(self, fund_id: Any, nav_date: Any) -> Optional[Dict[str, Any]]:
+        """First record, in table order, of ``fund_id`` dated ``nav_date``."""
+        if not (_hashable(fund_id) and _hashable(nav_date)):
+            return None
+        keys = self._by_fund_date.keys((fund_id, nav_date))
+        if not keys:
+            return None
+        return dict.__getitem__(self.table, next(iter(keys)))
+
+    def current_and_previous(self, fund_id: Any, nav_date: Any
+                             ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Record of ``fund_id`` on ``nav_date`` and the one before it in date order.
+
+        Both are ``None`` when the fund has no record on that date; the
+        previous record is ``None`` for the fund's first date.
+        """
+        series = self.series(fund_id)
+        if series is None:
+            return None, None
+        i = series.first_on(nav_date)
+        if i < 0:
+            return None, None
+        return series.rows[i], (series.rows[i - 1] if i > 0 else None)
+
+    def value_range(self, fund_id: Any, start_date: Optional[str] = None,
+                    end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records of ``fund_id`` with ``start_date <= nav_date <= end_date``, date-sorted."""
+        series = self.series(fund_id)
+        if series is None:
+            return []
+        if series.dates is None:
+            return [row for row in series.rows
+                    if (start_date is None or start_date <= row.get("nav_date", ""))
+                    and (end_date is None or row.get("nav_date", "") <= end_date)]
+        lo = int(np.searchsorted(series.dates, start_date, side="left")) if start_date is not None else 0
+        hi = int(np.searchsorted(series.dates, end_date, side="right")) if end_date is not None else len(series.rows)
+        return series.rows[lo:hi]
+
+    def daily_pnl(self, fund_id: Any, nav_date: Any) -> Optional[float]:
+        """NAV change of ``fund_id`` from the previous record to ``nav_date``.
+
+        ``0.0`` on the fund's first date and ``None`` without a record on
+        ``nav_date``.
+        """
+        series = self.series(fund_id)
+        if series is None:
+            return None
+        i = series.first_on(nav_date)
+        if i < 0:
+            return None
+        if i == 0:
+            return 0.0
+        return float(series.values[i] - series.values[i - 1])
+
+    def batch_daily_pnl(self, fund_ids: Iterable[Any], nav_dates: Iterable[str]) -> np.ndarray:
+        """Daily P&L for every ``(fund, date)`` pair as a ``funds x dates`` float64 array.
+
+        Cells without a NAV record on that date are NaN.
+        """
+        fund_ids = list(fund_ids)
+        query = np.array(list(nav_dates), dtype=str)
+        result = np.full((len(fund_ids), len(query)), np.nan, dtype=np.float64)
+        for row, fund_id in enumerate(fund_ids):
+            series = self.series(fund_id)
+            if series is None or not len(query):
+                continue
+            if series.dates is None:
+                for col, nav_date in enumerate(query.tolist()):
+                    pnl = self.daily_pnl(fund_id, nav_date)
+                    if pnl is not None:
+                        result[row, col] = pnl
+                continue
+            n = len(series.dates)
+            idx = np.searchsorted(series.dates, query, side="left")
+            clipped = np.minimum(idx, n - 1)
+            found = (idx < n) & (series.dates[clipped] == query)
+            previous = series.values[np.maximum(clipped - 1, 0)]
+            pnl = np.where(clipped > 0, series.values[clipped] - previous, 0.0)
+            result[row] = np.where(found, pnl, np.nan)
+        return result
@@ -0,0 +1,137 @@
+"""
+Date-indexed view of the finance ``instrument_prices`` table.
+
+Price tools look records up by ``(instrument_id, price_date)``, which is a
+full scan of the table per lookup (per holding, in the portfolio tools).
+``PriceSeries`` keeps, for every instrument, the keys of its records grouped
+by date plus a sorted list of its dates, so:
+
+- "records of instrument X on date D" is a dict lookup
+- "records on date D" is a dict lookup
+- "latest price on or before D" is a bisect over the instrument's dates
+
+Instrument IDs and dates are grouped by ``bucket_key(value)`` like the hash
+indexes, so callers keep their own equality filters. Only string dates
+(``YYYY-MM-DD``) take part in the ordered lookups.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..indexed_table import IndexedTable, bucket_key
+from ..table_view import KeyBuckets, TableView
+
+
+class PriceSeries(TableView):
+    """Per-instrument, per-date index over ``instrument_prices``."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._by_instrument_date = KeyBuckets(table)
+        self._by_date = KeyBuckets(table)
+        # instrument bucket -> sorted string dates present for it
+        self._dates: Dict[str, List[str]] = {}
+        # Rows per (instrument bucket, string date)
+        self._dated_rows: Dict[Tuple[str, str], int] = {}
+        self._row_slots: Dict[Hashable, Tuple[str, str, Optional[str]]] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._by_instrument_date.clear()
+        self._by_date.clear()
+        self._dates.clear()
+        self._dated_rows.clear()
+        self._row_slots.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            return
+        instrument = bucket_key(row.get("instrument_id"))
+        raw_date = row.get("price_date")
+        date = bucket_key(raw_date)
+        sortable = raw_date if isinstance(raw_date, str) else None
+        slot = (instrument, date)
+        if sortable is not None:
+            dated = (instrument, sortable)
+            count = self._dated_rows.get(dated, 0)
+            if not count:
+                insort(self._dates.setdefault(instrument, []), sortable)
+            self._dated_rows[dated] = count + 1
+        self._by_instrument_date.add(slot, key)
+        self._by_date.add(date, key)
+        self._row_slots[key] = (instrument, date, sortable)
+
+    def discard(self, key: Hashable) -> None:
+        slots = self._row_slots.pop(key, None)
+        if slots is None:
+            return
+        instrument, date, sortable = slots
+        slot = (instrument, date)
+        self._by_instrument_date.remove(slot, key)
+        self._by_date.remove(date, key)
+        if sortable is None:
+            return
+        dated = (instrument, sortable)
+        count = self._dated_rows.pop(dated) - 1
+        if count:
+            self._dated_rows[dated] = count
+            return
+        dates = self._dates[instrument]
+        del dates[bisect_left(dates, sortable)]
+        if not dates:
+            del self._dates[instrument]
+
+    # ---- lookups ----
+
+    def records_on(self, instrument_id: Any, price_date: Any) -> List[Dict[str, Any]]:
+        """Records of ``instrument_id`` dated ``price_date``, in table order."""
+        return self._rows(self._by_instrument_date.keys((bucket_key(instrument_id), bucket_key(price_date))))
+
+    def records_on_date(self, price_date: Any) -> List[Dict[str, Any]]:
+        """Records of every instrument dated ``price_date``, in table order."""
+        return self._rows(self._by_date.keys(bucket_key(price_date)))
+
+    def dates(self, instrument_id: Any) -> List[str]:
+        """Sorted price dates recorded for ``instrument_id``."""
+        return list(self._dates.get(bucket_key(instrument_id), ()))
+
+    def records_between(self, instrument_id: Any, start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records of ``instrument_id`` with ``start_date <= price_date <= end_date``.
+
+        Either bound may be omitted. Records are ordered by date, then by
+        table order.
+        """
+        instrument = bucket_key(instrument_id)
+        dates = self._dates.get(instrument, [])
+        lo = bisect_left(dates, start_date) if start_date is not None else 0
+        hi = bisect_right(dates, end_date) if end_date is not None else len(dates)
+        rows: List[Dict[str, Any]] = []
+        for date in dates[lo:hi]:
+            rows.extend(self._dated(instrument, date))
+        return rows
+
+    def price_as_of(self, instrument_id: Any, as_of_date: str) -> Optional[Dict[str, Any]]:
+        """Latest record of ``instrument_id`` dated on or before ``as_of_date``.
+
+        Ties on the date resolve to the first record in table order. Returns
+        ``None`` when the instrument has no price up to that date.
+        """
+        instrument = bucket_key(instrument_id)
+        dates = self._dates.get(instrument, [])
+        i = bisect_right(dates, as_of_date)
+        if i == 0:
+            return None
+        return self._dated(instrument, dates[i - 1])[0]
+
+    def _rows(self, keys: Dict[Hashable, None]) -> List[Dict[str, Any]]:
+        return [dict.__getitem__(self.table, key) for key in keys]
+
+    def _dated(self, instrument: str, date: str) -> List[Dict[str, Any]]:
+        # Numeric-looking dates that differ as strings can share a bucket
+        return [row for row in self._rows(self._by_instrument_date.keys((instrument, bucket_key(date))))
+                if row.get("price_date") == date]
@@ -0,0 +1,64 @@
+"""
+Monotonic primary-key allocation for ``IndexedTable``.
+
+The create tools allocate IDs with a local ``generate_id`` that returns
+``max(int(k) for k in table.keys()) + 1`` (or ``1`` for an empty table), which
+is O(rows) per insert. ``IdAllocator`` keeps that maximum up to date as the
+table changes, so ``table.next_id()`` returns the very same ID in O(1):
+
+- inserts (from tools or from outside) raise the maximum when needed
+- deleting the current maximum marks it stale; it is recomputed once on the
+  next allocation, exactly like the scan would, so freed top IDs are reused
+"""
+
+from typing import Any, Hashable, Optional, Set
+
+from .table_view import TableView
+
+
+class IdAllocator(TableView):
+    """Tracks ``max(int(key))`` of an ``IndexedTable``."""
+
+    def __init__(self, table: "IndexedTable"):
+        self.table = table
+        self.reset()
+        for key in table:
+            self.add(key, None)
+
+    def reset(self) -> None:
+        self._max: Optional[int] = None
+        self._stale = True
+        # Keys int() rejects; while any exist the scan would raise, so we do too
+        self._invalid: Set[Hashable] = set()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        try:
+            value = int(key)
+        except (TypeError, ValueError):
+            self._invalid.add(key)
+            return
+        if not self._stale and (self._max is None or value > self._max):
+            self._max = value
+
+    def discard(self, key: Hashable) -> None:
+        if key in self._invalid:
+            self._invalid.discard(key)
+            return
+        if self._stale or key in self.table:
+            return
+        try:
+            value = int(key)
+        except (TypeError, ValueError):
+            return
+        if value == self._max:
+            self._stale = True
+
+    def next_id(self) -> int:
+        """The ID ``generate_id`` would return for the table right now."""
+        if self._invalid:
+            # Let the original expression raise its own ValueError
+            return max(int(k) for k in self.table.keys()) + 1
+        if self._stale:
+            self._max = max((int(k) for k in self.table.keys()), default=None)
+            self._stale = False
+        return 1 if self._max is None else self._max + 1
@@ -0,0 +1,109 @@
+"""
+Opt-in indexed container for an environment ``data`` dict.
+
+``index_data(load_data())`` returns an ``IndexedData``: a ``dict`` subclass
+holding the same tables, each wrapped in an ``IndexedTable``. Tools keep
+calling ``data.get("funds", {})`` and iterating rows; the ones that know about
+indexes narrow their scans through ``table.candidates(...)`` when available
+and fall back to the full scan on a plain dict.
+
+Domain containers subclass ``IndexedData`` and expose derived stores (price
+series, rollups, ...) as lazily built attributes through ``_store``, naming
+the tables each store is derived from.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set
+
+from .indexed_table import IndexedTable
+
+
+class IndexedData(dict):
+    """``dict`` of tables whose dict-of-rows tables are ``IndexedTable``s."""
+
+    # Whether every write tool of the domain calls ``reindex`` after editing
+    # rows in place; ``ToolCache`` only memoizes over data that sets it
+    writes_reindexed = False
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self._stores: Dict[str, Any] = {}
+        # Names of the tables read while a recording is active (see ``record``)
+        self._accessed: Optional[Set[str]] = None
+        for name, table in (data or {}).items():
+            self[name] = table
+
+    def __getitem__(self, name: str) -> Any:
+        if self._accessed is not None:
+            self._accessed.add(name)
+        return dict.__getitem__(self, name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if self._accessed is not None:
+            self._accessed.add(name)
+        return dict.get(self, name, default)
+
+    def __contains__(self, name: object) -> bool:
+        if self._accessed is not None:
+            self._accessed.add(name)
+        return dict.__contains__(self, name)
+
+    def __setitem__(self, name: str, table: Any) -> None:
+        if isinstance(table, dict) and not isinstance(table, IndexedTable):
+            table = IndexedTable(table)
+        dict.__setitem__(self, name, table)
+        # Derived stores may be attached to the table being replaced
+        self._stores.clear()
+
+    def __delitem__(self, name: str) -> None:
+        dict.__delitem__(self, name)
+        self._stores.clear()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for name, table in dict(*args, **kwargs).items():
+            self[name] = table
+
+    def setdefault(self, name: str, default: Any = None) -> Any:
+        if name not in self:
+            self[name] = default
+        return dict.__getitem__(self, name)
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def table(self, name: str) -> IndexedTable:
+        """Return the indexed table ``name``.
+
+        Missing tables resolve to a detached empty table, the same way tools
+        see ``data.get(name, {})``; nothing is added to the data.
+        """
+        table = dict.get(self, name)
+        if isinstance(table, IndexedTable):
+            return table
+        return IndexedTable()
+
+    @contextmanager
+    def record(self) -> Iterator[Set[str]]:
+        """Collect the names of the tables read inside the ``with`` block."""
+        previous = self._accessed
+        self._accessed = accessed = set()
+        try:
+            yield accessed
+        finally:
+            self._accessed = previous
+            if previous is not None:
+                previous.update(accessed)
+
+    def _store(self, name: str, factory: Callable[[], Any], tables: Iterable[str] = ()) -> Any:
+        if self._accessed is not None:
+            # A derived store reads the tables it is built from
+            self._accessed.update(tables)
+        store = self._stores.get(name)
+        if store is None:
+            store = self._stores[name] = factory()
+        return store
+
+
+def index_data(data: Dict[str, Any]) -> IndexedData:
+    """Wrap every table of ``data`` for indexed lookups."""
+    return IndexedData(data)
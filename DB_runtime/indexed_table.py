@@ -0,0 +1,399 @@
+"""
+Indexed table wrapper for the in-memory environment databases.
+
+Every environment table is a ``Dict[str, Dict]`` mapping a primary key to a
+row. Tools scan ``table.values()`` to answer foreign-key questions such as
+"all NAV records of fund 7", which is O(rows) per call.
+
+``IndexedTable`` is a drop-in ``dict`` subclass that:
+- keeps the exact dict behaviour (iteration order, ``json.dumps`` output,
+  equality, hashing through ``tau_bench``'s ``to_hashable``)
+- lazily builds a hash index the first time a column is queried
+- keeps every built index (and any attached ``TableView``) in sync with
+  inserts, overwrites and deletes made through the dict API
+
+Rows edited in place (``table[key]["status"] = ...``) bypass the dict API, so
+write tools call ``table.reindex(key)`` after such edits.
+
+``search(column, query)`` narrows case-insensitive exact and substring
+filters through a ``TextIndex`` built on first use, and
+``range_candidates(ranges)`` narrows numeric cut-offs through sorted
+``RangeIndex``es.
+
+Index buckets are keyed by ``bucket_key(value)``: ``str(value)`` with
+numbers, bools and numeric strings folded to one canonical text, so a lookup
+returns a superset of the rows matching either ``==`` or ``str(...) ==``
+comparisons (``100``, ``100.0`` and ``"100"`` share a bucket, as do ``True``
+and ``1``). Only strings and numbers narrow a scan. Callers keep their
+original filter loop and only narrow the rows they iterate over; the
+results are therefore identical to a full scan.
+"""
+
+import re
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .id_allocator import IdAllocator
+from .range_index import RangeIndex, plan_keys
+from .table_view import KeyBuckets, TableView
+from .text_index import TextIndex, search_keys
+
+
+# -------------------- Hash index --------------------
+
+_MISSING = object()
+
+# ``str()`` of the bools, folded into the buckets of 1 and 0
+_BOOL_TEXT = {"True": "1", "False": "0"}
+# ``str()`` of an int or float
+_PRINTED_NUMBER = re.compile(r"-?(?:\d+(?:\.\d+)?(?:e[+-]\d+)?|inf)|nan", re.ASCII)
+
+
+def _canonical_text(text: str) -> str:
+    if text in _BOOL_TEXT:
+        return _BOOL_TEXT[text]
+    if text.isdigit() and text.isascii() and text[0] != "0":
+        # Already the canonical text of an int (the common ID case)
+        return text
+    if not _PRINTED_NUMBER.fullmatch(text):
+        return text
+    try:
+        return str(int(text))
+    except ValueError:
+        return _canonical_float(float(text))
+
+
+def _canonical_float(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def bucket_key(value: Any) -> str:
+    """Normalise a column value to the key of its index bucket.
+
+    Values equal under ``==`` or with equal ``str()``s share a bucket:
+    ints, floats and bools map to one canonical text, and so do the strings
+    they print as (``1``, ``1.0``, ``True``, ``"1"`` and ``"1.0"`` all give
+    ``"1"``). Other values are keyed by their canonical ``str()``.
+    """
+    if isinstance(value, str):
+        return _canonical_text(value)
+    if isinstance(value, float):
+        return _canonical_float(value)
+    if isinstance(value, int):
+        return str(int(value))
+    return _canonical_text(str(value))
+
+
+def narrows(value: Any) -> bool:
+    """Whether a lookup of ``value`` may narrow a scan.
+
+    ``bucket_key`` only guarantees a shared bucket for equal strings and
+    numbers; any other value (a list, a dict, ...) keeps the full scan.
+    """
+    return isinstance(value, (str, int, float))
+
+
+class HashIndex(TableView):
+    """Maps ``bucket_key(row[column])`` to the keys of the matching rows, in table order."""
+
+    narrows = staticmethod(narrows)
+
+    def __init__(self, table: "IndexedTable", column: str):
+        self.table = table
+        self.column = column
+        self._buckets = KeyBuckets(table)
+        self._row_buckets: Dict[Hashable, Any] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+
+    def reset(self) -> None:
+        self._buckets.clear()
+        self._row_buckets.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if isinstance(row, dict) and self.column in row:
+            value = bucket_key(row[self.column])
+        else:
+            value = _MISSING
+        self._buckets.add(value, key)
+        self._row_buckets[key] = value
+
+    def discard(self, key: Hashable) -> None:
+        if key in self._row_buckets:
+            self._buckets.remove(self._row_buckets.pop(key), key)
+
+    def keys_for(self, value: Any) -> Dict[Hashable, None]:
+        return self._buckets.keys(_MISSING if value is _MISSING else bucket_key(value))
+
+    def size(self, value: Any) -> int:
+        return self._buckets.size(_MISSING if value is _MISSING else bucket_key(value))
+
+
+# -------------------- Table --------------------
+
+class IndexedTable(dict):
+    """``dict`` of rows with lazily built secondary indexes.
+
+    ``version`` is bumped on every change made through the dict API or
+    ``reindex``; ``IndexedTable.changes`` counts those changes across all
+    tables.
+    """
+
+    changes = 0
+
+    def __init__(self, rows: Optional[Dict[Hashable, Any]] = None):
+        super().__init__()
+        self.version = 0
+        self._positions: Dict[Hashable, int] = {}
+        self._next_position = 0
+        # Key at each position from ``_first_position`` on (``_MISSING`` once deleted)
+        self._order: List[Hashable] = []
+        self._first_position = 0
+        self._indexes: Dict[str, HashIndex] = {}
+        self._text_indexes: Dict[str, TextIndex] = {}
+        self._range_indexes: Dict[str, RangeIndex] = {}
+        self._views: List[TableView] = []
+        self._id_allocator: Optional[IdAllocator] = None
+        if rows:
+            dict.update(self, rows)
+            self._positions = {key: i for i, key in enumerate(dict.keys(self))}
+            self._next_position = len(self._positions)
+            self._order = list(self._positions)
+
+    # ---- dict API ----
+
+    def _changed(self) -> None:
+        self.version += 1
+        IndexedTable.changes += 1
+
+    def __setitem__(self, key: Hashable, row: Any) -> None:
+        self._changed()
+        if dict.__contains__(self, key):
+            dict.__setitem__(self, key, row)
+            for view in self._views:
+                view.discard(key)
+                view.add(key, row)
+            return
+        dict.__setitem__(self, key, row)
+        self._positions[key] = self._next_position
+        self._next_position += 1
+        self._order.append(key)
+        for view in self._views:
+            view.add(key, row)
+
+    def __delitem__(self, key: Hashable) -> None:
+        dict.__delitem__(self, key)
+        self._forget(key)
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        if dict.__contains__(self, key):
+            row = dict.pop(self, key)
+            self._forget(key)
+            return row
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        key, row = dict.popitem(self)
+        self._forget(key)
+        return key, row
+
+    def clear(self) -> None:
+        self._changed()
+        dict.clear(self)
+        self._positions.clear()
+        self._order = []
+        self._first_position = self._next_position
+        for view in self._views:
+            view.reset()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, row in dict(*args, **kwargs).items():
+            self[key] = row
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def __ior__(self, other: Any) -> "IndexedTable":
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Rebuild from the plain rows; indexes are recreated lazily
+        return (self.__class__, (dict(self),))
+
+    def _forget(self, key: Hashable) -> None:
+        self._changed()
+        position = self._positions.pop(key, None)
+        if position is not None:
+            self._order[position - self._first_position] = _MISSING
+        for view in self._views:
+            view.discard(key)
+
+    # ---- views and indexes ----
+
+    def attach(self, view: TableView) -> TableView:
+        """Register a view that must follow every change to this table."""
+        self._views.append(view)
+        return view
+
+    def detach(self, view: TableView) -> None:
+        self._views.remove(view)
+
+    def position(self, key: Hashable) -> int:
+        """Insertion position of ``key``, i.e. its place in iteration order."""
+        return self._positions[key]
+
+    def items_after(self, position: int) -> Iterator[Tuple[Hashable, Any]]:
+        """Items inserted after ``position``, in iteration order.
+
+        Positions are never reused, so this also resumes correctly after the
+        key at ``position`` was deleted.
+        """
+        order = self._order
+        for i in range(max(position + 1 - self._first_position, 0), len(order)):
+            key = order[i]
+            if key is not _MISSING:
+                yield key, dict.__getitem__(self, key)
+
+    def reindex(self, key: Hashable) -> None:
+        """Refresh indexes and views after the row at ``key`` was edited in place.
+
+        Tools that mutate a row dict directly call this (when the table has it),
+        since the table only sees assignments and deletes of whole rows.
+        """
+        if not dict.__contains__(self, key):
+            return
+        self._changed()
+        row = dict.__getitem__(self, key)
+        for view in self._views:
+            view.discard(key)
+            view.add(key, row)
+
+    def next_id(self) -> int:
+        """Next integer primary key, identical to ``max(int(k) for k in keys) + 1``.
+
+        The create tools' ``generate_id`` helpers call this when the table has
+        it, as the maximum is tracked by an ``IdAllocator`` instead of rescanned.
+        """
+        if self._id_allocator is None:
+            self._id_allocator = self.attach(IdAllocator(self))
+        return self._id_allocator.next_id()
+
+    def index(self, column: str) -> HashIndex:
+        """Return the hash index on ``column``, building it on first use."""
+        index = self._indexes.get(column)
+        if index is None:
+            index = self._indexes[column] = self.attach(HashIndex(self, column))
+        return index
+
+    def text_index(self, column: str) -> TextIndex:
+        """Return the case-insensitive text index on ``column``, building it on first use."""
+        index = self._text_indexes.get(column)
+        if index is None:
+            index = self._text_indexes[column] = self.attach(TextIndex(self, column))
+        return index
+
+    def range_index(self, column: str) -> RangeIndex:
+        """Return the sorted numeric index on ``column``, building it on first use."""
+        index = self._range_indexes.get(column)
+        if index is None:
+            index = self._range_indexes[column] = self.attach(RangeIndex(self, column))
+        return index
+
+    def range_candidates(self, ranges: Iterable[Tuple[str, str, Any]],
+                         criteria: Optional[Dict[str, Any]] = None,
+                         max_fraction: float = 0.3) -> Iterable[Any]:
+        """Narrow a scan with numeric cut-offs and equality criteria.
+
+        ``ranges`` holds ``(column, op, bound)`` predicates with ``op`` one of
+        ``"<"``, ``"<="``, ``"=="`` on ``float(row[column])``; ``criteria``
+        are matched like ``candidates``. The most selective predicate is
+        looked up first and intersected with the other selective ones. When
+        none matches at most ``max_fraction`` of the rows, all rows are
+        returned. The result is a superset of the matching rows, in table
+        order.
+        """
+        keys = plan_keys(self, criteria or {}, list(ranges), max_fraction)
+        if keys is None:
+            return dict.values(self)
+        return [dict.__getitem__(self, key) for key in keys]
+
+    def search_items(self, column: str, query: Any, exact: bool = False,
+                     guard: Iterable[str] = ()) -> Iterable[Tuple[Hashable, Any]]:
+        """Candidate items for a case-insensitive match of ``query`` on ``column``, in table order.
+
+        ``exact`` narrows to ``row[column].lower() == query.lower()``,
+        otherwise to rows that may contain ``query.lower()``. Rows holding a
+        non-string value in ``column`` or in any ``guard`` column (the other
+        columns the caller lower-cases) are always included. A query that is
+        not a non-empty string returns every row.
+        """
+        if not isinstance(query, str) or not query:
+            return dict.items(self)
+        indexes = [self.text_index(name) for name in (column, *guard)]
+        return [(key, dict.__getitem__(self, key)) for key in search_keys(self, indexes, query, exact)]
+
+    def search(self, column: str, query: Any, exact: bool = False,
+               guard: Iterable[str] = ()) -> Iterable[Any]:
+        """Rows of ``search_items``."""
+        if not isinstance(query, str) or not query:
+            return dict.values(self)
+        return [row for _, row in self.search_items(column, query, exact, guard)]
+
+    def lookup(self, column: str, value: Any, include_missing: bool = False) -> List[Any]:
+        """Rows whose ``bucket_key(row[column]) == bucket_key(value)``, in table order.
+
+        With ``include_missing`` rows that lack ``column`` entirely are
+        returned too, which matches filters of the form
+        ``if key in row and row[key] != value: skip``.
+        """
+        return [row for _, row in self._lookup_items(column, value, include_missing)]
+
+    def candidate_items(self, criteria: Dict[str, Any],
+                        include_missing: bool = False) -> Iterable[Tuple[Hashable, Any]]:
+        """Narrow a filtered scan to the smallest matching index bucket.
+
+        Falsy criteria are ignored, mirroring the ``if value and ...`` guards in
+        the tools, and so are values ``narrows`` rejects. Without any usable
+        criterion all items are returned. The result is a superset of the
+        matching rows, in table order.
+        """
+        narrowest = self._narrowest(criteria, include_missing)
+        if narrowest is None:
+            return dict.items(self)
+        return self._lookup_items(narrowest[0], narrowest[1], include_missing)
+
+    def candidates(self, criteria: Dict[str, Any], include_missing: bool = False) -> Iterable[Any]:
+        """Rows of ``candidate_items``."""
+        narrowest = self._narrowest(criteria, include_missing)
+        if narrowest is None:
+            return dict.values(self)
+        return self.lookup(narrowest[0], narrowest[1], include_missing)
+
+    def _narrowest(self, criteria: Dict[str, Any],
+                   include_missing: bool) -> Optional[Tuple[str, Any]]:
+        best = None
+        best_size = 0
+        for column, value in criteria.items():
+            if not value or not narrows(value):
+                continue
+            index = self.index(column)
+            size = index.size(value)
+            if include_missing:
+                size += index.size(_MISSING)
+            if best is None or size < best_size:
+                best, best_size = (column, value), size
+        return best
+
+    def _lookup_items(self, column: str, value: Any,
+                      include_missing: bool) -> List[Tuple[Hashable, Any]]:
+        index = self.index(column)
+        keys = list(index.keys_for(value))
+        if include_missing:
+            missing = index.keys_for(_MISSING)
+            if missing:
+                keys = sorted(keys + list(missing), key=self.position)
+        return [(key, dict.__getitem__(self, key)) for key in keys]
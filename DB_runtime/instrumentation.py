@@ -0,0 +1,336 @@
+"""
+Per-tool call count, latency and rows-scanned instrumentation.
+
+``enable(tools)`` wraps the ``invoke`` of the given ``Tool`` classes (every
+loaded ``tau_bench`` ``Tool`` subclass by default) without touching their
+files; ``disable()`` puts the original ``invoke`` back, so there is no
+overhead at all while disabled. For every call it records:
+
+- the wall time, reported as count, total, p50, p95 and p99 per tool
+- rows scanned per table: rows yielded while iterating a table
+  (``values()``, ``items()``, ``keys()``, ``for key in table``) plus rows
+  returned by index lookups (``candidates``/``lookup``/``search``)
+- key lookups per table (``table[key]``, ``table.get(key)``)
+
+To count rows the tool receives a ``MeteredData`` proxy whose tables are
+``MeteredTable`` proxies; both forward every operation (including writes and
+attributes such as ``candidates`` or ``price_series``) to the real objects.
+
+``report()`` returns the statistics as a JSON-serializable dict and
+``folded_stacks()`` the time per tool in the folded format read by
+``flamegraph.pl`` and speedscope. ``write_report(path)`` writes both.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type
+
+_lock = threading.Lock()
+# Tool class -> its own ``invoke`` attribute before patching (None if inherited)
+_patched: Dict[Type[Any], Any] = {}
+_stats: Dict[str, "ToolStats"] = {}
+
+
+class ToolStats:
+    """Samples collected for one tool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.durations_ns: List[int] = []
+        self.errors = 0
+        self.rows_scanned: Dict[str, int] = {}
+        self.lookups: Dict[str, int] = {}
+
+    def add(self, duration_ns: int, meter: "Meter", failed: bool) -> None:
+        self.durations_ns.append(duration_ns)
+        if failed:
+            self.errors += 1
+        for table, rows in meter.rows_scanned.items():
+            self.rows_scanned[table] = self.rows_scanned.get(table, 0) + rows
+        for table, count in meter.lookups.items():
+            self.lookups[table] = self.lookups.get(table, 0) + count
+
+    def summary(self) -> Dict[str, Any]:
+        durations = sorted(self.durations_ns)
+        return {
+            "calls": len(durations),
+            "errors": self.errors,
+            "total_ms": sum(durations) / 1e6,
+            "p50_ms": _percentile(durations, 50) / 1e6,
+            "p95_ms": _percentile(durations, 95) / 1e6,
+            "p99_ms": _percentile(durations, 99) / 1e6,
+            "rows_scanned": dict(sorted(self.rows_scanned.items())),
+            "lookups": dict(sorted(self.lookups.items())),
+        }
+
+
+def _percentile(sorted_values: List[int], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return float(sorted_values[int(rank) - 1])
+
+
+# -------------------- metering proxies --------------------
+
+# Index helpers of ``IndexedTable`` whose returned rows count as scanned
+_INDEX_LOOKUPS = ("candidates", "candidate_items", "lookup", "search", "search_items")
+
+
+class Meter:
+    """Counters of one ``invoke`` call."""
+
+    def __init__(self):
+        self.rows_scanned: Dict[str, int] = {}
+        self.lookups: Dict[str, int] = {}
+
+    def scanned(self, table: str, rows: int = 1) -> None:
+        self.rows_scanned[table] = self.rows_scanned.get(table, 0) + rows
+
+    def looked_up(self, table: str) -> None:
+        self.lookups[table] = self.lookups.get(table, 0) + 1
+
+
+class MeteredTable:
+    """Forwarding proxy of a table that counts the rows a tool reads."""
+
+    __slots__ = ("_table", "_name", "_meter")
+
+    def __init__(self, table: Dict[Any, Any], name: str, meter: Meter):
+        self._table = table
+        self._name = name
+        self._meter = meter
+
+    def _count(self, iterable: Iterable[Any]) -> Iterator[Any]:
+        for item in iterable:
+            self._meter.scanned(self._name)
+            yield item
+
+    def values(self) -> Iterator[Any]:
+        return self._count(self._table.values())
+
+    def items(self) -> Iterator[Any]:
+        return self._count(self._table.items())
+
+    def keys(self) -> Iterator[Any]:
+        return self._count(self._table.keys())
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._count(self._table)
+
+    def __getitem__(self, key: Any) -> Any:
+        self._meter.looked_up(self._name)
+        return self._table[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self._meter.looked_up(self._name)
+        return self._table.get(key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._table[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._table[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __bool__(self) -> bool:
+        return bool(self._table)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._table == (other._table if isinstance(other, MeteredTable) else other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(self._table)
+
+    def __getattr__(self, name: str) -> Any:
+        # Raises AttributeError like the real table, so ``hasattr(table,
+        # "candidates")`` keeps telling indexed tables from plain dicts
+        attribute = getattr(self._table, name)
+        if name not in _INDEX_LOOKUPS:
+            return attribute
+
+        def metered(*args: Any, **kwargs: Any) -> List[Any]:
+            rows = list(attribute(*args, **kwargs))
+            self._meter.scanned(self._name, len(rows))
+            return rows
+
+        return metered
+
+
+class MeteredData:
+    """Forwarding proxy of a ``data`` dict whose tables are ``MeteredTable``s."""
+
+    __slots__ = ("_data", "_meter", "_tables")
+
+    def __init__(self, data: Dict[str, Any], meter: Meter):
+        self._data = data
+        self._meter = meter
+        self._tables: Dict[str, Any] = {}
+
+    def _wrap(self, name: str, table: Any) -> Any:
+        if not isinstance(table, dict):
+            return table
+        proxy = self._tables.get(name)
+        if proxy is None or proxy._table is not table:
+            proxy = self._tables[name] = MeteredTable(table, name, self._meter)
+        return proxy
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in self._data:
+            return self._wrap(name, default) if isinstance(default, dict) else default
+        return self._wrap(name, self._data.get(name))
+
+    def __getitem__(self, name: str) -> Any:
+        return self._wrap(name, self._data[name])
+
+    def setdefault(self, name: str, default: Any = None) -> Any:
+        return self._wrap(name, self._data.setdefault(name, default))
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._data[name] = value._table if isinstance(value, MeteredTable) else value
+
+    def __delitem__(self, name: str) -> None:
+        del self._data[name]
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def keys(self):
+        return self._data.keys()
+
+    def values(self) -> Iterator[Any]:
+        return (self._wrap(name, table) for name, table in self._data.items())
+
+    def items(self) -> Iterator[Any]:
+        return ((name, self._wrap(name, table)) for name, table in self._data.items())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._data, name)
+
+
+# -------------------- patching --------------------
+
+def _tool_classes() -> List[Type[Any]]:
+    """Every loaded subclass of ``tau_bench``'s ``Tool``."""
+    from tau_bench.envs.tool import Tool
+
+    classes = []
+    pending = list(Tool.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        if cls not in classes:
+            classes.append(cls)
+            pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _tool_name(cls: Type[Any]) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _metered_invoke(cls: Type[Any], invoke: Any) -> Any:
+    name = _tool_name(cls)
+
+    def metered(data: Dict[str, Any], **kwargs: Any) -> str:
+        meter = Meter()
+        failed = True
+        start = time.perf_counter_ns()
+        try:
+            result = invoke(MeteredData(data, meter), **kwargs)
+            failed = False
+            return result
+        finally:
+            duration = time.perf_counter_ns() - start
+            with _lock:
+                stats = _stats.get(name)
+                if stats is None:
+                    stats = _stats[name] = ToolStats(name)
+                stats.add(duration, meter, failed)
+
+    metered.__wrapped__ = invoke
+    return staticmethod(metered)
+
+
+def enable(tools: Optional[Iterable[Type[Any]]] = None) -> None:
+    """Start recording the ``invoke`` calls of ``tools`` (default: every loaded ``Tool``)."""
+    if tools is None:
+        tools = _tool_classes()
+    with _lock:
+        for cls in tools:
+            if cls in _patched:
+                continue
+            _patched[cls] = cls.__dict__.get("invoke")
+            # An inherited invoke may belong to an already patched base
+            invoke = getattr(cls.invoke, "__wrapped__", cls.invoke)
+            setattr(cls, "invoke", _metered_invoke(cls, invoke))
+
+
+def disable() -> None:
+    """Restore every patched ``invoke``; recorded statistics are kept."""
+    with _lock:
+        for cls, own in _patched.items():
+            if own is None:
+                delattr(cls, "invoke")
+            else:
+                setattr(cls, "invoke", own)
+        _patched.clear()
+
+
+def enabled() -> bool:
+    return bool(_patched)
+
+
+def reset() -> None:
+    """Forget every recorded call."""
+    with _lock:
+        _stats.clear()
+
+
+# -------------------- reports --------------------
+
+def report() -> Dict[str, Any]:
+    """Statistics per tool (``module.Class``), JSON-serializable."""
+    with _lock:
+        return {name: stats.summary() for name, stats in sorted(_stats.items())}
+
+
+def folded_stacks(rows: bool = False) -> List[str]:
+    """Folded stack lines (``module;Tool microseconds``) for flame graph tools.
+
+    With ``rows`` the weights are rows scanned instead, one frame per table
+    (``module;Tool;table rows``).
+    """
+    lines = []
+    with _lock:
+        for name, stats in sorted(_stats.items()):
+            module, _, tool = name.rpartition(".")
+            if rows:
+                for table, count in sorted(stats.rows_scanned.items()):
+                    lines.append(f"{module};{tool};{table} {count}")
+            else:
+                lines.append(f"{module};{tool} {sum(stats.durations_ns) // 1000}")
+    return lines
+
+
+def write_report(path: str, folded_path: Optional[str] = None) -> None:
+    """Write ``report()`` as JSON to ``path`` and, if given, ``folded_stacks()`` to ``folded_path``."""
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2)
+    if folded_path is not None:
+        with open(folded_path, "w") as f:
+            f.write("\n".join(folded_stacks()) + "\n")
@@ -0,0 +1,124 @@
+"""
+Result memoization for read-only tools over an ``IndexedData``.
+
+Read tools (``get_funds``, ``retrieve_funds_with_filter``,
+``get_investor_portfolio``, ``find_reports``...) are often called again with
+the same arguments while nothing changed. ``ToolCache`` keeps their JSON
+results in an LRU keyed by ``(tool, normalized arguments)``. Each entry also
+stores the tables the call read, with their ``version``. An entry is served
+only while every one of those tables is still the same object at the same
+version:
+
+- the tables read are recorded through ``IndexedData.record()`` (derived
+  stores report the tables they are built from)
+- every ``IndexedTable`` bumps its ``version`` on inserts, overwrites, deletes
+  and ``reindex``, which write tools call after in-place edits
+- a call during which any indexed table changed is a write and is never
+  cached; neither are calls that raise or that read a table that is not an
+  ``IndexedTable``
+
+Rows edited in place without ``reindex`` are invisible to the versions, so
+calls are only memoized over data whose class sets ``writes_reindexed``
+(``FinanceData`` and ``SmartHomeData``, whose write tools all reindex).
+Anything else, including a bare ``index_data()`` container and plain
+``dict`` data, is passed straight through.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Type
+
+from .indexed_data import IndexedData
+from .indexed_table import IndexedTable
+
+_UNCACHEABLE = object()
+
+
+def normalize_args(kwargs: Dict[str, Any]) -> Any:
+    """Hashable form of a tool's keyword arguments.
+
+    Argument order is irrelevant to a tool, so top-level names are sorted;
+    nested values keep their order since tools may echo them. Returns
+    ``_UNCACHEABLE`` for values JSON cannot encode.
+    """
+    try:
+        return tuple(sorted((name, json.dumps(value)) for name, value in kwargs.items()))
+    except (TypeError, ValueError):
+        return _UNCACHEABLE
+
+
+class ToolCache:
+    """LRU cache of tool results validated by per-table versions."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[Tuple[str, Any, int], ...], str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def invoke(self, tool: Type[Any], data: Dict[str, Any], **kwargs: Any) -> str:
+        """``tool.invoke(data, **kwargs)``, served from the cache when still valid."""
+        if not isinstance(data, IndexedData) or not data.writes_reindexed:
+            return tool.invoke(data, **kwargs)
+        args = normalize_args(kwargs)
+        if args is _UNCACHEABLE:
+            self.uncacheable += 1
+            return tool.invoke(data, **kwargs)
+
+        key = (tool.__module__, tool.__qualname__, args)
+        entry = self._entries.get(key)
+        if entry is not None:
+            dependencies, result = entry
+            if all(dict.get(data, name) is table and (table is None or table.version == version)
+                   for name, table, version in dependencies):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+
+        self.misses += 1
+        changes = IndexedTable.changes
+        with data.record() as accessed:
+            result = tool.invoke(data, **kwargs)
+        dependencies = self._dependencies(data, accessed)
+        if dependencies is None or IndexedTable.changes != changes:
+            # A write, or a read of something without a version
+            self.uncacheable += 1
+            return result
+        self._entries[key] = (dependencies, result)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _dependencies(data: IndexedData, accessed: set) -> Optional[Tuple[Tuple[str, Any, int], ...]]:
+        dependencies = []
+        for name in accessed:
+            table = dict.get(data, name)
+            if table is None:
+                dependencies.append((name, None, 0))
+            elif isinstance(table, IndexedTable):
+                dependencies.append((name, table, table.version))
+            else:
+                return None
+        return tuple(dependencies)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits,
+                "misses": self.misses, "uncacheable": self.uncacheable}
+
+
+def memoize_tool(tool: Type[Any], cache: ToolCache) -> Type[Any]:
+    """Subclass of ``tool`` whose ``invoke`` goes through ``cache``."""
+
+    def invoke(data: Dict[str, Any], **kwargs: Any) -> str:
+        return cache.invoke(tool, data, **kwargs)
+
+    return type(tool.__name__, (tool,), {"invoke": staticmethod(invoke), "__module__": tool.__module__})
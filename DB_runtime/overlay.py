@@ -0,0 +1,176 @@
+"""
+Copy-on-write overlays of an environment ``data`` dict.
+
+Write tools mutate ``data`` in place, so every parallel episode currently
+starts from a ``copy.deepcopy`` of the whole database. ``overlay_data(base)``
+instead returns an ``OverlayData`` over a shared, frozen ``base``:
+
+- each table is an ``OverlayTable``, a ``dict`` holding references to the
+  base rows (a pointer copy of the table, no row is copied)
+- a row is deep-copied the first time it is fetched by key (``table[key]``,
+  ``get``, ``setdefault``, ``pop``...), which is how tools reach the rows they
+  edit; inserts and deletes only touch the overlay's own dict
+- ``diff()`` reports what the episode added, updated and deleted, and
+  ``discard()`` drops all of it
+
+Rows yielded by iteration (``values()``, ``items()``) are the shared base
+rows and are read-only by contract: tools that edit a row found by a scan
+fetch it again by key first. The base itself must not be mutated while
+overlays are alive.
+"""
+
+import copy
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+_MISSING = object()
+
+
+class OverlayTable(dict):
+    """``dict`` of rows that copies a base row the first time it is fetched by key."""
+
+    def __init__(self, base: Dict[Hashable, Any]):
+        super().__init__(base)
+        self._base = base
+        # Keys whose current row is owned by this overlay (copied or written)
+        self._owned: Set[Hashable] = set()
+
+    def _own(self, key: Hashable) -> Any:
+        row = dict.__getitem__(self, key)
+        if key not in self._owned:
+            row = copy.deepcopy(row)
+            dict.__setitem__(self, key, row)
+            self._owned.add(key)
+        return row
+
+    # ---- dict API ----
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if not dict.__contains__(self, key):
+            raise KeyError(key)
+        return self._own(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            return default
+        return self._own(key)
+
+    def __setitem__(self, key: Hashable, row: Any) -> None:
+        dict.__setitem__(self, key, row)
+        self._owned.add(key)
+
+    def __delitem__(self, key: Hashable) -> None:
+        dict.__delitem__(self, key)
+        self._owned.discard(key)
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            self[key] = default
+        return self._own(key)
+
+    def pop(self, key: Hashable, *default: Any) -> Any:
+        if dict.__contains__(self, key):
+            row = self._own(key)
+            del self[key]
+            return row
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self) -> Tuple[Hashable, Any]:
+        if not self:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, row in dict(*args, **kwargs).items():
+            self[key] = row
+
+    def __ior__(self, other: Any) -> "OverlayTable":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._owned.clear()
+
+    def __reduce__(self):
+        # Copies and pickles are plain, self-contained tables
+        return (dict, (dict(self),))
+
+    # ---- overlay ----
+
+    def diff(self) -> Dict[str, Any]:
+        """Rows added, updated and deleted relative to the base."""
+        added = {}
+        updated = {}
+        for key in self._owned:
+            row = dict.__getitem__(self, key)
+            base_row = self._base.get(key, _MISSING)
+            if base_row is _MISSING:
+                added[key] = row
+            elif row != base_row:
+                updated[key] = row
+        deleted = [key for key in self._base if not dict.__contains__(self, key)]
+        return {"added": added, "updated": updated, "deleted": deleted}
+
+    def discard(self) -> None:
+        """Drop every change and show the base rows again."""
+        dict.clear(self)
+        dict.update(self, self._base)
+        self._owned.clear()
+
+
+class OverlayData(dict):
+    """``data`` dict whose tables are ``OverlayTable``s over a shared base."""
+
+    def __init__(self, base: Dict[str, Any]):
+        super().__init__()
+        self._base = base
+        self.discard()
+
+    @staticmethod
+    def _wrap(table: Any) -> Any:
+        if isinstance(table, dict):
+            return OverlayTable(table)
+        # Non-row tables are small; give the episode its own copy
+        return copy.deepcopy(table)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def diff(self) -> Dict[str, Any]:
+        """Per-table changes; tables replaced or created by the episode are listed whole."""
+        changes: Dict[str, Any] = {}
+        for name, table in self.items():
+            base_table = self._base.get(name, _MISSING)
+            if isinstance(table, OverlayTable) and table._base is base_table:
+                table_diff = table.diff()
+                if any(table_diff.values()):
+                    changes[name] = table_diff
+            elif base_table is _MISSING or table != base_table:
+                changes[name] = {"replaced": table}
+        for name in self._base:
+            if name not in self:
+                changes[name] = {"removed": True}
+        return changes
+
+    def discard(self, name: Optional[str] = None) -> None:
+        """Drop the episode's changes to table ``name``, or to every table."""
+        if name is not None:
+            table = dict.get(self, name)
+            if isinstance(table, OverlayTable) and table._base is self._base.get(name):
+                table.discard()
+            elif name in self._base:
+                dict.__setitem__(self, name, self._wrap(self._base[name]))
+            else:
+                dict.pop(self, name, None)
+            return
+        dict.clear(self)
+        for table_name, table in self._base.items():
+            dict.__setitem__(self, table_name, self._wrap(table))
+
+
+def overlay_data(base: Dict[str, Any]) -> OverlayData:
+    """Copy-on-write view of ``base`` for one episode."""
+    return OverlayData(base)
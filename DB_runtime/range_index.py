@@ -0,0 +1,147 @@
+"""
+Sorted numeric index on one column of an ``IndexedTable``.
+
+Range filters such as ``float(d.get("width_ft")) >= less_than_width_ft`` cast
+the column of every row on every call. ``RangeIndex`` keeps, per row,
+``float(row[column])`` in a sorted list of ``(value, position, key)``
+entries, so the rows below, at or up to a bound are a bisect away.
+
+Rows whose value cannot be ordered are kept aside as ``unordered`` and are
+always returned as candidates: the column is missing or ``None``, ``float()``
+fails on it (the tools' cast then raises) or it is NaN. Callers keep their
+filters, so results are those of the full scan.
+
+``plan_keys`` is the planner used by ``IndexedTable.range_candidates``: it
+sizes every usable predicate, starts from the most selective one and
+intersects the others that are selective as well. The unordered rows of
+every range predicate are added back after the intersection: a tool checks
+its filters one after the other, so such a row may raise in one filter
+before another would have skipped it.
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from .table_view import TableView
+
+# Comparisons a range lookup answers: rows with ``value < bound``, ``value <= bound``, ``value == bound``
+OPERATORS = ("<", "<=", "==")
+
+
+def is_bound(value: Any) -> bool:
+    """Whether ``value`` can bound a range lookup (a non-NaN number)."""
+    return isinstance(value, (int, float)) and not (isinstance(value, float) and math.isnan(value))
+
+
+class RangeIndex(TableView):
+    """``float(row[column])`` of every row, sorted."""
+
+    def __init__(self, table: Any, column: str):
+        self.table = table
+        self.column = column
+        self._entries: List[Tuple[float, int, Hashable]] = []
+        self._row_entries: Dict[Hashable, Tuple[float, int, Hashable]] = {}
+        # Rows without an orderable value; always candidates
+        self.unordered: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            entry = self._entry(key, row)
+            if entry is None:
+                self.unordered[key] = None
+            else:
+                self._row_entries[key] = entry
+        self._entries = sorted(self._row_entries.values())
+
+    def _entry(self, key: Hashable, row: Any) -> Optional[Tuple[float, int, Hashable]]:
+        if not isinstance(row, dict) or row.get(self.column) is None:
+            return None
+        try:
+            value = float(row[self.column])
+        except (TypeError, ValueError):
+            return None
+        if math.isnan(value):
+            return None
+        return (value, self.table.position(key), key)
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._row_entries.clear()
+        self.unordered.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        entry = self._entry(key, row)
+        if entry is None:
+            self.unordered[key] = None
+            return
+        self._row_entries[key] = entry
+        insort(self._entries, entry)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.unordered:
+            del self.unordered[key]
+            return
+        entry = self._row_entries.pop(key, None)
+        if entry is not None:
+            del self._entries[bisect_left(self._entries, entry)]
+
+    def _span(self, op: str, bound: Any) -> Tuple[int, int]:
+        # Positions are >= 0, so (bound, -1) sorts before and (bound, inf) after every entry equal to bound
+        first = bisect_left(self._entries, (bound, -1))
+        if op == "<":
+            return 0, first
+        last = bisect_left(self._entries, (bound, math.inf), lo=first)
+        return (0, last) if op == "<=" else (first, last)
+
+    def count(self, op: str, bound: Any) -> int:
+        """Number of candidates for ``value <op> bound``, unordered rows included."""
+        lo, hi = self._span(op, bound)
+        return hi - lo + len(self.unordered)
+
+    def keys(self, op: str, bound: Any) -> Set[Hashable]:
+        """Keys of the rows with ``value <op> bound`` plus the unordered rows (unordered set)."""
+        lo, hi = self._span(op, bound)
+        keys = {entry[2] for entry in self._entries[lo:hi]}
+        keys.update(self.unordered)
+        return keys
+
+
+def plan_keys(table: Any, criteria: Dict[str, Any], ranges: List[Tuple[str, str, Any]],
+              max_fraction: float) -> Optional[List[Hashable]]:
+    """Candidate keys in table order, or ``None`` when a scan is cheaper.
+
+    Equality ``criteria`` are sized through the table's hash indexes (falsy
+    values and values that cannot narrow are ignored) and ``ranges`` through
+    its range indexes (``None`` and NaN bounds are ignored). Predicates
+    matching more than
+    ``max_fraction`` of the rows are not used. A bound of any other type
+    makes the tool's comparison itself the question, so the scan is kept.
+    """
+    limit = max_fraction * len(table)
+    steps = []
+    unordered: Set[Hashable] = set()
+    for column, value in criteria.items():
+        if not value:
+            continue
+        index = table.index(column)
+        if index.narrows(value):
+            steps.append((index.size(value), lambda index=index, value=value: set(index.keys_for(value))))
+    for column, op, bound in ranges:
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported range operator {op!r}")
+        if bound is None or (isinstance(bound, float) and math.isnan(bound)):
+            continue
+        if not is_bound(bound):
+            return None
+        index = table.range_index(column)
+        unordered.update(index.unordered)
+        steps.append((index.count(op, bound), lambda index=index, op=op, bound=bound: index.keys(op, bound)))
+    steps = sorted((step for step in steps if step[0] <= limit), key=lambda step: step[0])
+    if not steps:
+        return None
+    keys = steps[0][1]()
+    for _, step_keys in steps[1:]:
+        if not keys:
+            break
+        keys &= step_keys()
+    keys |= unordered
+    return sorted(keys, key=table.position)
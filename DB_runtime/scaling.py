@@ -0,0 +1,131 @@
+"""
+Synthetic scaling of an environment ``data`` dict.
+
+``scale_data(data, factor, relationships)`` returns a database ``factor``
+times larger: every table holds the original rows followed by ``factor - 1``
+renumbered copies. Copy ``c`` of a row gets its key, its primary key column
+and every foreign key column shifted by ``c`` times the parent table's
+largest ID, so each copy only references rows of the same copy and
+referential integrity holds exactly like in the original data.
+
+Relationships come from the domain's ``relationships.yaml``
+(``load_relationships(path)``), the file ``DB_sanity_checks`` validates:
+
+- ``foreign_keys``: ``child_table.child_column -> parent_table``
+- ``generic_foreign_keys``: ``child_table.id_column`` points at the table
+  mapped from the row's ``type_column`` value
+
+IDs keep their type: numeric strings stay numeric strings, ints stay ints
+and other IDs get a ``-<copy>`` suffix. Other columns (names, emails,
+amounts, dates) are copied unchanged.
+"""
+
+import copy
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import yaml
+
+
+def load_relationships(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """``foreign_keys`` and ``generic_foreign_keys`` of a ``relationships.yaml``."""
+    with open(path, "r", encoding="utf-8") as f:
+        relationships = yaml.safe_load(f) or {}
+    return {
+        "foreign_keys": relationships.get("foreign_keys", []) or [],
+        "generic_foreign_keys": relationships.get("generic_foreign_keys", []) or [],
+    }
+
+
+def _numeric(value: Any) -> Optional[int]:
+    if type(value) is int:
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _primary_key_column(name: str, table: Dict[Hashable, Any],
+                        relationships: Dict[str, List[Dict[str, Any]]]) -> Optional[str]:
+    """Column holding the row's own key, as declared or as found in the first row."""
+    for fk in relationships["foreign_keys"]:
+        if fk.get("parent_table") == name and fk.get("parent_column"):
+            return fk["parent_column"]
+    key, row = next(iter(table.items()), (None, None))
+    if not isinstance(row, dict):
+        return None
+    for column, value in row.items():
+        if column.endswith("_id") and str(value) == str(key):
+            return column
+    return None
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _copy_row(row: Any) -> Any:
+    """Copy of a row; flat rows skip ``copy.deepcopy``."""
+    if isinstance(row, dict) and all(type(value) in _SCALARS for value in row.values()):
+        return dict(row)
+    return copy.deepcopy(row)
+
+
+class _Renumbering:
+    """ID shift of every table for one copy."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.offsets: Dict[str, int] = {}
+        for name, table in data.items():
+            if isinstance(table, dict):
+                ids = [_numeric(key) for key in table]
+                self.offsets[name] = max([i for i in ids if i is not None], default=0)
+
+    def shift(self, table: str, value: Any, copy_number: int) -> Any:
+        if value is None or value == "" or table not in self.offsets:
+            return value
+        offset = self.offsets[table] * copy_number
+        if type(value) is int:
+            return value + offset
+        number = _numeric(value)
+        if number is not None:
+            return str(number + offset)
+        return f"{value}-{copy_number}"
+
+
+def scale_data(data: Dict[str, Any], factor: int,
+               relationships: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """New database with every table ``factor`` times larger; ``data`` is not modified."""
+    if factor < 1:
+        raise ValueError(f"factor must be >= 1, got {factor}")
+    renumbering = _Renumbering(data)
+
+    foreign_keys: Dict[str, List[Tuple[str, str]]] = {}
+    for fk in relationships["foreign_keys"]:
+        foreign_keys.setdefault(fk["child_table"], []).append((fk["child_column"], fk["parent_table"]))
+    generic_keys: Dict[str, List[Tuple[str, str, Dict[Any, str]]]] = {}
+    for gfk in relationships["generic_foreign_keys"]:
+        mapping = {kind: target["parent_table"] for kind, target in (gfk.get("mapping") or {}).items()}
+        generic_keys.setdefault(gfk["child_table"], []).append((gfk["type_column"], gfk["id_column"], mapping))
+
+    scaled: Dict[str, Any] = {}
+    for name, table in data.items():
+        if not isinstance(table, dict):
+            scaled[name] = copy.deepcopy(table)
+            continue
+        pk_column = _primary_key_column(name, table, relationships)
+        rows = {key: _copy_row(row) for key, row in table.items()}
+        for copy_number in range(1, factor):
+            for key, row in table.items():
+                row = _copy_row(row)
+                if isinstance(row, dict):
+                    if pk_column in row:
+                        row[pk_column] = renumbering.shift(name, row[pk_column], copy_number)
+                    for column, parent in foreign_keys.get(name, ()):
+                        if column in row:
+                            row[column] = renumbering.shift(parent, row[column], copy_number)
+                    for type_column, id_column, mapping in generic_keys.get(name, ()):
+                        parent = mapping.get(row.get(type_column))
+                        if parent is not None and id_column in row:
+                            row[id_column] = renumbering.shift(parent, row[id_column], copy_number)
+                rows[renumbering.shift(name, key, copy_number)] = row
+        scaled[name] = rows
+    return scaled
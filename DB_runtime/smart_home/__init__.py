@@ -0,0 +1,9 @@
+from .alerts import AlertIndex, alert_status
+from .commands import COMMAND_TABLES, CommandLog
+from .hierarchy import HomeHierarchy
+from .phones import PhoneIndex
+from .ratings import RatingAggregates
+from .routines import RoutineIndex
+from .smart_home_data import SmartHomeData, index_smart_home_data
+from .tariffs import TariffSchedule
+from .warranty import WarrantyTimeline
@@ -0,0 +1,175 @@
+"""
+Alert index over the smart_home ``emergency_alerts`` table.
+
+``get_emergency_alerts``, ``get_alerts_by_alert_type`` and ``list_alert_ids``
+scan every alert to filter by home, type and who acknowledged or resolved
+it. ``AlertIndex`` groups alert keys by ``(str(home_id), str(alert_type),
+status)``, where the status is:
+
+- ``"resolved"`` once ``resolved_by_user`` is set
+- ``"acknowledged"`` once only ``acknowledged_by_user`` is set
+- ``"open"`` otherwise
+
+Each group also keeps its string ``triggered_at`` values sorted as
+``(triggered_at, position, key)``, so a time window is a bisect per group.
+
+Inserts (``create_emergency_alert``, ``add_alert``, ``create_alert``) go
+through the dict API and the alert update tools call ``reindex`` after their
+in-place edits. Lookups return a superset of the matching rows in table
+order and the tools keep their filters; rows that are not dicts make the
+tools' ``.get`` raise and are always returned.
+"""
+
+from bisect import bisect_left, insort
+from heapq import merge
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+OPEN, ACKNOWLEDGED, RESOLVED = "open", "acknowledged", "resolved"
+STATUSES = (OPEN, ACKNOWLEDGED, RESOLVED)
+
+_Group = Tuple[str, str, str]
+_Entry = Tuple[str, int, Hashable]
+
+
+def alert_status(alert: Dict[str, Any]) -> str:
+    """``"resolved"``, ``"acknowledged"`` or ``"open"`` from the alert's user fields."""
+    if alert.get("resolved_by_user") is not None:
+        return RESOLVED
+    if alert.get("acknowledged_by_user") is not None:
+        return ACKNOWLEDGED
+    return OPEN
+
+
+class AlertIndex(TableView):
+    """Alert keys and sorted ``triggered_at`` per ``(home_id, alert_type, status)``."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._groups = KeyBuckets(table)
+        self._timelines: Dict[_Group, List[_Entry]] = {}
+        # Groups present per home and per alert type
+        self._by_home: Dict[str, Dict[_Group, None]] = {}
+        self._by_type: Dict[str, Dict[_Group, None]] = {}
+        self._row_entries: Dict[Hashable, Tuple[_Group, Optional[_Entry]]] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._groups.clear()
+        self._timelines.clear()
+        self._by_home.clear()
+        self._by_type.clear()
+        self._row_entries.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        group = (str(row.get("home_id")), str(row.get("alert_type")), alert_status(row))
+        self._groups.add(group, key)
+        self._by_home.setdefault(group[0], {})[group] = None
+        self._by_type.setdefault(group[1], {})[group] = None
+        triggered_at = row.get("triggered_at")
+        entry = None
+        if isinstance(triggered_at, str):
+            entry = (triggered_at, self.table.position(key), key)
+            insort(self._timelines.setdefault(group, []), entry)
+        self._row_entries[key] = (group, entry)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        stored = self._row_entries.pop(key, None)
+        if stored is None:
+            return
+        group, entry = stored
+        self._groups.remove(group, key)
+        if entry is not None:
+            timeline = self._timelines[group]
+            del timeline[bisect_left(timeline, entry)]
+            if not timeline:
+                del self._timelines[group]
+        if group not in self._groups:
+            for groups, value in ((self._by_home, group[0]), (self._by_type, group[1])):
+                del groups[value][group]
+                if not groups[value]:
+                    del groups[value]
+
+    # ---- lookups ----
+
+    def _matching_groups(self, home_id: Any, alert_type: Any, status: Any) -> Optional[List[_Group]]:
+        """Groups matching the string criteria, ``None`` when nothing narrows."""
+        home_id = home_id if isinstance(home_id, str) else None
+        alert_type = alert_type if isinstance(alert_type, str) else None
+        status = status if status in STATUSES else None
+        if home_id is not None:
+            groups: Iterable[_Group] = self._by_home.get(home_id, {})
+        elif alert_type is not None:
+            groups = self._by_type.get(alert_type, {})
+        elif status is not None:
+            groups = self._groups
+        else:
+            return None
+        return [group for group in groups
+                if (alert_type is None or group[1] == alert_type) and (status is None or group[2] == status)]
+
+    def _keys(self, home_id: Any, alert_type: Any, status: Any) -> Optional[List[Hashable]]:
+        groups = self._matching_groups(home_id, alert_type, status)
+        if groups is None:
+            return None
+        keys: List[Hashable] = []
+        for group in groups:
+            keys.extend(self._groups.keys(group))
+        keys.extend(self.irregular)
+        if len(groups) > 1 or self.irregular:
+            keys.sort(key=self.table.position)
+        return keys
+
+    def alert_items(self, home_id: Any = None, alert_type: Any = None,
+                    status: Any = None) -> Iterable[Tuple[Hashable, Any]]:
+        """Candidate ``(alert_id, alert)`` items, in table order.
+
+        Only string ``home_id``/``alert_type`` values and known statuses
+        narrow the result; without any, every alert is returned.
+        """
+        keys = self._keys(home_id, alert_type, status)
+        if keys is None:
+            return dict.items(self.table)
+        return [(key, dict.__getitem__(self.table, key)) for key in keys]
+
+    def alerts(self, home_id: Any = None, alert_type: Any = None, status: Any = None) -> Iterable[Any]:
+        """Candidate alerts of ``alert_items``."""
+        keys = self._keys(home_id, alert_type, status)
+        if keys is None:
+            return dict.values(self.table)
+        return [dict.__getitem__(self.table, key) for key in keys]
+
+    def triggered_between(self, start: Optional[str] = None, end: Optional[str] = None,
+                          home_id: Any = None, alert_type: Any = None, status: Any = None) -> List[Any]:
+        """Alerts with ``start <= triggered_at < end``, oldest first (ties in table order).
+
+        ``None`` bounds are open. Alerts without a string ``triggered_at``
+        and rows that are not dicts are not returned.
+        """
+        groups = self._matching_groups(home_id, alert_type, status)
+        if groups is None:
+            groups = list(self._timelines)
+        slices = []
+        for group in groups:
+            timeline = self._timelines.get(group)
+            if not timeline:
+                continue
+            lo = 0 if start is None else bisect_left(timeline, (start,))
+            hi = len(timeline) if end is None else bisect_left(timeline, (end,), lo=lo)
+            slices.append(timeline[lo:hi])
+        return [dict.__getitem__(self.table, entry[2]) for entry in merge(*slices)]
@@ -0,0 +1,137 @@
+"""
+Per-device command log over the smart_home ``device_commands``,
+``bulb_commands`` and ``thermostat_commands`` tables.
+
+``get_commands``, ``fetch_commands`` and ``list_commands`` scan all three
+tables to list one device's or routine's commands. ``CommandLog`` partitions
+each table's keys by ``bucket_key`` of ``device_id`` and ``routine_id``, and
+keeps, per ``str(device_id)``, every command of the three tables sorted by
+``created_at``.
+
+The three tables stay the storage, so they serialize to the same JSON
+files. The log is a ``TableView`` on each of them: commands appended by
+``add_command``/``create_command`` (whose IDs come from ``next_id()``) land in
+it directly, and deletes and ``reindex`` calls keep it in sync.
+
+Rows that are not dicts make the tools' ``.get`` raise; they are always
+returned by ``commands`` so the scan fails the same way.
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from ..indexed_table import IndexedTable, bucket_key, narrows
+from ..table_view import KeyBuckets, TableView
+
+COMMAND_TABLES = ("device_commands", "bulb_commands", "thermostat_commands")
+
+# (untimed, created_at, table rank, position, key); commands without a string created_at sort last
+_Entry = Tuple[bool, str, int, int, Hashable]
+
+
+class _Partition(TableView):
+    """Keys of one command table by device and routine, feeding the per-device timelines."""
+
+    def __init__(self, log: "CommandLog", table: IndexedTable, rank: int):
+        self.log = log
+        self.table = table
+        self.rank = rank
+        self.by_device = KeyBuckets(table)
+        self.by_routine = KeyBuckets(table)
+        self.row_entries: Dict[Hashable, Tuple[str, str, str, _Entry]] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def reset(self) -> None:
+        for key in list(self.row_entries):
+            self.discard(key)
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        device_id, routine_id = bucket_key(row.get("device_id")), bucket_key(row.get("routine_id"))
+        self.by_device.add(device_id, key)
+        self.by_routine.add(routine_id, key)
+        created_at = row.get("created_at")
+        timed = isinstance(created_at, str)
+        entry = (not timed, created_at if timed else "", self.rank, self.table.position(key), key)
+        timeline = str(row.get("device_id"))
+        insort(self.log.timelines.setdefault(timeline, []), entry)
+        self.row_entries[key] = (device_id, routine_id, timeline, entry)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        stored = self.row_entries.pop(key, None)
+        if stored is None:
+            return
+        device_id, routine_id, timeline_id, entry = stored
+        self.by_device.remove(device_id, key)
+        self.by_routine.remove(routine_id, key)
+        timeline = self.log.timelines[timeline_id]
+        del timeline[bisect_left(timeline, entry)]
+        if not timeline:
+            del self.log.timelines[timeline_id]
+
+
+class CommandLog:
+    """Commands of the three command tables, partitioned by device."""
+
+    def __init__(self, tables: Sequence[IndexedTable]):
+        # Per str(device_id): sorted entries of all three tables
+        self.timelines: Dict[str, List[_Entry]] = {}
+        self._partitions = {name: _Partition(self, table, rank)
+                            for rank, (name, table) in enumerate(zip(COMMAND_TABLES, tables))}
+
+    def commands(self, table_name: str, routine_id: Any = None, device_id: Any = None) -> Iterable[Any]:
+        """Candidate rows of ``table_name`` for the tools' routine/device filters, in table order.
+
+        Falsy filters are ignored like in the tools, and so are values that
+        cannot narrow (see ``narrows``); without any, every row of the table
+        is returned.
+        """
+        partition = self._partitions[table_name]
+        criteria = [(buckets, bucket_key(value)) for buckets, value
+                    in ((partition.by_device, device_id), (partition.by_routine, routine_id))
+                    if value and narrows(value)]
+        if not criteria:
+            return dict.values(partition.table)
+        buckets, value = min(criteria, key=lambda item: item[0].size(item[1]))
+        keys: Iterable[Hashable] = buckets.keys(value)
+        if partition.irregular:
+            keys = sorted([*keys, *partition.irregular], key=partition.table.position)
+        return [dict.__getitem__(partition.table, key) for key in keys]
+
+    def _command(self, entry: _Entry) -> Tuple[str, Any]:
+        name = COMMAND_TABLES[entry[2]]
+        return name, dict.__getitem__(self._partitions[name].table, entry[4])
+
+    def history(self, device_id: Any, start: Optional[str] = None,
+                end: Optional[str] = None) -> List[Tuple[str, Any]]:
+        """``(table_name, command)`` pairs of ``str(device_id)``, oldest first.
+
+        Ties are in ``COMMAND_TABLES`` then table order. With ``start``/``end``
+        only commands with ``start <= created_at < end`` are returned;
+        otherwise commands without a string ``created_at`` come last.
+        """
+        timeline = self.timelines.get(str(device_id), [])
+        lo = 0 if start is None else bisect_left(timeline, (False, start))
+        if end is not None:
+            hi = bisect_left(timeline, (False, end), lo=lo)
+        elif start is not None:
+            hi = bisect_left(timeline, (True,), lo=lo)
+        else:
+            hi = len(timeline)
+        return [self._command(entry) for entry in timeline[lo:hi]]
+
+    def latest(self, device_id: Any) -> Optional[Tuple[str, Any]]:
+        """The most recent ``(table_name, command)`` of ``str(device_id)`` with a string ``created_at``."""
+        timeline = self.timelines.get(str(device_id), [])
+        timed = bisect_left(timeline, (True,))
+        return self._command(timeline[timed - 1]) if timed else None
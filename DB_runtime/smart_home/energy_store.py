@@ -0,0 +1,379 @@
+"""
+Columnar store over the smart_home ``historical_energy_consumption`` table.
+
+The energy tools filter the whole table by ``str(device_id)`` or
+``str(home_id)`` and call ``datetime.strptime`` on every record of every
+query. ``EnergyStore`` decodes each row once and keeps the table as NumPy
+columns sorted by ``(home, device, date)``:
+
+- ``home``, ``device``, ``room``: ``str()`` of the raw IDs, the tools' filters
+- ``device_code``: the raw ``device_id`` factorized (``==`` semantics), which
+  is what the per-home monthly rule groups by
+- ``date``: ``datetime64[D]``, NaT where ``strptime(date, "%Y-%m-%d")`` fails;
+  ``canonical`` marks dates written exactly as ``YYYY-MM-DD``, the only ones
+  a by-date lookup compares equal
+- ``power``: ``power_used_kWh`` as float64; ``exact`` marks values that are
+  Python floats, so float64 arithmetic gives the tools' own results
+- ``position``: table order
+
+Inserts, deletes and ``reindex`` calls only mark the store dirty; the
+columns are rebuilt from the already decoded rows on the next query. Date
+strings are parsed once per distinct string.
+
+Daily and monthly figures are computed with array operations over a home's
+slice or a device's rows, including the 1st/15th monthly extrapolation
+(``first * 14 + fifteenth * (days - 14)``). Sums run in table order with
+``cumsum`` so the floats are added in the same sequence as the tools' loops.
+Whenever a group holds a row the tools would treat specially (missing
+``date``/``power_used_kWh``, unhashable ``device_id``, non-float values), the
+query methods return ``None`` and the tool falls back to its scan.
+
+``bills`` joins the records of many homes with a ``TariffSchedule`` in one
+pass: every record is matched to the tariff segment of its home and day by
+a single ``searchsorted`` over ``(home, day)`` keys.
+"""
+
+import calendar
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+
+from ..indexed_table import IndexedTable
+from ..table_view import TableView
+from .tariffs import OPEN_END, TariffSchedule
+
+YEAR = 2025
+_NAT = np.datetime64("NaT", "D")
+# Ordinal of day 0 of ``datetime64[D]``, and the width of one home's day range in bill keys
+_EPOCH_ORDINAL = np.datetime64("1970-01-01", "D").astype(object).toordinal()
+_SPAN = OPEN_END + 1
+
+# (home, device, room, raw device_id, date, canonical, power, exact, regular)
+_Decoded = Tuple[str, str, str, Any, Any, bool, float, bool, bool]
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class EnergyStore(TableView):
+    """NumPy columns of ``historical_energy_consumption``."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._rows: Dict[Hashable, _Decoded] = {}
+        self._dates: Dict[str, Tuple[Any, bool]] = {}
+        # Keys of non-dict rows; the tools' ``r.get`` raises on them
+        self._broken: Dict[Hashable, None] = {}
+        self._dirty = True
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._rows.clear()
+        self._broken.clear()
+        self._dirty = True
+
+    def add(self, key: Hashable, row: Any) -> None:
+        self._dirty = True
+        if not isinstance(row, dict):
+            self._broken[key] = None
+            return
+        device_id = row.get("device_id")
+        raw_date = row.get("date")
+        date, canonical = self._parse(raw_date)
+        power = row.get("power_used_kWh")
+        regular = "date" in row and "power_used_kWh" in row and _hashable(device_id)
+        self._rows[key] = (str(row.get("home_id")), str(device_id), str(row.get("room_id")),
+                           device_id if _hashable(device_id) else None, date, canonical,
+                           _as_float(power), type(power) is float, regular)
+
+    def discard(self, key: Hashable) -> None:
+        self._dirty = True
+        self._rows.pop(key, None)
+        self._broken.pop(key, None)
+
+    def _parse(self, value: Any) -> Tuple[Any, bool]:
+        if not isinstance(value, str):
+            return _NAT, False
+        parsed = self._dates.get(value)
+        if parsed is None:
+            try:
+                dt = datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                parsed = (_NAT, False)
+            else:
+                parsed = (np.datetime64(dt.date(), "D"), value == f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}")
+            self._dates[value] = parsed
+        return parsed
+
+    # ---- columns ----
+
+    def _build(self) -> None:
+        keys = list(self._rows)
+        decoded = list(self._rows.values())
+        n = len(keys)
+        columns = list(zip(*decoded)) if decoded else [()] * 9
+        home = np.array(columns[0], dtype=object)
+        device = np.array(columns[1], dtype=object)
+        codes: Dict[Any, int] = {}
+        device_code = np.array([codes.setdefault(raw, len(codes)) for raw in columns[3]], dtype=np.int64)
+        date = np.array(columns[4], dtype="datetime64[D]")
+        position = np.array([self.table.position(key) for key in keys], dtype=np.int64)
+        home_codes, home_inverse = np.unique(home, return_inverse=True) if n else (home, np.zeros(0, np.int64))
+        order = np.lexsort((position, date, device_code, home_inverse))
+
+        self.keys = [keys[i] for i in order]
+        self.home = home[order]
+        self.device = device[order]
+        self.room = np.array(columns[2], dtype=object)[order]
+        self.device_code = device_code[order]
+        self.date = date[order]
+        self.canonical = np.array(columns[5], dtype=bool)[order]
+        self.power = np.array(columns[6], dtype=np.float64)[order]
+        self.exact = np.array(columns[7], dtype=bool)[order]
+        self.regular = np.array(columns[8], dtype=bool)[order]
+        self.position = position[order]
+        month_start = self.date.astype("datetime64[M]")
+        self.year = month_start.astype("datetime64[Y]").astype(np.int64) + 1970
+        self.month = month_start.astype(np.int64) % 12 + 1
+        self.day = (self.date - month_start).astype(np.int64) + 1
+        valid = ~np.isnat(self.date)
+        self.year[~valid] = self.month[~valid] = self.day[~valid] = 0
+
+        # Homes are contiguous slices of the sorted columns
+        sorted_homes = home_inverse[order]
+        starts = np.searchsorted(sorted_homes, np.arange(len(home_codes)), side="left")
+        stops = np.searchsorted(sorted_homes, np.arange(len(home_codes)), side="right")
+        self._home_slices = {home_id: (int(lo), int(hi)) for home_id, lo, hi in zip(home_codes, starts, stops)}
+        # A device's rows, in table order
+        by_position = np.argsort(self.position, kind="stable")
+        self._device_rows: Dict[str, np.ndarray] = {}
+        if n:
+            devices = self.device[by_position]
+            device_ids, inverse = np.unique(devices, return_inverse=True)
+            grouped = np.argsort(inverse, kind="stable")
+            bounds = np.searchsorted(inverse[grouped], np.arange(len(device_ids) + 1))
+            for i, device_id in enumerate(device_ids):
+                self._device_rows[device_id] = by_position[grouped[bounds[i]:bounds[i + 1]]]
+        self._dirty = False
+
+    def _ready(self) -> bool:
+        if self._broken:
+            return False
+        if self._dirty:
+            self._build()
+        return True
+
+    def device_rows(self, device_id: str) -> Optional[np.ndarray]:
+        """Sorted-column indices of the rows with ``str(device_id) == device_id``, in table order."""
+        if not self._ready():
+            return None
+        rows = self._device_rows.get(device_id, np.zeros(0, np.int64))
+        return rows if self.regular[rows].all() else None
+
+    def home_rows(self, home_id: str) -> Optional[np.ndarray]:
+        """Sorted-column indices of the rows with ``str(home_id) == home_id``, by device and date."""
+        if not self._ready():
+            return None
+        lo, hi = self._home_slices.get(home_id, (0, 0))
+        rows = np.arange(lo, hi)
+        return rows if self.regular[rows].all() else None
+
+    # ---- aggregations ----
+
+    def _on(self, rows: np.ndarray, target: np.datetime64) -> np.ndarray:
+        return rows[(self.date[rows] == target) & self.canonical[rows]]
+
+    def _in_month(self, rows: np.ndarray, month: int) -> np.ndarray:
+        return rows[(self.year[rows] == YEAR) & (self.month[rows] == month)]
+
+    @staticmethod
+    def _estimate(first: np.ndarray, has_first: np.ndarray, fifteenth: np.ndarray,
+                  has_fifteenth: np.ndarray, total_days: int) -> np.ndarray:
+        both = first * 14 + fifteenth * (total_days - 14)
+        return np.where(has_first & has_fifteenth, both,
+                        np.where(has_first, first * total_days,
+                                 np.where(has_fifteenth, fifteenth * total_days, 0.0)))
+
+    def monthly_by_device(self, rows: np.ndarray, month: int
+                          ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Per-device monthly estimates of ``rows`` (one home's slice).
+
+        Devices are grouped by raw ``device_id``. Returns the device codes,
+        the table position where each first appears in the month and the
+        estimates, or ``None`` if a value used is not a float.
+        """
+        selected = self._in_month(rows, month)
+        if not len(selected):
+            empty = np.zeros(0, np.int64)
+            return empty, empty, np.zeros(0, np.float64)
+        codes = self.device_code[selected]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        groups = codes[starts]
+        first_seen = np.minimum.reduceat(self.position[selected], starts)
+        total_days = calendar.monthrange(YEAR, month)[1]
+        values = []
+        for day in (1, 15):
+            on_day = selected[self.day[selected] == day]
+            day_codes = self.device_code[on_day]
+            # Rows are sorted by position within a device and day: the last one wins
+            last = on_day[np.flatnonzero(np.r_[day_codes[1:] != day_codes[:-1], True])] if len(on_day) else on_day
+            if not self.exact[last].all():
+                return None
+            found = np.isin(groups, self.device_code[last])
+            value = np.zeros(len(groups), np.float64)
+            value[found] = self.power[last]
+            values.extend((value, found))
+        return groups, first_seen, self._estimate(*values, total_days)
+
+    def device_total(self, device_id: Any, date: Any = None, month: Any = None) -> Any:
+        """``total_power_used_kWh`` of the device tools, or ``None`` to fall back to the scan."""
+        if not isinstance(device_id, str):
+            return None
+        rows = self.device_rows(device_id)
+        if rows is None:
+            return None
+        if date:
+            target = self._target(date)
+            if target is None:
+                return None
+            if target is _NAT:
+                return 0.0
+            matches = self._on(rows, target)
+            if not len(matches):
+                return 0.0
+            return dict.__getitem__(self.table, self.keys[matches[0]])["power_used_kWh"]
+        if not month:
+            return 0.0
+        if not self._valid_month(month):
+            return None
+        selected = self._in_month(rows, month)
+        values = []
+        for day in (1, 15):
+            on_day = selected[self.day[selected] == day]
+            if len(on_day) and not self.exact[on_day[-1]]:
+                return None
+            values.extend((self.power[on_day[-1:]] if len(on_day) else np.zeros(1), np.array([len(on_day) > 0])))
+        estimate = self._estimate(*values, calendar.monthrange(YEAR, month)[1])
+        return round(float(estimate[0]), 2)
+
+    def home_total(self, home_id: Any, date: Any = None, month: Any = None) -> Any:
+        """``total_power_used_kWh`` of the home tools, or ``None`` to fall back to the scan."""
+        if not isinstance(home_id, str):
+            return None
+        rows = self.home_rows(home_id)
+        if rows is None:
+            return None
+        if date:
+            target = self._target(date)
+            if target is None:
+                return None
+            if target is _NAT:
+                return 0.0
+            matches = self._on(rows, target)
+            if not len(matches):
+                # ``sum`` of nothing is the integer 0
+                return 0
+            if not self.exact[matches].all():
+                return None
+            matches = matches[np.argsort(self.position[matches], kind="stable")]
+            return round(float(np.cumsum(np.r_[0.0, self.power[matches]])[-1]), 2)
+        if not month:
+            return 0.0
+        if not self._valid_month(month):
+            return None
+        estimates = self.monthly_by_device(rows, month)
+        if estimates is None:
+            return None
+        _, first_seen, approx = estimates
+        approx = approx[np.argsort(first_seen, kind="stable")]
+        return round(float(np.cumsum(np.r_[0.0, approx])[-1]), 2)
+
+    def monthly_totals(self, month: int) -> Dict[str, float]:
+        """Monthly estimate of every home, as the home tool computes it.
+
+        Homes whose rows the store cannot answer for exactly are left out.
+        """
+        if not self._valid_month(month) or not self._ready():
+            raise ValueError("month must be an integer from 1 to 12")
+        totals = {}
+        for home_id in self._home_slices:
+            total = self.home_total(home_id, month=month)
+            if total is not None:
+                totals[home_id] = total
+        return totals
+
+    def bills(self, tariffs: TariffSchedule, home_ids: Optional[Iterable[str]] = None,
+              start: Any = None, end: Any = None, peak_share: Optional[float] = None) -> Dict[str, float]:
+        """Energy cost of many homes at once.
+
+        Each record's kWh is priced with ``tariffs.price_segments`` (the rate
+        blended with the peak multiplier, see ``daily_price``) of its home
+        on its date. ``home_ids`` defaults to every home with records, and
+        ``start``/``end`` (``YYYY-MM-DD`` or ``date``) bound the record dates,
+        inclusive. Records without a parsable date or a tariff in force
+        cost nothing; a tariff without a numeric rate makes its home's bill NaN.
+        """
+        if self._dirty:
+            self._build()
+        homes = list(self._home_slices) if home_ids is None else list(dict.fromkeys(map(str, home_ids)))
+        # Tariff segments of all homes in one sorted key space: home index * _SPAN + day
+        segment_keys, segment_stops, prices = [], [], []
+        for i, home_id in enumerate(homes):
+            for first, stop, price in tariffs.price_segments(home_id, peak_share):
+                segment_keys.append(i * _SPAN + first)
+                segment_stops.append(i * _SPAN + stop)
+                prices.append(price)
+        slices = [self._home_slices.get(home_id, (0, 0)) for home_id in homes]
+        rows = np.concatenate([np.arange(lo, hi) for lo, hi in slices] or [np.zeros(0, np.int64)])
+        home_index = np.repeat(np.arange(len(homes)), [hi - lo for lo, hi in slices])
+        dates = self.date[rows]
+        power = self.power[rows]
+        billed = ~np.isnat(dates) & ~np.isnan(power)
+        if start is not None:
+            billed &= dates >= np.datetime64(start, "D")
+        if end is not None:
+            billed &= dates <= np.datetime64(end, "D")
+        keys = home_index * _SPAN + np.where(billed, dates.astype(np.int64) + _EPOCH_ORDINAL, 0)
+        segment = np.searchsorted(np.array(segment_keys, np.int64), keys, side="right") - 1
+        billed &= segment >= 0
+        segment = np.maximum(segment, 0)
+        if prices:
+            billed &= keys < np.array(segment_stops, np.int64)[segment]
+            cost = np.where(billed, power * np.array(prices, np.float64)[segment], 0.0)
+        else:
+            cost = np.zeros(len(rows), np.float64)
+        totals = np.bincount(home_index, weights=cost, minlength=len(homes))
+        return {home_id: float(total) for home_id, total in zip(homes, totals)}
+
+    # ---- arguments ----
+
+    def _target(self, date: Any) -> Any:
+        """Queried 1st/15th as ``datetime64``, ``_NAT`` if unparsable, ``None`` if not a string."""
+        if not isinstance(date, str):
+            return None
+        try:
+            dt = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            return _NAT
+        return np.datetime64(dt.replace(day=1 if dt.day <= 14 else 15).date(), "D")
+
+    @staticmethod
+    def _valid_month(month: Any) -> bool:
+        return type(month) is int and 1 <= month <= 12
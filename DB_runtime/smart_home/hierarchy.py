@@ -0,0 +1,149 @@
+"""
+Home hierarchy over the smart_home ``homes``, ``rooms``, ``devices`` and
+``users`` tables.
+
+``ListHomesAndRooms``, ``fetch_home_details``, ``list_devices`` and
+``FetchDevicesDetails`` scan whole tables to answer "what is in this home or
+room". ``HomeHierarchy`` keeps the parent -> children links:
+
+- owner -> homes (``homes.owner_id``), plus homes by ``home_id``
+- address -> homes (``homes.address_id``)
+- home -> rooms (``rooms.home_id``)
+- home -> devices and room -> devices (``devices.home_id``/``room_id``)
+- address -> users (``users.primary_address_id``)
+
+Every link is a ``TableView``, so inserts (``add_device``, ``create_device``),
+deletes and ``reindex`` calls after in-place edits (``update_room_details``,
+``update_home_info``, ``mark_user_inactive``) keep it in sync.
+
+Children are grouped by ``bucket_key(row.get(column))``: the result is a
+superset of the rows matching the tools' ``==``, ``str(...) ==`` and ``.get``
+filters, in table order, and the tools keep their filters. Values that
+cannot narrow (see ``narrows``) return every row. Rows that are not dicts make
+the tools' ``.get`` raise; they are always returned so the scan fails the
+same way.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+from ..indexed_table import IndexedTable, bucket_key, narrows
+from ..table_view import KeyBuckets, TableView
+
+
+class _Links(TableView):
+    """Keys of one table grouped by ``bucket_key(row.get(column))`` for each column."""
+
+    def __init__(self, table: IndexedTable, columns: Iterable[str]):
+        self.table = table
+        self.columns = tuple(columns)
+        self.groups = {column: KeyBuckets(table) for column in self.columns}
+        self.row_values: Dict[Hashable, Tuple[str, ...]] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def reset(self) -> None:
+        for buckets in self.groups.values():
+            buckets.clear()
+        self.row_values.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        values = tuple(bucket_key(row.get(column)) for column in self.columns)
+        for column, value in zip(self.columns, values):
+            self.groups[column].add(value, key)
+        self.row_values[key] = values
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        values = self.row_values.pop(key, None)
+        if values is None:
+            return
+        for column, value in zip(self.columns, values):
+            self.groups[column].remove(value, key)
+
+    def size(self, column: str, value: Any) -> int:
+        if not narrows(value):
+            return len(self.table)
+        return self.groups[column].size(bucket_key(value)) + len(self.irregular)
+
+    def rows(self, column: str, value: Any) -> List[Any]:
+        """Rows in the ``bucket_key(value)`` group of ``column`` plus irregular rows, in table order."""
+        if not narrows(value):
+            return list(dict.values(self.table))
+        keys: Iterable[Hashable] = self.groups[column].keys(bucket_key(value))
+        if self.irregular:
+            keys = sorted([*keys, *self.irregular], key=self.table.position)
+        return [dict.__getitem__(self.table, key) for key in keys]
+
+
+class HomeHierarchy:
+    """Parent -> children links between homes, rooms, devices and users."""
+
+    def __init__(self, homes: IndexedTable, rooms: IndexedTable, devices: IndexedTable,
+                 users: IndexedTable):
+        self.homes = _Links(homes, ("owner_id", "home_id", "address_id"))
+        self.rooms = _Links(rooms, ("home_id",))
+        self.devices = _Links(devices, ("home_id", "room_id"))
+        self.users = _Links(users, ("primary_address_id",))
+
+    def owned_homes(self, owner_id: Any) -> List[Any]:
+        """Candidate homes of ``owner_id``, in table order."""
+        return self.homes.rows("owner_id", owner_id)
+
+    def home_candidates(self, home_id: Any, owner_id: Any) -> List[Any]:
+        """Candidate homes for a ``home_id`` and ``owner_id`` match, from the smaller group."""
+        if self.homes.size("home_id", home_id) < self.homes.size("owner_id", owner_id):
+            return self.homes.rows("home_id", home_id)
+        return self.homes.rows("owner_id", owner_id)
+
+    def address_homes(self, address_id: Any) -> List[Any]:
+        """Candidate homes at ``address_id``, in table order."""
+        return self.homes.rows("address_id", address_id)
+
+    def home_rooms(self, home_id: Any) -> List[Any]:
+        """Candidate rooms of ``home_id``, in table order."""
+        return self.rooms.rows("home_id", home_id)
+
+    def home_devices(self, home_id: Any) -> List[Any]:
+        """Candidate devices of ``home_id``, in table order."""
+        return self.devices.rows("home_id", home_id)
+
+    def room_devices(self, room_id: Any) -> List[Any]:
+        """Candidate devices of ``room_id``, in table order."""
+        return self.devices.rows("room_id", room_id)
+
+    def device_candidates(self, home_id: Any = None, room_id: Any = None) -> Iterable[Any]:
+        """Candidate devices for the given home and/or room, from the smaller group.
+
+        Falsy arguments are ignored, like the tools' ``if room_id and ...``
+        guards; without any, every device is returned.
+        """
+        criteria = [(column, value) for column, value in (("room_id", room_id), ("home_id", home_id)) if value]
+        if not criteria:
+            return dict.values(self.devices.table)
+        column, value = min(criteria, key=lambda item: self.devices.size(*item))
+        return self.devices.rows(column, value)
+
+    def residents(self, address_id: Any) -> List[Any]:
+        """Candidate users whose ``primary_address_id`` is ``address_id``, in table order."""
+        return self.users.rows("primary_address_id", address_id)
+
+    def tree(self, home_id: Any) -> List[Tuple[Any, List[Any]]]:
+        """``(room, devices)`` pairs of ``home_id``, matched with ``==`` on ``home_id``/``room_id``."""
+        pairs = []
+        for room in self.home_rooms(home_id):
+            if not isinstance(room, dict) or room.get("home_id") != home_id:
+                continue
+            room_id = room.get("room_id")
+            pairs.append((room, [device for device in self.room_devices(room_id)
+                                 if isinstance(device, dict) and device.get("room_id") == room_id
+                                 and device.get("home_id") == home_id]))
+        return pairs
@@ -0,0 +1,88 @@
+"""
+Normalized phone number index over the smart_home ``users`` table.
+
+``RetrieveUserProfile`` matches ``phone_number`` as a suffix of every user's
+phone with the non-digits stripped, running ``re.sub`` on each row per call.
+``PhoneIndex`` strips each phone once and keeps the digits reversed in a
+sorted list of ``(digits, position, key)``, so "ends with these digits" is a
+bisect over a common prefix.
+
+Rows that are not dicts make the tool's ``.get`` raise; they are always
+returned so the scan fails the same way.
+"""
+
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import TableView
+
+# Sorts after every character, bounding the entries that start with a prefix
+_HIGHEST = chr(0x10FFFF)
+
+
+def normalize_phone(value: Any) -> str:
+    """The digits of ``value``, as the tool compares them (``""`` for ``None``)."""
+    if value is None:
+        return ""
+    return re.sub(r"\D", "", str(value))
+
+
+class PhoneIndex(TableView):
+    """Reversed normalized ``phone_number`` of every user, sorted."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._entries: List[Tuple[str, int, Hashable]] = []
+        self._row_entries: Dict[Hashable, Tuple[str, int, Hashable]] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            entry = self._entry(key, row)
+            if entry is None:
+                self.irregular[key] = None
+            else:
+                self._row_entries[key] = entry
+        self._entries = sorted(self._row_entries.values())
+        table.attach(self)
+
+    def _entry(self, key: Hashable, row: Any) -> Optional[Tuple[str, int, Hashable]]:
+        if not isinstance(row, dict):
+            return None
+        return (normalize_phone(row.get("phone_number"))[::-1], self.table.position(key), key)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._row_entries.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        entry = self._entry(key, row)
+        if entry is None:
+            self.irregular[key] = None
+            return
+        self._row_entries[key] = entry
+        insort(self._entries, entry)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        entry = self._row_entries.pop(key, None)
+        if entry is not None:
+            del self._entries[bisect_left(self._entries, entry)]
+
+    # ---- lookups ----
+
+    def suffix_matches(self, digits: str) -> List[Any]:
+        """Candidate users whose normalized phone ends with ``digits``, in table order."""
+        prefix = digits[::-1]
+        lo = bisect_left(self._entries, (prefix,))
+        hi = bisect_left(self._entries, (prefix + _HIGHEST,), lo=lo)
+        keys = [entry[2] for entry in self._entries[lo:hi]]
+        keys.extend(self.irregular)
+        keys.sort(key=self.table.position)
+        return [dict.__getitem__(self.table, key) for key in keys]
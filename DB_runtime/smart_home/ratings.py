@@ -0,0 +1,164 @@
+"""
+Per-device rating aggregates over the smart_home ``user_feedbacks`` table.
+
+``AverageRatingDevice`` and ``list_feedbacks`` scan every feedback to find
+one device's rows. ``RatingAggregates`` groups feedback keys by
+``str(device_id)`` (the tools' filter) and keeps a running ``(total, count)``
+per device, updated in O(1) by the feedback inserts (``add_feedback``,
+``add_user_feedback``, ``add_device_feedback``, ``post_feedback``).
+
+Totals are added with the tool's own ``total += row.get("rating", 0)``, in
+table order. Integer totals do not depend on that order, so deletes just
+subtract. A device holding a non-integer rating is summed again over its
+own rows, in table order, after a delete or an out-of-order insert, so its
+float total stays bit-identical to the scan. Devices with a rating that is
+not a number (the tool's ``+=`` raises) are not answered.
+"""
+
+import heapq
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+class _Tally:
+    """Running rating total of one device."""
+
+    def __init__(self) -> None:
+        self.total: Any = 0
+        self.count = 0
+        self.last_position = -1
+        # Ratings that are not integers / not numbers at all
+        self.inexact = 0
+        self.invalid = 0
+        self.stale = False
+
+
+class RatingAggregates(TableView):
+    """Rating ``(total, count)`` and feedback keys per ``str(device_id)``."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._by_device = KeyBuckets(table)
+        self._tallies: Dict[str, _Tally] = {}
+        self._row_ratings: Dict[Hashable, Tuple[str, Any]] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._by_device.clear()
+        self._tallies.clear()
+        self._row_ratings.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        device_id, rating = str(row.get("device_id")), row.get("rating", 0)
+        self._by_device.add(device_id, key)
+        self._row_ratings[key] = (device_id, rating)
+        tally = self._tallies.setdefault(device_id, _Tally())
+        tally.count += 1
+        if not _is_number(rating):
+            tally.invalid += 1
+            return
+        if not isinstance(rating, int):
+            tally.inexact += 1
+        position = self.table.position(key)
+        if position < tally.last_position and tally.inexact:
+            tally.stale = True
+        tally.last_position = max(tally.last_position, position)
+        if not tally.stale and not tally.invalid:
+            tally.total += rating
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        stored = self._row_ratings.pop(key, None)
+        if stored is None:
+            return
+        device_id, rating = stored
+        self._by_device.remove(device_id, key)
+        tally = self._tallies[device_id]
+        tally.count -= 1
+        if not tally.count:
+            del self._tallies[device_id]
+            return
+        if not _is_number(rating):
+            tally.invalid -= 1
+            tally.stale = True
+            return
+        if not isinstance(rating, int):
+            tally.inexact -= 1
+            tally.stale = True
+        elif tally.inexact:
+            tally.stale = True
+        elif not tally.stale and not tally.invalid:
+            tally.total -= rating
+
+    # ---- lookups ----
+
+    def _tally(self, device_id: str) -> Optional[_Tally]:
+        tally = self._tallies.get(device_id)
+        if tally is None or tally.invalid:
+            return tally
+        if tally.stale:
+            total = 0
+            for key in self._by_device.keys(device_id):
+                total += self._row_ratings[key][1]
+            tally.total, tally.stale = total, False
+        return tally
+
+    def totals(self, device_id: str) -> Optional[Tuple[Any, int]]:
+        """``(total, count)`` of ``device_id``'s ratings, ``None`` if one is not a number."""
+        tally = self._tally(device_id)
+        if tally is None:
+            return 0, 0
+        if tally.invalid:
+            return None
+        return tally.total, tally.count
+
+    def average(self, device_id: Any) -> Optional[float]:
+        """``AverageRatingDevice``'s rounded average, or ``None`` to fall back to the scan."""
+        if self.irregular or not isinstance(device_id, str):
+            return None
+        totals = self.totals(device_id)
+        if totals is None:
+            return None
+        total, count = totals
+        return round(total / count, 2) if count > 0 else 0.0
+
+    def feedbacks(self, device_id: Any) -> List[Any]:
+        """Candidate feedback rows of ``str(device_id)``, plus non-dict rows, in table order."""
+        keys = list(self._by_device.keys(str(device_id)))
+        if self.irregular:
+            keys = sorted(keys + list(self.irregular), key=self.table.position)
+        return [dict.__getitem__(self.table, key) for key in keys]
+
+    def top_devices(self, n: int, min_count: int = 1) -> List[Dict[str, Any]]:
+        """The ``n`` best-rated devices with at least ``min_count`` feedbacks.
+
+        Sorted by average (unrounded) descending, then count descending, then
+        device ID; devices with a non-numeric rating are skipped.
+        """
+        ranked = []
+        for device_id in list(self._tallies):
+            tally = self._tally(device_id)
+            if tally.invalid or tally.count < min_count:
+                continue
+            ranked.append((tally.total / tally.count, tally.count, device_id))
+        best = heapq.nsmallest(n, ranked, key=lambda item: (-item[0], -item[1], item[2]))
+        return [{"device_id": device_id, "average_rating": round(average, 2), "count": count}
+                for average, count, device_id in best]
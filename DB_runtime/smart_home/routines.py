@@ -0,0 +1,224 @@
+"""
+Routine index over the smart_home ``automated_routines`` table.
+
+``get_routines``, ``get_routine``, ``fetch_routine`` and ``retrieve_routine``
+scan every routine to match a routine, user or home. ``RoutineIndex`` groups
+routine keys by ``str(routine_id)``, ``str(user_id)`` and ``str(home_id)``.
+Routines have no device column; ``device_routines`` reaches them through
+the commands of the device in a ``CommandLog``.
+
+It also keeps a trigger schedule, for the whole table and per home. A
+routine first fires at ``start_action_date`` + ``action_time`` and then
+repeats every ``action_interval``:
+
+- ``one_time`` routines are kept sorted by that time
+- periodic routines are kept sorted by start and by phase (minute within
+  their period)
+
+"Which routines fire between T1 and T2" is then a bisect: over the start
+times for windows at least one period long, and over the phases of the
+window otherwise. Routines whose date, time or interval is not understood
+are listed in ``unscheduled``.
+
+Inserts go through the dict API and ``update_routine`` calls ``reindex``
+after its in-place edit. ``candidates`` returns a superset of the tools'
+matches in table order, including rows that are not dicts.
+"""
+
+import math
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+from .commands import COMMAND_TABLES, CommandLog
+
+# Scope of the whole-table schedule; homes are scoped by str(home_id)
+_ALL = None
+_EPOCH = datetime(1970, 1, 1)
+
+# Minutes between two firings of a periodic routine; one_time routines fire once
+PERIODS = {"every_hour": 60, "daily": 24 * 60, "weekly": 7 * 24 * 60}
+ONE_TIME = "one_time"
+
+# (minute, position, key)
+_Entry = Tuple[int, int, Hashable]
+
+
+def _minutes(moment: datetime) -> int:
+    """Whole minutes since the epoch, rounded up."""
+    return math.ceil((moment - _EPOCH) / timedelta(minutes=1))
+
+
+def _first_firing(row: Dict[str, Any]) -> Optional[int]:
+    """Minute of the routine's first firing, ``None`` when its date or time does not parse."""
+    date, time = row.get("start_action_date"), row.get("action_time")
+    if not isinstance(date, str) or not isinstance(time, str):
+        return None
+    try:
+        return _minutes(datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M"))
+    except ValueError:
+        return None
+
+
+class _Schedule:
+    """Firing times of the routines of one scope (whole table or one home)."""
+
+    def __init__(self) -> None:
+        self.once: List[_Entry] = []
+        self.by_start: Dict[int, List[_Entry]] = {period: [] for period in PERIODS.values()}
+        self.by_phase: Dict[int, List[_Entry]] = {period: [] for period in PERIODS.values()}
+
+    def __bool__(self) -> bool:
+        return bool(self.once) or any(self.by_start.values())
+
+    def add(self, period: Optional[int], entry: _Entry) -> None:
+        if period is None:
+            insort(self.once, entry)
+            return
+        insort(self.by_start[period], entry)
+        insort(self.by_phase[period], (entry[0] % period,) + entry[1:])
+
+    def remove(self, period: Optional[int], entry: _Entry) -> None:
+        if period is None:
+            del self.once[bisect_left(self.once, entry)]
+            return
+        for entries, item in ((self.by_start[period], entry),
+                              (self.by_phase[period], (entry[0] % period,) + entry[1:])):
+            del entries[bisect_left(entries, item)]
+
+    def firings(self, start: int, end: int, starts: Dict[Hashable, int]) -> List[Tuple[int, int, Hashable]]:
+        """``(first minute in [start, end), position, key)`` of every routine firing in the window."""
+        if end <= start:
+            return []
+        fired = self.once[bisect_left(self.once, (start, -1)):bisect_left(self.once, (end, -1))]
+        for period, entries in self.by_start.items():
+            if end - start >= period:
+                # Every routine that has started by the end of the window fires in it
+                for first, position, key in entries[:bisect_left(entries, (end, -1))]:
+                    fired.append((first if first >= start else start + (first - start) % period, position, key))
+                continue
+            low, high = start % period, end % period
+            phases = self.by_phase[period]
+            if low < high:
+                selected = phases[bisect_left(phases, (low, -1)):bisect_left(phases, (high, -1))]
+            else:
+                selected = phases[bisect_left(phases, (low, -1)):] + phases[:bisect_left(phases, (high, -1))]
+            for phase, position, key in selected:
+                moment = start + (phase - low) % period
+                if starts[key] <= moment < end:
+                    fired.append((moment, position, key))
+        fired.sort()
+        return fired
+
+
+class RoutineIndex(TableView):
+    """Routine keys by routine, user and home, plus their trigger schedule."""
+
+    COLUMNS = ("routine_id", "user_id", "home_id")
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._groups = {column: KeyBuckets(table) for column in self.COLUMNS}
+        self._schedules: Dict[Optional[str], _Schedule] = {}
+        self._row_entries: Dict[Hashable, Tuple[Tuple[str, ...], Optional[int], Optional[_Entry]]] = {}
+        # First firing minute per scheduled key
+        self._starts: Dict[Hashable, int] = {}
+        # Keys of routines without a usable schedule
+        self.unscheduled: Dict[Hashable, None] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        for buckets in self._groups.values():
+            buckets.clear()
+        self._schedules.clear()
+        self._row_entries.clear()
+        self._starts.clear()
+        self.unscheduled.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        values = tuple(str(row.get(column)) for column in self.COLUMNS)
+        for column, value in zip(self.COLUMNS, values):
+            self._groups[column].add(value, key)
+        interval, first = row.get("action_interval"), _first_firing(row)
+        period = PERIODS.get(interval) if isinstance(interval, str) else None
+        entry = None
+        if first is None or (period is None and interval != ONE_TIME):
+            self.unscheduled[key] = None
+        else:
+            entry = (first, self.table.position(key), key)
+            self._starts[key] = first
+            for scope in (_ALL, values[2]):
+                self._schedules.setdefault(scope, _Schedule()).add(period, entry)
+        self._row_entries[key] = (values, period, entry)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        stored = self._row_entries.pop(key, None)
+        if stored is None:
+            return
+        values, period, entry = stored
+        for column, value in zip(self.COLUMNS, values):
+            self._groups[column].remove(value, key)
+        if entry is None:
+            del self.unscheduled[key]
+            return
+        del self._starts[key]
+        for scope in (_ALL, values[2]):
+            schedule = self._schedules[scope]
+            schedule.remove(period, entry)
+            if not schedule:
+                del self._schedules[scope]
+
+    # ---- lookups ----
+
+    def candidates(self, routine_id: Any = None, user_id: Any = None, home_id: Any = None) -> Iterable[Any]:
+        """Candidate routines for the tools' filters, from the smallest group, in table order.
+
+        Only truthy string filters narrow (the tools compare with ``==``
+        and skip falsy ones); without any, every routine is returned.
+        """
+        criteria = [(column, value) for column, value in zip(self.COLUMNS, (routine_id, user_id, home_id))
+                    if value and isinstance(value, str)]
+        if not criteria:
+            return dict.values(self.table)
+        column, value = min(criteria, key=lambda item: self._groups[item[0]].size(item[1]))
+        keys: Iterable[Hashable] = self._groups[column].keys(value)
+        if self.irregular:
+            keys = sorted([*keys, *self.irregular], key=self.table.position)
+        return [dict.__getitem__(self.table, key) for key in keys]
+
+    def firing_between(self, start: datetime, end: datetime,
+                       home_id: Any = None) -> List[Tuple[datetime, Any]]:
+        """``(first firing, routine)`` of the routines firing in ``[start, end)``, soonest first.
+
+        ``home_id`` restricts to the routines whose ``str(home_id)`` matches.
+        Ties are in table order; ``unscheduled`` routines are not returned.
+        """
+        schedule = self._schedules.get(_ALL if home_id is None else str(home_id))
+        if schedule is None:
+            return []
+        return [(_EPOCH + timedelta(minutes=minute), dict.__getitem__(self.table, key))
+                for minute, _, key in schedule.firings(_minutes(start), _minutes(end), self._starts)]
+
+    def device_routines(self, device_id: Any, commands: CommandLog) -> List[Any]:
+        """Routines with a device, bulb or thermostat command for ``str(device_id)``, in table order."""
+        keys: Dict[Hashable, None] = {}
+        for table_name in COMMAND_TABLES:
+            for command in commands.commands(table_name, device_id=str(device_id)):
+                if isinstance(command, dict) and str(command.get("device_id")) == str(device_id):
+                    keys.update(self._groups["routine_id"].keys(str(command.get("routine_id"))))
+        return [dict.__getitem__(self.table, key) for key in sorted(keys, key=self.table.position)]
@@ -0,0 +1,91 @@
+"""
+Indexed container for the smart_home database.
+
+``SmartHomeData`` is an ``IndexedData`` that also exposes the smart_home
+derived stores. Each store is built on first access and then follows the
+table it is attached to.
+"""
+
+from typing import Any, Dict, Optional
+
+from ..indexed_data import IndexedData
+from .alerts import AlertIndex
+from .commands import COMMAND_TABLES, CommandLog
+from .hierarchy import HomeHierarchy
+from .phones import PhoneIndex
+from .ratings import RatingAggregates
+from .routines import RoutineIndex
+from .tariffs import TariffSchedule
+from .warranty import WarrantyTimeline
+
+try:
+    from .energy_store import EnergyStore
+except ImportError:  # NumPy is optional; energy tools then keep their scans
+    EnergyStore = None
+
+
+class SmartHomeData(IndexedData):
+    """Smart home ``data`` dict with derived lookup stores."""
+
+    writes_reindexed = True
+
+    @property
+    def alert_index(self) -> AlertIndex:
+        """Alerts grouped by home, type and status, with sorted ``triggered_at``."""
+        return self._store("alert_index", lambda: AlertIndex(self.table("emergency_alerts")),
+                           ("emergency_alerts",))
+
+    @property
+    def command_log(self) -> CommandLog:
+        """Device, bulb and thermostat commands partitioned by device."""
+        return self._store("command_log", lambda: CommandLog([self.table(name) for name in COMMAND_TABLES]),
+                           COMMAND_TABLES)
+
+    @property
+    def home_hierarchy(self) -> HomeHierarchy:
+        """Owner -> homes -> rooms -> devices and address -> users links."""
+        return self._store("home_hierarchy",
+                           lambda: HomeHierarchy(self.table("homes"), self.table("rooms"),
+                                                 self.table("devices"), self.table("users")),
+                           ("homes", "rooms", "devices", "users"))
+
+    @property
+    def phone_index(self) -> PhoneIndex:
+        """Normalized user ``phone_number`` for suffix lookups."""
+        return self._store("phone_index", lambda: PhoneIndex(self.table("users")), ("users",))
+
+    @property
+    def rating_aggregates(self) -> RatingAggregates:
+        """Running rating totals and feedback keys per device."""
+        return self._store("rating_aggregates", lambda: RatingAggregates(self.table("user_feedbacks")),
+                           ("user_feedbacks",))
+
+    @property
+    def routine_index(self) -> RoutineIndex:
+        """Routines by routine, user and home, with their trigger schedule."""
+        return self._store("routine_index", lambda: RoutineIndex(self.table("automated_routines")),
+                           ("automated_routines",))
+
+    @property
+    def tariff_schedule(self) -> TariffSchedule:
+        """Tariffs per home with their in-force day segments."""
+        return self._store("tariff_schedule", lambda: TariffSchedule(self.table("energy_tariffs")),
+                           ("energy_tariffs",))
+
+    @property
+    def warranty_timeline(self) -> WarrantyTimeline:
+        """Sorted device ``insurance_expiry_date`` per home and per room."""
+        return self._store("warranty_timeline", lambda: WarrantyTimeline(self.table("devices")), ("devices",))
+
+    @property
+    def energy_store(self) -> Optional["EnergyStore"]:
+        """Columnar ``historical_energy_consumption``, or ``None`` without NumPy."""
+        if EnergyStore is None:
+            return None
+        return self._store("energy_store", lambda: EnergyStore(self.table("historical_energy_consumption")),
+                           ("historical_energy_consumption",))
+
+
+def index_smart_home_data(data: Dict[str, Any]) -> SmartHomeData:
+    """Wrap a loaded smart_home database for indexed lookups."""
+    return SmartHomeData(data)
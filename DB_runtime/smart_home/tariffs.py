@@ -0,0 +1,253 @@
+"""
+Per-home tariff schedule over the smart_home ``energy_tariffs`` table.
+
+The tariff tools (``get_energy_tariffs_info``, ``fetch_energy_tariffs_details``,
+``retrieve_energy_tariffs_details``, ...) scan every tariff to find one
+home's, and bill computations repeat that for every home. ``TariffSchedule``
+groups tariff keys by ``str(home_id)`` and turns each home's effective
+periods into disjoint day segments: where periods overlap, the tariff that
+started last (then the later row) is in force. "Tariff in force for home H
+at T" is then one bisect.
+
+Periods are ``effective_from`` to ``effective_until`` inclusive, as in
+``get_energy_tariffs_details``; a missing ``effective_until`` is open-ended.
+Tariffs whose dates do not parse as ``YYYY-MM-DD`` are listed in
+``unscheduled`` and never in force. Segments of a home are rebuilt on the
+first lookup after one of its tariffs changes.
+
+Each segment also carries the tariff's daily price factor, the rate blended
+with its peak multiplier, which ``EnergyStore.bills`` joins with the
+consumption records.
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+# Segment stop of open-ended tariffs
+OPEN_END = date.max.toordinal() + 1
+
+# (first day, day after the last, key); days are date ordinals
+Segment = Tuple[int, int, Hashable]
+
+
+def _day(value: Any) -> Optional[int]:
+    """Ordinal of a ``YYYY-MM-DD`` string, ``None`` when it does not parse."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+
+def _seconds(value: Any) -> Optional[int]:
+    """Second of the day of an ``HH:MM:SS`` (or ``HH:MM``) string."""
+    if not isinstance(value, str):
+        return None
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _ordinal(when: Any) -> Optional[int]:
+    """Day ordinal of a ``date``/``datetime`` or of an ISO string's date part."""
+    if isinstance(when, datetime):
+        return when.toordinal()
+    if isinstance(when, date):
+        return when.toordinal()
+    if isinstance(when, str):
+        return _day(when[:10])
+    return None
+
+
+def peak_window(tariff: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """``(start, end)`` second of the day of the tariff's peak hours, ``None`` if unparsable.
+
+    ``end`` may be before ``start`` for a window spanning midnight.
+    """
+    start, end = _seconds(tariff.get("peak_hours_start")), _seconds(tariff.get("peak_hours_end"))
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def in_peak(tariff: Dict[str, Any], when: datetime) -> bool:
+    """Whether ``when`` falls in the tariff's peak hours (start inclusive, end exclusive)."""
+    window = peak_window(tariff)
+    if window is None:
+        return False
+    second = when.hour * 3600 + when.minute * 60 + when.second
+    start, end = window
+    if start <= end:
+        return start <= second < end
+    return second >= start or second < end
+
+
+def daily_price(tariff: Dict[str, Any], peak_share: Optional[float] = None) -> float:
+    """Price of one kWh used over a day: ``rate_per_kWh`` blended with the peak multiplier.
+
+    ``peak_share`` is the share of the day's energy used in peak hours;
+    by default the share of the day the peak window covers (uniform use).
+    NaN when the rate or multiplier is not a number.
+    """
+    rate, multiplier = _number(tariff.get("rate_per_kWh")), _number(tariff.get("peak_rate_multiplier"))
+    if rate is None:
+        return float("nan")
+    if peak_share is None:
+        window = peak_window(tariff)
+        peak_share = 0.0 if window is None else ((window[1] - window[0]) % 86400) / 86400
+    if not peak_share:
+        return rate
+    if multiplier is None:
+        return float("nan")
+    return rate * (1 + peak_share * (multiplier - 1))
+
+
+class TariffSchedule(TableView):
+    """Tariff keys per ``str(home_id)`` and their disjoint in-force day segments."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._homes = KeyBuckets(table)
+        # (first day, day after the last) of every scheduled tariff
+        self._periods: Dict[Hashable, Tuple[int, int]] = {}
+        self._row_homes: Dict[Hashable, str] = {}
+        self._segments: Dict[str, List[Segment]] = {}
+        self._stale: Set[str] = set()
+        # Keys of tariffs whose effective dates do not parse
+        self.unscheduled: Dict[Hashable, None] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        self._homes.clear()
+        self._periods.clear()
+        self._row_homes.clear()
+        self._segments.clear()
+        self._stale.clear()
+        self.unscheduled.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        home_id = str(row.get("home_id"))
+        self._homes.add(home_id, key)
+        self._row_homes[key] = home_id
+        self._stale.add(home_id)
+        start, until = _day(row.get("effective_from")), row.get("effective_until")
+        last = None if until is None else _day(until)
+        if start is None or (until is not None and last is None):
+            self.unscheduled[key] = None
+        else:
+            self._periods[key] = (start, OPEN_END if last is None else last + 1)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        home_id = self._row_homes.pop(key, None)
+        if home_id is None:
+            return
+        self._homes.remove(home_id, key)
+        self._stale.add(home_id)
+        self._periods.pop(key, None)
+        self.unscheduled.pop(key, None)
+
+    # ---- lookups ----
+
+    def home_tariffs(self, home_id: Any) -> Iterable[Any]:
+        """Candidate tariffs of ``home_id`` in table order, plus rows that are not dicts.
+
+        Non-string IDs do not narrow (the tools compare with ``==``); every
+        tariff is returned.
+        """
+        if not isinstance(home_id, str):
+            return dict.values(self.table)
+        keys: Iterable[Hashable] = self._homes.keys(home_id)
+        if self.irregular:
+            keys = sorted([*keys, *self.irregular], key=self.table.position)
+        return [dict.__getitem__(self.table, key) for key in keys]
+
+    def segments(self, home_id: str) -> List[Segment]:
+        """Disjoint ``(first day, stop day, key)`` segments of ``home_id``, by day."""
+        if home_id in self._stale:
+            self._stale.discard(home_id)
+            self._segments[home_id] = self._build(home_id)
+            if not self._segments[home_id]:
+                del self._segments[home_id]
+        return self._segments.get(home_id, [])
+
+    def _build(self, home_id: str) -> List[Segment]:
+        periods = []
+        for key in self._homes.keys(home_id):
+            if key in self._periods:
+                start, stop = self._periods[key]
+                periods.append((start, self.table.position(key), stop, key))
+        bounds = sorted({day for start, _, stop, _ in periods for day in (start, stop)})
+        segments: List[Segment] = []
+        for first, stop in zip(bounds, bounds[1:]):
+            # The latest-starting period covering the span wins
+            covering = [period for period in periods if period[0] <= first and stop <= period[2]]
+            if not covering:
+                continue
+            key = max(covering)[3]
+            if segments and segments[-1][2] == key and segments[-1][1] == first:
+                segments[-1] = (segments[-1][0], stop, key)
+            else:
+                segments.append((first, stop, key))
+        return segments
+
+    def tariff_at(self, home_id: Any, when: Any) -> Optional[Dict[str, Any]]:
+        """The tariff of ``str(home_id)`` in force on ``when``'s day, or ``None``.
+
+        ``when`` is a ``date``, ``datetime`` or ISO string (its date part is used).
+        """
+        day = _ordinal(when)
+        if day is None:
+            raise ValueError(f"Unsupported moment {when!r}")
+        segments = self.segments(str(home_id))
+        i = bisect_right(segments, (day, OPEN_END + 1)) - 1
+        if i < 0 or day >= segments[i][1]:
+            return None
+        return dict.__getitem__(self.table, segments[i][2])
+
+    def rate_at(self, home_id: Any, when: datetime) -> Optional[float]:
+        """Price of one kWh for ``str(home_id)`` at ``when``, peak multiplier included.
+
+        ``None`` without a tariff in force or when its rate is not a number.
+        """
+        tariff = self.tariff_at(home_id, when)
+        if tariff is None:
+            return None
+        rate = _number(tariff.get("rate_per_kWh"))
+        if rate is None or not in_peak(tariff, when):
+            return rate
+        multiplier = _number(tariff.get("peak_rate_multiplier"))
+        return None if multiplier is None else rate * multiplier
+
+    def price_segments(self, home_id: str, peak_share: Optional[float] = None
+                       ) -> List[Tuple[int, int, float]]:
+        """``(first day, stop day, daily_price)`` segments of ``home_id``."""
+        return [(first, stop, daily_price(dict.__getitem__(self.table, key), peak_share))
+                for first, stop, key in self.segments(home_id)]
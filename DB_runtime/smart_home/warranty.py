@@ -0,0 +1,152 @@
+"""
+Warranty expiry timeline over the smart_home ``devices`` table.
+
+``IsExpiredWarrantyDevices`` parses every device's ``insurance_expiry_date``
+with ``strptime`` on every call, and is typically called again and again
+with a different ``current_date``. ``WarrantyTimeline`` parses each date
+once (per distinct string) and keeps, for the whole table and per
+``str(home_id)`` and ``str(room_id)``:
+
+- the parsed expiry dates as a sorted list of ``(ordinal, position, key)``
+- the keys whose date does not parse; the tool treats them as expired
+- the keys in table order
+
+"Expired as of D" is then a single bisect split of the sorted list. Rows that
+are not dicts are returned with every group, so the tool's ``.get`` raises on
+them as in a full scan.
+"""
+
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from ..indexed_table import IndexedTable
+from ..table_view import KeyBuckets, TableView
+
+_ALL = "*"
+
+
+class _Expiries:
+    """Sorted expiry dates and unparsable keys of one group."""
+
+    def __init__(self) -> None:
+        self.dated: List[Tuple[int, int, Hashable]] = []
+        self.unparsed: Dict[Hashable, None] = {}
+
+    def expired_before(self, ordinal: int) -> int:
+        """Number of dated entries before ``ordinal``."""
+        return bisect_left(self.dated, (ordinal, -1))
+
+    def expired(self, ordinal: int) -> Set[Hashable]:
+        keys = {entry[2] for entry in self.dated[:self.expired_before(ordinal)]}
+        keys.update(self.unparsed)
+        return keys
+
+
+class WarrantyTimeline(TableView):
+    """Per-home and per-room sorted ``insurance_expiry_date`` of ``devices``."""
+
+    def __init__(self, table: IndexedTable):
+        self.table = table
+        self._parsed: Dict[Any, Optional[int]] = {}
+        self._order = {"home_id": KeyBuckets(table), "room_id": KeyBuckets(table)}
+        self._groups: Dict[Tuple[str, str], _Expiries] = {}
+        self._row_entries: Dict[Hashable, Tuple[Tuple[Tuple[str, str], ...], Any]] = {}
+        # Keys of rows that are not dicts
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+        table.attach(self)
+
+    def _ordinal(self, value: Any) -> Optional[int]:
+        """``date.toordinal()`` of the tool's parse of ``value``, ``None`` where it fails."""
+        if not isinstance(value, str):
+            return None
+        if value not in self._parsed:
+            try:
+                self._parsed[value] = datetime.strptime(value, "%Y-%m-%d").toordinal()
+            except ValueError:
+                self._parsed[value] = None
+        return self._parsed[value]
+
+    # ---- TableView ----
+
+    def reset(self) -> None:
+        for buckets in self._order.values():
+            buckets.clear()
+        self._groups.clear()
+        self._row_entries.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict):
+            self.irregular[key] = None
+            return
+        groups = ((_ALL, _ALL), ("home_id", str(row.get("home_id"))), ("room_id", str(row.get("room_id"))))
+        for column, value in groups[1:]:
+            self._order[column].add(value, key)
+        ordinal = self._ordinal(row.get("insurance_expiry_date"))
+        entry = (ordinal, self.table.position(key), key) if ordinal is not None else None
+        for group in groups:
+            expiries = self._groups.setdefault(group, _Expiries())
+            if entry is None:
+                expiries.unparsed[key] = None
+            else:
+                insort(expiries.dated, entry)
+        self._row_entries[key] = (groups, entry)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        stored = self._row_entries.pop(key, None)
+        if stored is None:
+            return
+        groups, entry = stored
+        for column, value in groups[1:]:
+            self._order[column].remove(value, key)
+        for group in groups:
+            expiries = self._groups[group]
+            if entry is None:
+                del expiries.unparsed[key]
+            else:
+                del expiries.dated[bisect_left(expiries.dated, entry)]
+            if not expiries.dated and not expiries.unparsed:
+                del self._groups[group]
+
+    # ---- lookups ----
+
+    def _group(self, home_id: Any, room_id: Any) -> Tuple[str, str]:
+        criteria = [(column, value) for column, value in (("room_id", room_id), ("home_id", home_id))
+                    if value and isinstance(value, str)]
+        if not criteria:
+            return (_ALL, _ALL)
+        return min(criteria, key=lambda group: self._order[group[0]].size(group[1]))
+
+    def split(self, current: date, home_id: Any = None, room_id: Any = None
+              ) -> Tuple[Iterable[Tuple[Hashable, Any]], Set[Hashable]]:
+        """Candidate ``(key, device)`` items in table order and the keys expired before ``current``.
+
+        Candidates come from the smaller of the home and room groups (falsy
+        or non-string filters are ignored) and are a superset of the
+        matching devices; devices whose expiry date does not parse count as
+        expired.
+        """
+        group = self._group(home_id, room_id)
+        expiries = self._groups.get(group, _Expiries())
+        expired = expiries.expired(current.toordinal())
+        if group == (_ALL, _ALL):
+            return dict.items(self.table), expired
+        keys: Iterable[Hashable] = self._order[group[0]].keys(group[1])
+        if self.irregular:
+            keys = sorted([*keys, *self.irregular], key=self.table.position)
+        return [(key, dict.__getitem__(self.table, key)) for key in keys], expired
+
+    def expired_count(self, current: date, home_id: Any = None, room_id: Any = None) -> int:
+        """Number of devices in the home or room group (or all) expired before ``current``.
+
+        Groups are keyed by ``str(home_id)``/``str(room_id)``; non-dict rows
+        are not counted.
+        """
+        expiries = self._groups.get(self._group(home_id, room_id), _Expiries())
+        return expiries.expired_before(current.toordinal()) + len(expiries.unparsed)
@@ -0,0 +1,169 @@
+"""
+Streaming helpers for large list results.
+
+The list tools (``get_investors``, ``get_funds``, ``retrieve_subscriptions``,
+``retrieve_notifications``, ``get_payment_history``) accept ``limit`` and
+``cursor``. With ``limit`` they return one page,
+``{"results": [...], "next_cursor": token}`` (``token`` is ``null`` on the
+last page). Without ``limit`` the response is the full JSON list, as before.
+
+- ``paginate(table, matches, limit, cursor, query)`` builds such a page. The
+  cursor is keyset-based: an opaque base64 string holding the key (and
+  position) of the last returned row and the filters it belongs to. The next
+  page resumes right after that row instead of re-filtering every earlier
+  row, and rows inserted or deleted in between neither repeat nor shift the
+  listing. An ``IndexedTable`` resumes in O(1) through
+  ``items_after(position)``, which also works when the last returned row was
+  deleted; a plain dict skips to the row's index in one C-level pass, or
+  seeks its key if rows before it changed (the first row of the next page if
+  it was deleted)
+- ``iter_pages(tool, data, limit, **kwargs)`` follows the cursors and yields
+  rows one page at a time, so a caller never holds more than one page
+- ``iter_json_array(rows)`` encodes any iterable of rows as a JSON array
+  chunk by chunk; joined, the chunks equal ``json.dumps(list(rows))``
+- ``write_json_array(rows, f)`` writes those chunks to a file object
+"""
+
+import base64
+import json
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, TextIO, Tuple, Type
+
+_MISSING = object()
+
+
+def iter_json_array(rows: Iterable[Any], rows_per_chunk: int = 256,
+                    encoder: Optional[json.JSONEncoder] = None) -> Iterator[str]:
+    """JSON text of ``rows`` as a list, ``rows_per_chunk`` rows per yielded chunk."""
+    encode = (encoder or json.JSONEncoder()).encode
+    yield "["
+    buffer = []
+    first = True
+    for row in rows:
+        buffer.append(encode(row) if first else ", " + encode(row))
+        first = False
+        if len(buffer) >= rows_per_chunk:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+    yield "]"
+
+
+def write_json_array(rows: Iterable[Any], f: TextIO, rows_per_chunk: int = 256) -> None:
+    """Write ``rows`` to ``f`` as a JSON array without building the whole text."""
+    for chunk in iter_json_array(rows, rows_per_chunk):
+        f.write(chunk)
+
+
+def iter_pages(tool: Type[Any], data: Dict[str, Any], limit: int = 100, **kwargs: Any) -> Iterator[Any]:
+    """Every row of a paginated tool's result, fetched ``limit`` rows per call."""
+    cursor = None
+    while True:
+        page = json.loads(tool.invoke(data, limit=limit, cursor=cursor, **kwargs))
+        yield from page["results"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return
+
+
+# -------------------- cursors --------------------
+
+def encode_cursor(query: Any, key: Hashable, position: int, next_key: Hashable) -> str:
+    """``next_cursor`` token resuming the listing of ``query`` after row ``key``.
+
+    ``position`` is ``table.position(key)`` on tables that track positions
+    and the row's index in iteration order otherwise; ``next_key`` is the
+    key of the first row of the next page.
+    """
+    state = json.dumps({"key": key, "position": position, "next": next_key, "query": query})
+    return base64.urlsafe_b64encode(state.encode()).decode()
+
+
+def decode_cursor(token: Any, query: Any) -> Dict[str, Any]:
+    """``{"key", "position", "next"}`` of an ``encode_cursor`` token issued for ``query``."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        key, position, next_key = state["key"], state["position"], state["next"]
+        same_query = state["query"] == query
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid cursor")
+    if not same_query or not isinstance(position, int) or isinstance(position, bool) or position < 0:
+        raise ValueError("Invalid cursor")
+    return {"key": key, "position": position, "next": next_key}
+
+
+def _items_after(table: Dict[Hashable, Any], after: Optional[Dict[str, Any]],
+                 items: Any) -> Iterator[Tuple[Optional[int], Hashable, Any]]:
+    """``(index, key, row)`` of the table items following the cursor row ``after``.
+
+    ``index`` is the iteration index on plain dicts and ``None`` where
+    ``table.position`` identifies the row instead.
+    """
+    if isinstance(items, list):
+        # Index lookup, in table order: bisect on the positions
+        low, high = 0, len(items)
+        if after is not None:
+            while low < high:
+                middle = (low + high) // 2
+                if table.position(items[middle][0]) <= after["position"]:
+                    low = middle + 1
+                else:
+                    high = middle
+        for i in range(low, len(items)):
+            yield None, items[i][0], items[i][1]
+        return
+    if hasattr(table, "items_after"):
+        rows = table.items_after(after["position"]) if after is not None else table.items()
+        for key, row in rows:
+            yield None, key, row
+        return
+    start = 0
+    keys = iter(table)
+    if after is not None:
+        # Plain dicts cannot seek: skip to the previous index in one C-level pass
+        start = after["position"]
+        keys = islice(table, start, None)
+        first = next(keys, _MISSING)
+        if first == after["key"]:
+            start += 1
+        elif after["key"] in table:
+            start = list(table).index(after["key"]) + 1
+            keys = islice(table, start, None)
+        elif after["next"] in table:
+            # The last returned row was deleted: resume at the row that followed it
+            start = list(table).index(after["next"])
+            keys = islice(table, start, None)
+        elif first is not _MISSING:
+            # Both were deleted: resume at the former index
+            keys = chain([first], keys)
+    # ``dict.__getitem__`` returns the rows iteration would (no copy-on-write fetch)
+    for index, key in enumerate(keys, start):
+        yield index, key, dict.__getitem__(table, key)
+
+
+def paginate(table: Dict[Hashable, Any], matches: Callable[[Any], bool], limit: Any,
+             cursor: Optional[str], query: Any, items: Any = None) -> Dict[str, Any]:
+    """One page of the rows of ``table`` that satisfy ``matches``, in table order.
+
+    ``query`` holds the tool's filters; a cursor is only accepted for the same
+    filters. ``items`` is an optional index lookup narrowing the scan (a list
+    of ``(key, row)`` in table order); any other value scans the whole table.
+    Returns ``{"results": [...], "next_cursor": token or None}``.
+    """
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        raise ValueError("limit must be a positive integer")
+    query = json.loads(json.dumps(query))
+    after = decode_cursor(cursor, query) if cursor is not None else None
+    page = []
+    for index, key, row in _items_after(table, after, items):
+        if not matches(row):
+            continue
+        if len(page) == limit:
+            last_index, last_key, _ = page[-1]
+            position = table.position(last_key) if last_index is None else last_index
+            return {"results": [row for _, _, row in page],
+                    "next_cursor": encode_cursor(query, last_key, position, key)}
+        page.append((index, key, row))
+    return {"results": [row for _, _, row in page], "next_cursor": None}
+
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Iterator, Set
+
+
+class TableView(ABC):
+    """Derived structure kept in sync with an ``IndexedTable``.
+
+    The table calls ``add`` after a row is inserted or overwritten, ``discard``
+    before an overwrite and after a delete, and ``reset`` when it is cleared.
+    """
+
+    @abstractmethod
+    def add(self, key: Hashable, row: Any) -> None:
+        ...
+
+    @abstractmethod
+    def discard(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def reset(self) -> None:
+        ...
+
+
+class KeyBuckets:
+    """Groups table keys into buckets, each kept in table iteration order.
+
+    New rows are appended at the end of the table, so appending their keys
+    keeps a bucket ordered. A key re-added after an in-place edit may land
+    out of order; the bucket is then re-sorted by table position on its next
+    read.
+    """
+
+    def __init__(self, table: Any):
+        self.table = table
+        self.clear()
+
+    def clear(self) -> None:
+        self._buckets: Dict[Hashable, Dict[Hashable, None]] = {}
+        self._unsorted: Set[Hashable] = set()
+
+    def add(self, bucket_id: Hashable, key: Hashable) -> None:
+        bucket = self._buckets.setdefault(bucket_id, {})
+        if bucket and self.table.position(key) < self.table.position(next(reversed(bucket))):
+            self._unsorted.add(bucket_id)
+        bucket[key] = None
+
+    def remove(self, bucket_id: Hashable, key: Hashable) -> None:
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None or key not in bucket:
+            return
+        del bucket[key]
+        if not bucket:
+            del self._buckets[bucket_id]
+            self._unsorted.discard(bucket_id)
+
+    def keys(self, bucket_id: Hashable) -> Dict[Hashable, None]:
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            return {}
+        if bucket_id in self._unsorted:
+            bucket = dict.fromkeys(sorted(bucket, key=self.table.position))
+            self._buckets[bucket_id] = bucket
+            self._unsorted.discard(bucket_id)
+        return bucket
+
+    def size(self, bucket_id: Hashable) -> int:
+        return len(self._buckets.get(bucket_id, ()))
+
+    def __contains__(self, bucket_id: Hashable) -> bool:
+        return bucket_id in self._buckets
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._buckets)
@@ -0,0 +1,20 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def load_tool():
+    """Load a tool class from its standalone file, e.g. ``load_tool(path, "GetFunds")``."""
+    pytest.importorskip("tau_bench")
+
+    def load(path, name):
+        spec = importlib.util.spec_from_file_location(name, REPO / path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return getattr(module, name)
+
+    return load
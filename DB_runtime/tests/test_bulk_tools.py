@@ -0,0 +1,57 @@
+import copy
+import json
+
+import pytest
+
+from DB_runtime import index_data
+
+BULK_TOOLS = [
+    ("finance/interface_2/add_new_trades_for_fund.py", "AddNewTradesForFund", "trades", "trades",
+     {"fund_id": "1", "instrument_id": "1", "trade_date": "2025-01-02", "quantity": 5, "price": 10.0,
+      "side": "buy"},
+     {"fund_id": "1", "instrument_id": "1", "trade_date": "2025-01-02", "quantity": 5, "price": 10.0,
+      "side": "hold"}),
+    ("finance/interface_3/add_new_holdings.py", "AddNewHoldings", "holdings", "portfolio_holdings",
+     {"portfolio_id": "1", "instrument_id": "1", "quantity": 5, "cost_basis": 10.0},
+     {"portfolio_id": "9", "instrument_id": "1", "quantity": 5, "cost_basis": 10.0}),
+    ("finance/interface_5/record_payments.py", "RecordPayments", "payments", "payments",
+     {"invoice_id": "1", "payment_date": "2025-01-02", "amount": 10.0, "payment_method": "wire"},
+     {"invoice_id": "1", "payment_date": "2025-01-02", "amount": 10.0, "payment_method": "cash"}),
+]
+
+
+def _data(table):
+    return {
+        "funds": {"1": {"fund_id": "1"}},
+        "instruments": {"1": {"instrument_id": "1"}},
+        "portfolios": {"1": {"portfolio_id": "1"}},
+        "invoices": {"1": {"invoice_id": "1"}},
+        table: {"1": {"id": "1"}, "2": {"id": "2"}, "5": {"id": "5"}},
+    }
+
+
+@pytest.mark.parametrize("path, name, argument, table, good, bad", BULK_TOOLS)
+def test_failed_rows_allocate_no_ids(path, name, argument, table, good, bad, load_tool):
+    tool = load_tool(path, name)
+    rows = [good, bad, dict(good), "not a record", dict(good, extra=1), dict(good)]
+    outputs = []
+    for data in (_data(table), index_data(_data(table))):
+        # The freed top ID is handed out again, as the key scan would
+        del data[table]["5"]
+        result = json.loads(tool.invoke(data, **{argument: copy.deepcopy(rows)}))
+        assert [error["index"] for error in result["errors"]] == [1, 3, 4]
+        assert sorted(data[table], key=int) == ["1", "2", "3", "4", "5"]
+        outputs.append((result, dict(data[table])))
+    assert outputs[0] == outputs[1]
+
+
+@pytest.mark.parametrize("path, name, argument, table, good, bad", BULK_TOOLS)
+def test_nothing_is_written_when_ids_cannot_be_allocated(path, name, argument, table, good, bad, load_tool):
+    tool = load_tool(path, name)
+    for data in (_data(table), index_data(_data(table))):
+        data[table]["legacy"] = {"id": "legacy"}
+        before = dict(data[table])
+        result = json.loads(tool.invoke(data, **{argument: [good, bad, dict(good)]}))
+        assert result["created"] == []
+        assert [error["index"] for error in result["errors"]] == [0, 1, 2]
+        assert dict(data[table]) == before
@@ -0,0 +1,55 @@
+import copy
+import json
+import pickle
+
+from DB_runtime import ColumnarTable, columnar_data
+
+
+def _rows():
+    return {
+        "1": {"trade_id": "1", "quantity": 5, "price": 10.5, "side": "buy", "status": "executed"},
+        "2": {"trade_id": "2", "price": 11.0, "quantity": 2 ** 70, "side": "sell", "status": "executed"},
+        "3": {"trade_id": "3", "quantity": 1.5, "price": None, "side": "buy"},
+        "4": {"trade_id": "4", "quantity": -0.0, "price": float("inf"), "side": "buy", "status": "failed",
+              "tags": ["a", "b"]},
+        "5": {"trade_id": "5", "quantity": True, "price": 3, "side": "sell", "status": "executed"},
+    }
+
+
+def _same(table, rows):
+    assert table == rows
+    assert list(table.items()) == list(rows.items())
+    for row, expected in zip(table.values(), rows.values()):
+        assert [(key, type(value)) for key, value in row.items()] == \
+            [(key, type(value)) for key, value in expected.items()]
+    assert json.dumps(table) == json.dumps(rows)
+
+
+def test_columnar_table_round_trips_rows():
+    rows = _rows()
+    table = ColumnarTable(copy.deepcopy(rows))
+    _same(table, rows)
+    assert pickle.loads(pickle.dumps(table)) == rows
+    # In-place edits through table[key] persist, through compact() as well
+    for tables in (rows, table):
+        tables["1"]["price"] = "n/a"
+        tables["3"]["status"] = "pending"
+        del tables["2"]
+        tables["6"] = {"trade_id": "6", "quantity": 1, "price": 2.0}
+    _same(table, rows)
+    assert table.hot_rows() == 3
+    table.compact()
+    assert table.hot_rows() == 0
+    _same(table, rows)
+
+
+def test_tools_match_on_columnar_data(load_tool):
+    details = load_tool("finance/interface_2/get_fund_trade_details.py", "GetFundTradeDetails")
+    update = load_tool("finance/interface_2/update_trade_for_fund.py", "UpdateTradeForFund")
+    plain = {"trades": {key: dict(row, fund_id="1", instrument_id="1") for key, row in _rows().items()}}
+    data = columnar_data(copy.deepcopy(plain))
+    assert isinstance(data["trades"], ColumnarTable)
+    for tables in (plain, data):
+        update.invoke(tables, trade_id="4", quantity=8, price=9.5, status="pending")
+    assert details.invoke(data, fund_id="1") == details.invoke(plain, fund_id="1")
+    assert details.invoke(data, fund_id="1", side="sell") == details.invoke(plain, fund_id="1", side="sell")
@@ -0,0 +1,181 @@
+import copy
+import json
+from decimal import Decimal
+
+import pytest
+
+from DB_runtime.finance import index_finance_data
+
+
+def _prices():
+    rows = [("1", "2025-01-02", 10.0), ("2", "2025-01-02", 20.0), ("1", "2025-01-01", 9.0),
+            ("1", "2025-01-03", 11.0), ("2", "2024-12-31", 19.0), ("1", "2025-01-02", 10.5)]
+    return {
+        "instruments": {"1": {"instrument_id": "1", "ticker": "AAA", "name": "Alpha"},
+                        "2": {"instrument_id": "2", "ticker": "BBB", "name": "Beta"}},
+        "instrument_prices": {str(i): {"price_id": str(i), "instrument_id": instrument, "price_date": date,
+                                       "close_price": close}
+                              for i, (instrument, date, close) in enumerate(rows, 1)},
+    }
+
+
+def _price_as_of(prices, instrument_id, as_of_date):
+    dated = [row for row in prices.values()
+             if row["instrument_id"] == instrument_id and row["price_date"] <= as_of_date]
+    if not dated:
+        return None
+    latest = max(row["price_date"] for row in dated)
+    return next(row for row in dated if row["price_date"] == latest)
+
+
+def test_price_series_matches_the_scan(load_tool):
+    fetch = load_tool("finance/interface_2/fetch_instruments_with_its_price.py", "FetchInstrumentsWithItsPrice")
+    plain = _prices()
+    data = index_finance_data(copy.deepcopy(plain))
+
+    def check():
+        series = data.price_series
+        prices = plain["instrument_prices"]
+        for instrument_id in ("1", "2", "3"):
+            assert series.dates(instrument_id) == sorted({row["price_date"] for row in prices.values()
+                                                          if row["instrument_id"] == instrument_id})
+            for date in ("2024-12-30", "2025-01-01", "2025-01-02", "2025-01-05"):
+                assert series.records_on(instrument_id, date) == [
+                    row for row in prices.values()
+                    if row["instrument_id"] == instrument_id and row["price_date"] == date]
+                assert series.price_as_of(instrument_id, date) == _price_as_of(prices, instrument_id, date)
+                assert json.loads(fetch.invoke(data, date=date)) == json.loads(fetch.invoke(plain, date=date))
+
+    check()
+    # Edit a row in place, delete the first row of a date and append a new one
+    for tables in (plain, data):
+        tables["instrument_prices"]["3"]["price_date"] = "2025-01-04"
+        if hasattr(tables["instrument_prices"], "reindex"):
+            tables["instrument_prices"].reindex("3")
+        del tables["instrument_prices"]["1"]
+        tables["instrument_prices"]["7"] = {"price_id": "7", "instrument_id": "2", "price_date": "2025-01-01",
+                                            "close_price": 19.5}
+    check()
+
+
+def _navs():
+    rows = [("1", "2025-01-02", 101.0), ("1", "2025-01-01", 100.0), ("2", "2025-01-01", 50.0),
+            ("1", "2025-01-04", 99.5), ("2", "2025-01-02", 52.5), ("2", "2025-01-04", 51.0)]
+    return {"nav_records": {str(i): {"nav_id": str(i), "fund_id": fund, "nav_date": date, "nav_value": value}
+                            for i, (fund, date, value) in enumerate(rows, 1)}}
+
+
+def test_batch_daily_pnl_matches_the_tool_scan(load_tool):
+    np = pytest.importorskip("numpy")
+    pnl_tool = load_tool("finance/interface_2/get_daily_profit_loss_by_fund.py", "GetDailyProfitLossByFund")
+    plain = _navs()
+    data = index_finance_data(copy.deepcopy(plain))
+    funds = ["1", "2", "3"]
+    dates = ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]
+
+    def scan_pnl(fund_id, date):
+        try:
+            return json.loads(pnl_tool.invoke(plain, fund_id=fund_id, date=date))["pnl"]
+        except ValueError:
+            return np.nan
+
+    def check():
+        expected = np.array([[scan_pnl(fund_id, date) for date in dates] for fund_id in funds])
+        np.testing.assert_array_equal(data.nav_series.batch_daily_pnl(funds, dates), expected)
+
+    check()
+    for tables in (plain, data):
+        navs = tables["nav_records"]
+        navs["2"]["nav_value"] = 98.0
+        if hasattr(navs, "reindex"):
+            navs.reindex("2")
+        del navs["5"]
+        navs["7"] = {"nav_id": "7", "fund_id": "2", "nav_date": "2025-01-03", "nav_value": 53.0}
+    check()
+
+
+def _fulfillment():
+    invoices = [("1", "1"), ("2", "1"), ("3", "2"), ("4", "2")]
+    payments = [("1", "100.10", "completed"), ("1", "50", "pending"), ("2", "25.5", "completed"),
+                ("3", "300", "completed"), ("2", "0.40", "completed"), ("4", "10", "failed")]
+    return {
+        "commitments": {"1": {"commitment_id": "1", "commitment_amount": 1000},
+                        "2": {"commitment_id": "2", "commitment_amount": 600}},
+        "invoices": {invoice_id: {"invoice_id": invoice_id, "commitment_id": commitment_id}
+                     for invoice_id, commitment_id in invoices},
+        "payments": {str(i): {"payment_id": str(i), "invoice_id": invoice_id, "amount": amount, "status": status}
+                     for i, (invoice_id, amount, status) in enumerate(payments, 1)},
+    }
+
+
+def _total_paid(tables, commitment_id):
+    invoice_ids = [invoice["invoice_id"] for invoice in tables["invoices"].values()
+                   if invoice["commitment_id"] == commitment_id]
+    return sum((Decimal(str(payment["amount"])) for payment in tables["payments"].values()
+                if payment["invoice_id"] in invoice_ids and payment["status"] == "completed"), Decimal("0"))
+
+
+def test_commitment_rollup_matches_the_scan(load_tool):
+    fulfillment = load_tool("finance/interface_4/get_commitment_fulfillment_percentage.py",
+                            "GetCommitmentFulfillmentPercentage")
+    plain = _fulfillment()
+    data = index_finance_data(copy.deepcopy(plain))
+
+    def check():
+        for commitment_id in ("1", "2", "3"):
+            assert data.commitment_rollup.total_paid(commitment_id) == _total_paid(plain, commitment_id)
+        for commitment_id in ("1", "2"):
+            assert fulfillment.invoke(data, commitment_id=commitment_id) == \
+                fulfillment.invoke(plain, commitment_id=commitment_id)
+
+    check()
+    for tables in (plain, data):
+        payments = tables["payments"]
+        payments["2"]["status"] = "completed"
+        if hasattr(payments, "reindex"):
+            payments.reindex("2")
+        del payments["4"]
+        tables["invoices"]["4"] = {"invoice_id": "4", "commitment_id": "1"}
+        payments["7"] = {"payment_id": "7", "invoice_id": "4", "amount": 12.25, "status": "completed"}
+    check()
+
+
+def _holdings():
+    portfolios = [("1", "10"), ("2", "20"), ("3", "10")]
+    holdings = [("1", "1"), ("3", "2"), ("2", "1"), ("1", "2"), ("3", "1")]
+    return {
+        "instruments": {"1": {"instrument_id": "1", "ticker": "AAA"}, "2": {"instrument_id": "2", "ticker": "BBB"}},
+        "portfolios": {portfolio_id: {"portfolio_id": portfolio_id, "investor_id": investor_id}
+                       for portfolio_id, investor_id in portfolios},
+        "portfolio_holdings": {str(i): {"holding_id": str(i), "portfolio_id": portfolio_id,
+                                        "instrument_id": instrument_id, "quantity": i}
+                               for i, (portfolio_id, instrument_id) in enumerate(holdings, 1)},
+    }
+
+
+def _investor_holdings(tables, investor_id):
+    return [(portfolio, [holding for holding in tables["portfolio_holdings"].values()
+                         if holding["portfolio_id"] == portfolio["portfolio_id"]])
+            for portfolio in tables["portfolios"].values() if portfolio["investor_id"] == investor_id]
+
+
+def test_holdings_view_matches_the_scan(load_tool):
+    fetch = load_tool("finance/interface_5/fetch_investor_portfolio.py", "FetchInvestorPortfolio")
+    plain = _holdings()
+    data = index_finance_data(copy.deepcopy(plain))
+
+    def check():
+        for investor_id in ("10", "20", "30"):
+            assert data.holdings_view.investor_holdings(investor_id) == _investor_holdings(plain, investor_id)
+            assert fetch.invoke(data, investor_id=investor_id) == fetch.invoke(plain, investor_id=investor_id)
+
+    check()
+    for tables in (plain, data):
+        holdings = tables["portfolio_holdings"]
+        holdings["2"]["portfolio_id"] = "2"
+        if hasattr(holdings, "reindex"):
+            holdings.reindex("2")
+        del holdings["3"]
+        holdings["6"] = {"holding_id": "6", "portfolio_id": "3", "instrument_id": "2", "quantity": 6}
+        tables["portfolios"]["1"] = {"portfolio_id": "1", "investor_id": "20"}
+    check()
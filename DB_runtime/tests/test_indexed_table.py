@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from DB_runtime import index_data
+from DB_runtime.indexed_table import IndexedTable, bucket_key
+
+
+@pytest.mark.parametrize("values", [
+    (100, 100.0, "100", "100.0"),
+    (True, 1, 1.0, "True", "1"),
+    (False, 0, -0.0, "False", "0"),
+    (0.5, "0.5"),
+    (10 ** 20, str(10 ** 20), 1e20),
+])
+def test_equal_values_share_a_bucket(values):
+    assert len({bucket_key(value) for value in values}) == 1
+
+
+def test_candidates_cover_equal_numbers():
+    table = IndexedTable({
+        "1": {"nav_id": "1", "nav_value": 100.0, "active": True},
+        "2": {"nav_id": 1, "nav_value": "100", "active": 1},
+        "3": {"nav_id": "3", "nav_value": 101, "active": False},
+    })
+    assert [row["nav_id"] for row in table.candidates({"nav_value": 100})] == ["1", 1]
+    assert [row["nav_id"] for row in table.candidates({"nav_id": 1.0})] == ["1", 1]
+    assert [row["nav_id"] for row in table.candidates({"active": 1})] == ["1", 1]
+
+
+def test_non_scalar_criteria_do_not_narrow():
+    table = IndexedTable({"1": {"tags": [1]}, "2": {"tags": [1.0]}})
+    assert len(table.candidates({"tags": [1]})) == 2
+
+
+def test_tools_match_the_scan_on_numeric_filters(load_tool):
+    get_nav_records = load_tool("finance/interface_2/get_nav_records.py", "GetNAVRecords")
+    find_reports = load_tool("finance/interface_2/find_reports.py", "FindReports")
+    data = {
+        "nav_records": {"1": {"nav_id": "1", "nav_value": 100.0}, "2": {"nav_id": 2, "nav_value": 99.5}},
+        "reports": {"1": {"report_id": "1", "status": True}, "2": {"report_id": "2", "status": "draft"}},
+    }
+    indexed = index_data(json.loads(json.dumps(data)))
+    for filters in ({"nav_value": 100}, {"nav_id": 2.0}, {"nav_id": 1}):
+        expected = get_nav_records.invoke(data, filters=filters)
+        assert get_nav_records.invoke(indexed, filters=filters) == expected
+    assert json.loads(get_nav_records.invoke(indexed, filters={"nav_value": 100}))[0]["nav_id"] == "1"
+    for filters in ({"status": 1}, {"status": True}, {"status": "draft"}):
+        assert find_reports.invoke(indexed, filters=filters) == find_reports.invoke(data, filters=filters)
+
+
+def _users():
+    names = [("Ana", "Smith", "ana@x.io"), ("anabel", "Brown", "AB@x.io"), ("Joan", "Smithers", "joan@x.io"),
+             ("Bob", "Lee", "bob@x.io"), ("Hana", "Ng", "hana@y.io")]
+    return {"users": {str(i): {"user_id": str(i), "first_name": first, "last_name": last, "email": email,
+                               "role": "admin" if i % 2 else "viewer"}
+                      for i, (first, last, email) in enumerate(names, 1)}}
+
+
+def test_text_search_matches_the_scan(load_tool):
+    find_user = load_tool("finance/interface_3/find_user.py", "FindUser")
+    plain = _users()
+    data = index_data(json.loads(json.dumps(plain)))
+    queries = [("first_name", "an"), ("first_name", "ANA"), ("last_name", "smith"), ("last_name", "x"),
+               ("first_name", "a")]
+    emails = ["ana@x.io", "ab@X.IO", "nobody@x.io"]
+
+    def check():
+        users = data["users"]
+        for column, query in queries:
+            expected = [row for row in plain["users"].values() if query.lower() in row[column].lower()]
+            assert [row for row in users.search(column, query) if query.lower() in row[column].lower()] == expected
+            assert find_user.invoke(data, filters={column: query}) == find_user.invoke(plain, filters={column: query})
+        for email in emails:
+            assert [row for row in users.search("email", email, exact=True)
+                    if row["email"].lower() == email.lower()] == \
+                [row for row in plain["users"].values() if row["email"].lower() == email.lower()]
+            filters = {"email": email, "first_name": "a"}
+            assert find_user.invoke(data, filters=filters) == find_user.invoke(plain, filters=filters)
+
+    check()
+    assert [row["user_id"] for row in data["users"].search("last_name", "lee")] == ["4"]
+    for tables in (plain, data):
+        users = tables["users"]
+        users["4"]["first_name"] = "Anatole"
+        users["4"]["email"] = "ANA@x.io"
+        if hasattr(users, "reindex"):
+            users.reindex("4")
+        del users["1"]
+        users["6"] = {"user_id": "6", "first_name": "Diana", "last_name": "Smith", "email": "d@x.io", "role": "viewer"}
+    check()
+
+
+def _devices():
+    return {"devices": {str(i): {"device_id": str(i), "home_id": str(i % 2), "room_id": str(i % 4),
+                                 "device_type": "bulb", "status": "on", "width_ft": i / 4, "length_ft": 20 - i,
+                                 "price": float(i % 5)}
+                        for i in range(1, 21)}}
+
+
+def test_range_candidates_match_the_scan(load_tool):
+    list_devices = load_tool("API_sanity_checks/smart_home/interface_5/list_devices.py", "ListDevices")
+    plain = _devices()
+    data = index_data(json.loads(json.dumps(plain)))
+    queries = [{"less_than_width_ft": 1.5}, {"less_than_width_ft": 4, "less_than_length_ft": 12},
+               {"price": 3}, {"price": 2.0, "less_than_width_ft": 3}, {"less_than_length_ft": 0}]
+
+    def check():
+        devices = data["devices"]
+        for bound in (0.5, 1.5, 4.0):
+            expected = [row for row in plain["devices"].values() if float(row["width_ft"]) < bound]
+            assert [row for row in devices.range_candidates([("width_ft", "<", bound)])
+                    if float(row["width_ft"]) < bound] == expected
+        assert len(devices.range_candidates([("width_ft", "<", 1.5)])) < len(devices)
+        for query in queries:
+            assert list_devices.invoke(data, **query) == list_devices.invoke(plain, **query)
+
+    check()
+    for tables in (plain, data):
+        devices = tables["devices"]
+        devices["20"]["width_ft"] = 0.1
+        if hasattr(devices, "reindex"):
+            devices.reindex("20")
+        del devices["2"]
+        devices["21"] = {"device_id": "21", "home_id": "1", "room_id": "1", "device_type": "bulb", "status": "on",
+                         "width_ft": 1.0, "length_ft": 2, "price": 3}
+    check()
@@ -0,0 +1,51 @@
+import copy
+
+import pytest
+
+from DB_runtime import index_data, instrumentation
+
+
+def _trades():
+    return {"trades": {str(i): {"trade_id": str(i), "fund_id": str(i % 4), "instrument_id": "1",
+                                "quantity": i, "price": 10.0, "status": "executed"}
+                       for i in range(1, 21)}}
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.reset()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_instrumented_tools_return_the_same_results(instrumented, load_tool):
+    details = load_tool("finance/interface_2/get_fund_trade_details.py", "GetFundTradeDetails")
+    update = load_tool("finance/interface_2/update_trade_for_fund.py", "UpdateTradeForFund")
+    originals = (details.invoke, update.invoke)
+    plain = _trades()
+    indexed = index_data(copy.deepcopy(plain))
+    expected = details.invoke(plain, fund_id="1")
+
+    instrumented.enable([details, update])
+    assert details.invoke(plain, fund_id="1") == expected
+    assert details.invoke(indexed, fund_id="1") == expected
+    # An in-place write through the proxies still reaches the table's reindex
+    update.invoke(indexed, trade_id="5", quantity=1, price=1.0, status="failed")
+    update.invoke(plain, trade_id="5", quantity=1, price=1.0, status="failed")
+    assert details.invoke(indexed, fund_id="1") == details.invoke(plain, fund_id="1")
+    assert [row["trade_id"] for row in indexed["trades"].candidates({"status": "failed"})] == ["5"]
+    with pytest.raises(ValueError):
+        update.invoke(plain, trade_id="99", quantity=1, price=1.0, status="failed")
+
+    stats = instrumented.report()
+    details_stats = stats[f"{details.__module__}.{details.__qualname__}"]
+    assert details_stats["calls"] == 4 and details_stats["errors"] == 0
+    # Two full scans of the plain table plus the five fund "1" rows twice from the index
+    assert details_stats["rows_scanned"] == {"trades": 2 * 20 + 2 * 5}
+    update_stats = stats[f"{update.__module__}.{update.__qualname__}"]
+    assert update_stats["calls"] == 3 and update_stats["errors"] == 1
+    assert len(instrumented.folded_stacks()) == 2
+
+    instrumented.disable()
+    assert (details.invoke, update.invoke) == originals
@@ -0,0 +1,46 @@
+import json
+import os
+
+from DB_runtime import load_data_dir
+
+
+def _json_load_dir(folder):
+    tables = {}
+    for name in os.listdir(folder):
+        if name.endswith(".json"):
+            with open(os.path.join(folder, name)) as f:
+                tables[name[:-5]] = json.load(f)
+    return tables
+
+
+def _write(folder, name, text, mtime_ns):
+    path = folder / name
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cached_loads_match_json_and_follow_file_changes(tmp_path):
+    folder = tmp_path / "data"
+    folder.mkdir()
+    cache_dir = str(tmp_path / "cache")
+    _write(folder, "funds.json", json.dumps({"1": {"fund_id": "1", "size": 2 ** 70, "nav": 1.5}}), 10 ** 18)
+    _write(folder, "prices.json", '{"1": {"close": NaN, "name": "caf\\u00e9"}}', 10 ** 18)
+    (folder / "notes.txt").write_text("not a table")
+
+    def check(data):
+        expected = _json_load_dir(folder)
+        assert list(data) == list(expected)
+        assert json.dumps(data) == json.dumps(expected)
+
+    check(load_data_dir(str(folder)))
+    check(load_data_dir(str(folder), cache_dir))
+    assert sorted(name.split(".")[0] for name in os.listdir(cache_dir)) == ["funds", "prices"]
+    check(load_data_dir(str(folder), cache_dir))
+    # A rewritten file is parsed again, even when only its mtime tells it apart
+    _write(folder, "funds.json", json.dumps({"1": {"fund_id": "1", "size": 2 ** 70, "nav": 2.5}}), 10 ** 18 + 1)
+    check(load_data_dir(str(folder), cache_dir))
+    # A damaged cache entry is ignored and rewritten
+    for name in os.listdir(cache_dir):
+        (tmp_path / "cache" / name).write_bytes(b"garbage")
+    check(load_data_dir(str(folder), cache_dir))
+    check(load_data_dir(str(folder), cache_dir))
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from DB_runtime import ToolCache, index_data, memoize_tool
+from DB_runtime.smart_home import index_smart_home_data
+
+
+def _rooms():
+    return {"rooms": {"1": {"room_id": "1", "status": "occupied", "room_owner_id": "7"}}}
+
+
+def test_repeated_in_place_write_is_not_served_from_cache(load_tool):
+    cache = ToolCache()
+    update = memoize_tool(load_tool("API_sanity_checks/smart_home/interface_4/update_room_status.py",
+                                     "UpdateRoomStatus"), cache)
+    data = index_smart_home_data(_rooms())
+    for status in ("occupied", "vacant", "occupied"):
+        assert json.loads(update.invoke(data, room_id="1", status=status))["status"] == status
+    assert data["rooms"]["1"]["status"] == "occupied"
+    assert cache.hits == 0
+
+
+def test_data_without_reindexing_writes_is_passed_through():
+    cache = ToolCache()
+
+    class Count:
+        calls = 0
+
+        @staticmethod
+        def invoke(data, **kwargs):
+            Count.calls += 1
+            return json.dumps(len(data.get("rooms", {})))
+
+    data = index_data(_rooms())
+    for _ in range(2):
+        cache.invoke(Count, data)
+    assert Count.calls == 2 and len(cache) == 0
+    smart_home = index_smart_home_data(_rooms())
+    for _ in range(2):
+        cache.invoke(Count, smart_home)
+    assert Count.calls == 3 and cache.hits == 1
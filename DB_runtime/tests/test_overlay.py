@@ -0,0 +1,46 @@
+import copy
+import json
+
+from DB_runtime import overlay_data
+
+
+def _trades():
+    return {
+        "funds": {"1": {"fund_id": "1"}, "2": {"fund_id": "2"}},
+        "instruments": {"1": {"instrument_id": "1"}},
+        "trades": {str(i): {"trade_id": str(i), "fund_id": str(i % 2 + 1), "instrument_id": "1",
+                            "quantity": i, "price": 10.0, "status": "executed"}
+                   for i in range(1, 6)},
+        "settings": ["shared"],
+    }
+
+
+def test_overlay_episode_matches_a_deep_copy(load_tool):
+    update = load_tool("finance/interface_2/update_trade_for_fund.py", "UpdateTradeForFund")
+    add = load_tool("finance/interface_2/add_new_trades_for_fund.py", "AddNewTradesForFund")
+    details = load_tool("finance/interface_2/get_fund_trade_details.py", "GetFundTradeDetails")
+    base = _trades()
+    snapshot = copy.deepcopy(base)
+    episode = overlay_data(base)
+    other = overlay_data(base)
+    copied = copy.deepcopy(base)
+    new_trade = {"fund_id": "2", "instrument_id": "1", "trade_date": "2025-01-02", "quantity": 7,
+                 "price": 11.0, "side": "sell"}
+    for data in (copied, episode):
+        update.invoke(data, trade_id="2", quantity=20, price=12.0, status="pending")
+        add.invoke(data, trades=[new_trade])
+        del data["trades"]["4"]
+        data["settings"].append("episode")
+    assert json.loads(details.invoke(episode, fund_id="1")) == json.loads(details.invoke(copied, fund_id="1"))
+    assert {name: dict(table) if isinstance(table, dict) else table for name, table in episode.items()} == copied
+    assert base == snapshot
+    assert other.diff() == {} and other["trades"]["2"]["status"] == "executed"
+    assert episode.diff() == {
+        "trades": {"added": {"6": copied["trades"]["6"]}, "updated": {"2": copied["trades"]["2"]},
+                   "deleted": ["4"]},
+        "settings": {"replaced": ["shared", "episode"]},
+    }
+    episode.discard("trades")
+    assert dict(episode["trades"]) == snapshot["trades"]
+    episode.discard()
+    assert episode.diff() == {}
@@ -0,0 +1,455 @@
+import copy
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from DB_runtime.smart_home import COMMAND_TABLES, alert_status, index_smart_home_data
+from DB_runtime.smart_home.tariffs import daily_price
+
+
+def _tariffs():
+    periods = [("1", "2025-01-01", "2025-01-31", 0.20), ("1", "2025-01-15", None, 0.25),
+               ("2", "2025-01-01", None, 0.10), ("1", "2025-03-01", "2025-03-31", 0.30),
+               ("2", "2025-01-10", "2025-01-12", 0.50)]
+    return {str(i): {"tariff_id": str(i), "home_id": home_id, "effective_from": start, "effective_until": until,
+                     "rate_per_kWh": rate, "peak_rate_multiplier": 1.5,
+                     "peak_hours_start": "18:00:00", "peak_hours_end": "21:00:00"}
+            for i, (home_id, start, until, rate) in enumerate(periods, 1)}
+
+
+def _tariff_in_force(tariffs, home_id, day):
+    """The covering tariff that started last, then the later row."""
+    covering = [(row["effective_from"], position, row) for position, row in enumerate(tariffs.values())
+                if str(row["home_id"]) == home_id and row["effective_from"] <= day
+                and (row["effective_until"] is None or day <= row["effective_until"])]
+    return max(covering, key=lambda entry: entry[:2])[2] if covering else None
+
+
+def _energy():
+    readings = [("1", "10", "2025-01-01", 2.5), ("1", "11", "2025-01-01", 1.0), ("2", "20", "2025-01-01", 4.0),
+                ("1", "10", "2025-01-15", 3.0), ("2", "20", "2025-01-11", 1.5), ("1", "11", "2025-02-01", 0.5),
+                ("2", "20", "2025-02-15", 2.0), ("1", "10", "2025-03-15", 1.25)]
+    return {
+        "energy_tariffs": _tariffs(),
+        "historical_energy_consumption": {
+            str(i): {"record_id": str(i), "home_id": home_id, "device_id": device_id, "room_id": "1",
+                     "date": day, "power_used_kWh": power}
+            for i, (home_id, device_id, day, power) in enumerate(readings, 1)},
+    }
+
+
+def _bills(tables, homes, start=None, end=None):
+    totals = dict.fromkeys(homes, 0.0)
+    for record in tables["historical_energy_consumption"].values():
+        home_id, day = str(record["home_id"]), record["date"]
+        if home_id not in totals or (start and day < start) or (end and day > end):
+            continue
+        tariff = _tariff_in_force(tables["energy_tariffs"], home_id, day)
+        if tariff is not None:
+            totals[home_id] += record["power_used_kWh"] * daily_price(tariff)
+    return totals
+
+
+def test_energy_bills_match_the_scan(load_tool):
+    pytest.importorskip("numpy")
+    by_home = load_tool("API_sanity_checks/smart_home/interface_3/fetch_historical_energy_consumption_by_home.py",
+                        "FetchHistoricalEnergyConsumptionByHome")
+    plain = _energy()
+    data = index_smart_home_data(copy.deepcopy(plain))
+
+    def check():
+        store = data.energy_store
+        for homes, start, end in ((["1", "2", "3"], None, None), (["2"], "2025-01-05", None),
+                                  (["1", "2"], None, "2025-01-31")):
+            assert store.bills(data.tariff_schedule, homes, start, end) == pytest.approx(
+                _bills(plain, homes, start, end))
+        for arguments in ({"home_id": "1", "month": 1}, {"home_id": "2", "date": "2025-01-20"},
+                          {"home_id": "1", "month": 3}):
+            assert by_home.invoke(data, **arguments) == by_home.invoke(plain, **arguments)
+
+    check()
+    for tables in (plain, data):
+        records = tables["historical_energy_consumption"]
+        records["2"]["power_used_kWh"] = 6.0
+        if hasattr(records, "reindex"):
+            records.reindex("2")
+        del records["4"]
+        records["9"] = {"record_id": "9", "home_id": "2", "device_id": "21", "room_id": "1",
+                        "date": "2025-01-15", "power_used_kWh": 0.75}
+        tariffs = tables["energy_tariffs"]
+        tariffs["2"]["effective_from"] = "2025-01-20"
+        if hasattr(tariffs, "reindex"):
+            tariffs.reindex("2")
+    check()
+
+
+def _homes():
+    return {
+        "homes": {"1": {"home_id": "1", "owner_id": "100", "address_id": "a", "home_type": "flat"},
+                  "2": {"home_id": "2", "owner_id": "100", "address_id": "b", "home_type": "house"}},
+        "users": {"100": {"user_id": "100", "primary_address_id": "a"},
+                  "101": {"user_id": "101", "primary_address_id": "a"},
+                  "102": {"user_id": "102", "primary_address_id": "b"}},
+        "rooms": {str(i): {"room_id": str(i), "home_id": str(i % 2 + 1), "room_type": "bedroom"} for i in range(1, 6)},
+        "devices": {str(i): {"device_id": str(i), "room_id": str(i % 5 + 1), "home_id": str((i % 5 + 1) % 2 + 1)}
+                    for i in range(1, 11)},
+    }
+
+
+def _tree(tables, home_id):
+    return [(room, [device for device in tables["devices"].values()
+                    if device["room_id"] == room["room_id"] and device["home_id"] == home_id])
+            for room in tables["rooms"].values() if room["home_id"] == home_id]
+
+
+def test_home_hierarchy_matches_the_scan(load_tool):
+    list_homes = load_tool("API_sanity_checks/smart_home/interface_5/list_homes_and_rooms.py", "ListHomesAndRooms")
+    plain = _homes()
+    data = index_smart_home_data(copy.deepcopy(plain))
+
+    def check():
+        for home_id in ("1", "2", "3"):
+            assert data.home_hierarchy.tree(home_id) == _tree(plain, home_id)
+            assert list_homes.invoke(data, home_id=home_id, owner_id="100") == \
+                list_homes.invoke(plain, home_id=home_id, owner_id="100")
+
+    check()
+    for tables in (plain, data):
+        rooms = tables["rooms"]
+        rooms["3"]["home_id"] = "1"
+        if hasattr(rooms, "reindex"):
+            rooms.reindex("3")
+        del tables["devices"]["4"]
+        tables["devices"]["11"] = {"device_id": "11", "room_id": "3", "home_id": "1"}
+        tables["users"]["102"] = {"user_id": "102", "primary_address_id": "a"}
+    check()
+
+
+def _warranties():
+    expiries = ["2025-03-01", "2024-12-31", "bad", "2025-06-30", "2025-03-01", "2026-01-01", None, "2025-01-15"]
+    return {"devices": {str(i): {"device_id": str(i), "home_id": str(i % 2), "room_id": str(i % 3),
+                                 "insurance_expiry_date": expiry}
+                        for i, expiry in enumerate(expiries, 1)}}
+
+
+def _expired_count(tables, current, home_id=None, room_id=None):
+    count = 0
+    for device in tables["devices"].values():
+        if (home_id and device["home_id"] != home_id) or (room_id and device["room_id"] != room_id):
+            continue
+        try:
+            count += datetime.strptime(device["insurance_expiry_date"], "%Y-%m-%d").date() < current
+        except (TypeError, ValueError):
+            count += 1
+    return count
+
+
+def test_warranty_timeline_matches_the_scan(load_tool):
+    is_expired = load_tool("API_sanity_checks/smart_home/interface_5/is_expired_warranty_devices.py",
+                           "IsExpiredWarrantyDevices")
+    plain = _warranties()
+    data = index_smart_home_data(copy.deepcopy(plain))
+
+    def check():
+        for current in ("2025-01-01", "2025-03-01", "2025-03-02", "2027-01-01"):
+            for home_id, room_id in ((None, None), ("1", None), (None, "2")):
+                assert data.warranty_timeline.expired_count(date.fromisoformat(current), home_id, room_id) == \
+                    _expired_count(plain, date.fromisoformat(current), home_id, room_id)
+            for home_id, room_id in ((None, None), ("1", None), (None, "2"), ("0", "0")):
+                arguments = {"current_date": current, "home_id": home_id, "room_id": room_id}
+                assert is_expired.invoke(data, **arguments) == is_expired.invoke(plain, **arguments)
+
+    check()
+    for tables in (plain, data):
+        devices = tables["devices"]
+        devices["2"]["insurance_expiry_date"] = "2025-12-31"
+        devices["4"]["home_id"] = "1"
+        for key in ("2", "4"):
+            if hasattr(devices, "reindex"):
+                devices.reindex(key)
+        del devices["5"]
+        devices["9"] = {"device_id": "9", "home_id": "0", "room_id": "0", "insurance_expiry_date": "2025-13-01"}
+    check()
+
+
+def _feedbacks():
+    ratings = [("1", 5), ("2", 3), ("1", 4), ("3", 5), ("2", 4.5), ("4", 1), ("3", 5), ("2", 2)]
+    return {"user_feedbacks": {str(i): {"feedback_id": str(i), "device_id": device_id, "user_id": "7",
+                                        "rating": rating}
+                               for i, (device_id, rating) in enumerate(ratings, 1)}}
+
+
+def _top_devices(tables, n, min_count):
+    ratings = {}
+    for feedback in tables["user_feedbacks"].values():
+        ratings.setdefault(feedback["device_id"], []).append(feedback["rating"])
+    ranked = sorted(((sum(values) / len(values), len(values), device_id) for device_id, values in ratings.items()
+                     if len(values) >= min_count), key=lambda item: (-item[0], -item[1], item[2]))
+    return [{"device_id": device_id, "average_rating": round(average, 2), "count": count}
+            for average, count, device_id in ranked[:n]]
+
+
+def test_rating_aggregates_match_the_scan(load_tool):
+    average = load_tool("API_sanity_checks/smart_home/interface_5/average_rating_device.py", "AverageRatingDevice")
+    plain = _feedbacks()
+    data = index_smart_home_data(copy.deepcopy(plain))
+
+    def check():
+        for n, min_count in ((1, 1), (3, 1), (10, 2)):
+            assert data.rating_aggregates.top_devices(n, min_count) == _top_devices(plain, n, min_count)
+        for device_id in ("1", "2", "3", "4", "5"):
+            assert average.invoke(data, device_id=device_id) == average.invoke(plain, device_id=device_id)
+
+    check()
+    for tables in (plain, data):
+        feedbacks = tables["user_feedbacks"]
+        feedbacks["4"]["rating"] = 2
+        if hasattr(feedbacks, "reindex"):
+            feedbacks.reindex("4")
+        del feedbacks["5"]
+        feedbacks["9"] = {"feedback_id": "9", "device_id": "4", "user_id": "8", "rating": 5}
+    check()
+
+
+def _profiles():
+    phones = ["+1 (555) 010-1234", "555-0101234", "0044 20 7946 0958", None, "5550199", "(555) 010-1234 ext"]
+    return {
+        "users": {str(i): {"user_id": str(i), "first_name": "U%d" % i, "phone_number": phone,
+                           "email": "u%d@x.io" % i, "primary_address_id": "a" if i % 2 else "b"}
+                  for i, phone in enumerate(phones, 1)},
+        "homes": {"1": {"home_id": "1", "address_id": "a"}, "2": {"home_id": "2", "address_id": "b"}},
+    }
+
+
+def test_phone_index_matches_the_scan(load_tool):
+    profile = load_tool("API_sanity_checks/smart_home/interface_5/retrieve_user_profile.py", "RetrieveUserProfile")
+    plain = _profiles()
+    data = index_smart_home_data(copy.deepcopy(plain))
+
+    def digits(phone):
+        return "".join(character for character in str(phone) if character.isdigit()) if phone is not None else ""
+
+    def check():
+        for query in ("1234", "0101234", "958", "5550199", "99999"):
+            assert data.phone_index.suffix_matches(query) == [
+                user for user in plain["users"].values() if digits(user["phone_number"]).endswith(query)]
+        for query in ("+1 555 010 1234", "0958", "nope"):
+            assert profile.invoke(data, phone_number=query) == profile.invoke(plain, phone_number=query)
+
+    check()
+    for tables in (plain, data):
+        users = tables["users"]
+        users["4"]["phone_number"] = "555 010 1234"
+        if hasattr(users, "reindex"):
+            users.reindex("4")
+        del users["1"]
+        users["7"] = {"user_id": "7", "first_name": "U7", "phone_number": "+44 20 7946 0958", "email": "u7@x.io",
+                      "primary_address_id": "b"}
+    check()
+
+
+def _alerts():
+    alerts = [("1", "smoke", "2025-01-03T10:00:00", None), ("2", "flood", "2025-01-01T08:00:00", "9"),
+              ("1", "smoke", "2025-01-02T12:00:00", None), ("1", "flood", "2025-01-03T10:00:00", None),
+              ("2", "smoke", "2025-01-05T00:00:00", "9"), ("1", "smoke", None, None)]
+    return {"emergency_alerts": {str(i): {"alert_id": str(i), "home_id": home_id, "device_id": "5",
+                                          "alert_type": alert_type, "severity_level": "high",
+                                          "triggered_at": triggered_at, "acknowledged_by_user": None,
+                                          "resolved_by_user": resolved_by}
+                                 for i, (home_id, alert_type, triggered_at, resolved_by) in enumerate(alerts, 1)}}
+
+
+def _triggered_between(tables, start, end, home_id=None, alert_type=None, status=None):
+    alerts = [alert for alert in tables["emergency_alerts"].values()
+              if isinstance(alert["triggered_at"], str)
+              and (start is None or start <= alert["triggered_at"]) and (end is None or alert["triggered_at"] < end)
+              and (home_id is None or alert["home_id"] == home_id)
+              and (alert_type is None or alert["alert_type"] == alert_type)
+              and (status is None or alert_status(alert) == status)]
+    return sorted(alerts, key=lambda alert: alert["triggered_at"])
+
+
+def test_alert_index_matches_the_scan(load_tool):
+    get_alerts = load_tool("API_sanity_checks/smart_home/interface_1/get_emergency_alerts.py", "GetEmergencyAlerts")
+    plain = _alerts()
+    data = index_smart_home_data(copy.deepcopy(plain))
+    windows = [(None, None, {}), ("2025-01-02", "2025-01-04", {}), ("2025-01-03T10:00:00", None, {"home_id": "1"}),
+               (None, "2025-01-05", {"alert_type": "smoke", "status": "open"}), (None, None, {"status": "resolved"})]
+
+    def check():
+        for start, end, filters in windows:
+            assert data.alert_index.triggered_between(start, end, **filters) == \
+                _triggered_between(plain, start, end, **filters)
+        for filters in ({"home_id": "1"}, {"alert_type": "smoke"}, {"home_id": "2", "resolved_by_user": "9"}):
+            assert get_alerts.invoke(data, **filters) == get_alerts.invoke(plain, **filters)
+
+    check()
+    for tables in (plain, data):
+        alerts = tables["emergency_alerts"]
+        alerts["1"]["resolved_by_user"] = "9"
+        alerts["3"]["triggered_at"] = "2025-01-06T00:00:00"
+        for key in ("1", "3"):
+            if hasattr(alerts, "reindex"):
+                alerts.reindex(key)
+        del alerts["4"]
+        alerts["7"] = dict(alerts["2"], alert_id="7", home_id="1", triggered_at="2025-01-02T12:00:00")
+    check()
+
+
+def _commands():
+    commands = {
+        "device_commands": [("1", "r1", "2025-01-02T10:00:00"), ("2", "r1", "2025-01-01T09:00:00"),
+                            ("1", "r2", None)],
+        "bulb_commands": [("1", "r1", "2025-01-02T10:00:00"), ("1", "r2", "2025-01-01T08:00:00")],
+        "thermostat_commands": [("2", "r2", "2025-01-03T07:00:00"), ("1", "r1", "2025-01-04T00:00:00")],
+    }
+    return {name: {str(i): {"command_id": str(i), "device_id": device_id, "routine_id": routine_id,
+                            "created_at": created_at}
+                   for i, (device_id, routine_id, created_at) in enumerate(rows, 1)}
+            for name, rows in commands.items()}
+
+
+def _history(tables, device_id):
+    commands = [(name, command) for name in COMMAND_TABLES for command in tables[name].values()
+                if command["device_id"] == device_id]
+    return sorted(commands, key=lambda item: (not isinstance(item[1]["created_at"], str),
+                                              item[1]["created_at"] or ""))
+
+
+def test_command_log_matches_the_scan(load_tool):
+    get_commands = load_tool("API_sanity_checks/smart_home/interface_1/get_commands.py", "GetCommands")
+    plain = _commands()
+    data = index_smart_home_data(copy.deepcopy(plain))
+
+    def check():
+        for device_id in ("1", "2", "3"):
+            history = _history(plain, device_id)
+            timed = [item for item in history if item[1]["created_at"] is not None]
+            assert data.command_log.history(device_id) == history
+            assert data.command_log.history(device_id, "2025-01-02", "2025-01-04") == \
+                [item for item in timed if "2025-01-02" <= item[1]["created_at"] < "2025-01-04"]
+            assert data.command_log.latest(device_id) == (timed[-1] if timed else None)
+        for filters in ({"device_id": "1"}, {"routine_id": "r2"}, {"device_id": "2", "routine_id": "r1"}):
+            assert get_commands.invoke(data, **filters) == get_commands.invoke(plain, **filters)
+
+    check()
+    for tables in (plain, data):
+        bulbs = tables["bulb_commands"]
+        bulbs["2"]["created_at"] = "2025-01-05T00:00:00"
+        if hasattr(bulbs, "reindex"):
+            bulbs.reindex("2")
+        del tables["thermostat_commands"]["2"]
+        tables["device_commands"]["4"] = {"command_id": "4", "device_id": "2", "routine_id": "r2",
+                                          "created_at": "2025-01-02T11:00:00"}
+    check()
+
+
+def _routines():
+    routines = [("1", "daily", "2025-01-01", "07:30"), ("2", "every_hour", "2025-01-02", "00:15"),
+                ("1", "one_time", "2025-01-03", "18:00"), ("2", "weekly", "2024-12-30", "09:00"),
+                ("1", "daily", "2025-01-02", "7:30"), ("1", "monthly", "2025-01-01", "08:00"),
+                ("2", "daily", "2025-01-05", None), ("1", "every_hour", "2025-01-02", "23:45")]
+    return {"automated_routines": {
+        str(i): {"routine_id": str(i), "user_id": str(i % 3), "home_id": home_id, "action_interval": interval,
+                 "start_action_date": day, "action_time": time}
+        for i, (home_id, interval, day, time) in enumerate(routines, 1)}}
+
+
+_PERIODS = {"every_hour": timedelta(hours=1), "daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+
+
+def _firing_between(tables, start, end, home_id=None):
+    fired = []
+    for position, routine in enumerate(tables["automated_routines"].values()):
+        if home_id is not None and routine["home_id"] != home_id:
+            continue
+        interval = routine["action_interval"]
+        try:
+            moment = datetime.strptime(f"{routine['start_action_date']} {routine['action_time']}", "%Y-%m-%d %H:%M")
+        except (TypeError, ValueError):
+            continue
+        if interval in _PERIODS:
+            while moment < start:
+                moment += _PERIODS[interval]
+        elif interval != "one_time":
+            continue
+        if start <= moment < end:
+            fired.append((moment, position, routine))
+    return [(moment, routine) for moment, _, routine in sorted(fired, key=lambda item: item[:2])]
+
+
+def test_routine_index_matches_the_scan(load_tool):
+    get_routine = load_tool("API_sanity_checks/smart_home/interface_2/get_routine.py", "GetRoutine")
+    plain = _routines()
+    data = index_smart_home_data(copy.deepcopy(plain))
+    windows = [(datetime(2025, 1, 3, 7, 0), datetime(2025, 1, 3, 8, 0)),
+               (datetime(2025, 1, 2, 23, 50), datetime(2025, 1, 3, 0, 20)),
+               (datetime(2025, 1, 1), datetime(2025, 1, 8)),
+               (datetime(2025, 1, 6, 9, 0, 30), datetime(2025, 1, 6, 18, 0)),
+               (datetime(2025, 1, 3, 18, 0), datetime(2025, 1, 3, 18, 0))]
+
+    def check():
+        for start, end in windows:
+            for home_id in (None, "1", "2", "3"):
+                assert data.routine_index.firing_between(start, end, home_id) == \
+                    _firing_between(plain, start, end, home_id)
+        for filters in ({}, {"home_id": "1"}, {"user_id": "2"}, {"routine_id": "3", "home_id": "1"}):
+            assert get_routine.invoke(data, **filters) == get_routine.invoke(plain, **filters)
+
+    check()
+    for tables in (plain, data):
+        routines = tables["automated_routines"]
+        routines["1"]["action_time"] = "18:00"
+        routines["4"]["home_id"] = "1"
+        routines["6"]["action_interval"] = "daily"
+        for key in ("1", "4", "6"):
+            if hasattr(routines, "reindex"):
+                routines.reindex(key)
+        del routines["2"]
+        routines["9"] = dict(routines["3"], routine_id="9", home_id="2", action_interval="every_hour")
+    check()
+
+
+def _rate_at(tariffs, home_id, moment):
+    tariff = _tariff_in_force(tariffs, home_id, moment.date().isoformat())
+    if tariff is None:
+        return None
+    start, end, clock = tariff["peak_hours_start"], tariff["peak_hours_end"], moment.strftime("%H:%M:%S")
+    peak = start <= clock < end if start <= end else clock >= start or clock < end
+    return tariff["rate_per_kWh"] * tariff["peak_rate_multiplier"] if peak else tariff["rate_per_kWh"]
+
+
+def test_tariff_schedule_matches_the_scan(load_tool):
+    tariffs_info = load_tool("API_sanity_checks/smart_home/interface_1/get_energy_tariffs_info.py",
+                             "GetEnergyTariffsInfo")
+    plain = {"energy_tariffs": _tariffs()}
+    data = index_smart_home_data(copy.deepcopy(plain))
+    days = [date(2024, 12, 31) + timedelta(days=offset) for offset in range(95)]
+
+    def check():
+        schedule, tariffs = data.tariff_schedule, plain["energy_tariffs"]
+        for home_id in ("1", "2", "3"):
+            for day in days:
+                expected = _tariff_in_force(tariffs, home_id, day.isoformat())
+                assert schedule.tariff_at(home_id, day) == expected
+                assert schedule.tariff_at(home_id, f"{day.isoformat()}T12:00:00") == expected
+                for hour in (1, 10, 19, 23):
+                    moment = datetime(day.year, day.month, day.day, hour)
+                    assert schedule.rate_at(home_id, moment) == _rate_at(tariffs, home_id, moment)
+            assert tariffs_info.invoke(data, home_id=home_id) == tariffs_info.invoke(plain, home_id=home_id)
+        with pytest.raises(ValueError):
+            schedule.tariff_at("1", "soon")
+
+    check()
+    for tables in (plain, data):
+        tariffs = tables["energy_tariffs"]
+        tariffs["2"]["effective_from"] = "2025-01-20"
+        tariffs["1"].update(peak_hours_start="22:00:00", peak_hours_end="02:00:00")
+        tariffs["4"]["home_id"] = "2"
+        for key in ("1", "2", "4"):
+            if hasattr(tariffs, "reindex"):
+                tariffs.reindex(key)
+        del tariffs["5"]
+        tariffs["6"] = dict(tariffs["3"], tariff_id="6", home_id="3", effective_from="2025-02-01",
+                            effective_until="2025-02-28", rate_per_kWh=0.15)
+    check()
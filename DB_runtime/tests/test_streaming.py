@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from DB_runtime import index_data, iter_pages
+from DB_runtime.indexed_table import IndexedTable
+
+
+def _subscriptions():
+    return {"subscriptions": {str(i): {"subscription_id": str(i), "fund_id": "7" if i % 3 else "8"}
+                              for i in range(1, 13)}}
+
+
+def _ids(page):
+    return [row["subscription_id"] for row in page["results"]]
+
+
+def test_items_after_skips_deleted_keys():
+    table = IndexedTable({"a": 1, "b": 2, "c": 3})
+    position = table.position("b")
+    del table["b"]
+    table["d"] = 4
+    assert list(table.items_after(position)) == [("c", 3), ("d", 4)]
+    table.clear()
+    table["e"] = 5
+    assert list(table.items_after(position)) == [("e", 5)]
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_pages_match_the_full_listing(indexed, load_tool):
+    retrieve = load_tool("finance/interface_2/retrieve_subscriptions.py", "RetrieveSubscriptions")
+    data = index_data(_subscriptions()) if indexed else _subscriptions()
+    for fund_id in (None, "7", "8"):
+        expected = json.loads(retrieve.invoke(data, fund_id=fund_id))
+        for limit in (1, 3, 8, 20):
+            assert list(iter_pages(retrieve, data, limit, fund_id=fund_id)) == expected
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_cursor_survives_changes_between_pages(indexed, load_tool):
+    retrieve = load_tool("finance/interface_2/retrieve_subscriptions.py", "RetrieveSubscriptions")
+    data = index_data(_subscriptions()) if indexed else _subscriptions()
+    subscriptions = data["subscriptions"]
+    page = json.loads(retrieve.invoke(data, limit=4))
+    assert _ids(page) == ["1", "2", "3", "4"]
+    # The last returned row and an earlier one disappear, a new row is appended
+    del subscriptions["4"]
+    del subscriptions["2"]
+    subscriptions["13"] = {"subscription_id": "13", "fund_id": "7"}
+    page = json.loads(retrieve.invoke(data, limit=4, cursor=page["next_cursor"]))
+    assert _ids(page) == ["5", "6", "7", "8"]
+    page = json.loads(retrieve.invoke(data, limit=4, cursor=page["next_cursor"]))
+    assert _ids(page) == ["9", "10", "11", "12"]
+    page = json.loads(retrieve.invoke(data, limit=4, cursor=page["next_cursor"]))
+    assert _ids(page) == ["13"] and page["next_cursor"] is None
+
+
+def test_cursor_is_bound_to_its_filters(load_tool):
+    retrieve = load_tool("finance/interface_2/retrieve_subscriptions.py", "RetrieveSubscriptions")
+    data = _subscriptions()
+    cursor = json.loads(retrieve.invoke(data, fund_id="7", limit=2))["next_cursor"]
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        retrieve.invoke(data, fund_id="8", limit=2, cursor=cursor)
+
+
+def _payments():
+    invoices = {str(i): {"invoice_id": str(i), "investor_id": str(i % 3), "fund_id": str(i % 2)}
+                for i in range(1, 7)}
+    payments = {str(i): {"payment_id": str(i), "invoice_id": str(i % 8)} for i in range(1, 25)}
+    return {"invoices": invoices, "payments": payments}
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_payment_history_pages_match_the_full_listing(indexed, load_tool):
+    history = load_tool("finance/interface_5/get_payment_history.py", "GetPaymentHistory")
+    data = index_data(_payments()) if indexed else _payments()
+    filters = [{}, {"investor_id": "1"}, {"fund_id": "0"}, {"investor_id": "2", "fund_id": "1"},
+               {"invoice_id": "3"}]
+    for query in filters:
+        expected = json.loads(history.invoke(data, **query))
+        assert list(iter_pages(history, data, 5, **query)) == expected
+    # An invoice moves to another investor: later pages follow the change
+    data["invoices"]["4"] = dict(data["invoices"]["4"], investor_id="1")
+    expected = json.loads(history.invoke(data, investor_id="1"))
+    assert [row["invoice_id"] for row in expected].count("4") == 3
+    assert list(iter_pages(history, data, 5, investor_id="1")) == expected
@@ -0,0 +1,117 @@
+"""
+Case-insensitive text index on one column of an ``IndexedTable``.
+
+The user and investor lookups compare ``value.lower()`` either exactly
+(``email``) or as a substring (``first_name``, ``last_name``, ``name``) on
+every row. ``TextIndex`` keeps, per row, the lower-cased value and:
+
+- an exact map from the lower-cased value to row keys, in table order
+- posting sets of every 1-, 2- and 3-character n-gram of the lower-cased
+  value; a substring query only has to intersect the postings of its own
+  n-grams, so partial-name lookups touch the rows sharing those n-grams
+  instead of the whole table
+
+Candidates are a superset of the matching rows: callers keep their filters,
+so results are those of the full scan. Rows whose value is present but not
+a string (``None``, numbers) make the tools' ``.lower()`` raise; they are
+kept aside and always returned as candidates, so the scan still reaches
+them and fails the same way.
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Set
+
+from .table_view import KeyBuckets, TableView
+
+GRAM_SIZE = 3
+
+
+def _grams(text: str, size: int) -> Set[str]:
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class TextIndex(TableView):
+    """Lower-cased values of ``column`` with exact and n-gram lookups."""
+
+    def __init__(self, table: Any, column: str):
+        self.table = table
+        self.column = column
+        self._exact = KeyBuckets(table)
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._row_values: Dict[Hashable, str] = {}
+        # Rows whose value is present but not a string
+        self.irregular: Dict[Hashable, None] = {}
+        for key, row in dict.items(table):
+            self.add(key, row)
+
+    def reset(self) -> None:
+        self._exact.clear()
+        self._postings.clear()
+        self._row_values.clear()
+        self.irregular.clear()
+
+    def add(self, key: Hashable, row: Any) -> None:
+        if not isinstance(row, dict) or self.column not in row:
+            # Missing values read as "" and never raise
+            value = ""
+        elif isinstance(row[self.column], str):
+            value = row[self.column].lower()
+        else:
+            self.irregular[key] = None
+            return
+        self._row_values[key] = value
+        self._exact.add(value, key)
+        for size in range(1, GRAM_SIZE + 1):
+            for gram in _grams(value, size):
+                self._postings.setdefault(gram, set()).add(key)
+
+    def discard(self, key: Hashable) -> None:
+        if key in self.irregular:
+            del self.irregular[key]
+            return
+        value = self._row_values.pop(key, None)
+        if value is None:
+            return
+        self._exact.remove(value, key)
+        for size in range(1, GRAM_SIZE + 1):
+            for gram in _grams(value, size):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(key)
+                    if not postings:
+                        del self._postings[gram]
+
+    def exact_keys(self, query: str) -> Iterable[Hashable]:
+        """Keys of rows whose lower-cased value equals ``query.lower()``, in table order."""
+        return self._exact.keys(query.lower())
+
+    def substring_keys(self, query: str) -> Set[Hashable]:
+        """Keys of rows whose lower-cased value may contain ``query.lower()`` (unordered)."""
+        needle = query.lower()
+        if not needle:
+            return set(self._row_values)
+        grams = _grams(needle, min(GRAM_SIZE, len(needle)))
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        keys = set(postings[0])
+        for other in postings[1:]:
+            keys &= other
+            if not keys:
+                break
+        return keys
+
+
+def search_keys(table: Any, indexes: List[TextIndex], query: str, exact: bool) -> List[Hashable]:
+    """Candidate keys of ``indexes[0]`` plus the irregular rows of every index, in table order."""
+    index = indexes[0]
+    if exact:
+        keys = list(index.exact_keys(query))
+        ordered = True
+    else:
+        keys = list(index.substring_keys(query))
+        ordered = False
+    extra = {key for other in indexes for key in other.irregular}
+    if extra:
+        keys = list(set(keys) | extra)
+        ordered = False
+    if not ordered:
+        keys.sort(key=table.position)
+    return keys
@@ -7,6 +7,8 @@ class CreatePortfolio(Tool):
     def invoke(data: Dict[str, Any], investor_id: str, base_currency: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -10,7 +10,12 @@ class get_commitments(Tool):
         commitments = data.get("commitments", {})
         results = []
         
-        for commitment in commitments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = commitments.values()
+        if hasattr(commitments, "candidates"):
+            rows = commitments.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for commitment in rows:
             if fund_id and commitment.get("fund_id") != fund_id:
                 continue
             if investor_id and commitment.get("investor_id") != investor_id:
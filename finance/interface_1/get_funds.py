@@ -6,24 +6,40 @@ class get_funds(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], fund_type: Optional[str] = None,
                base_currency: Optional[str] = None, manager_id: Optional[str] = None,
-               status: Optional[str] = None, name: Optional[str] = None) -> str:
+               status: Optional[str] = None, name: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
         funds = data.get("funds", {})
-        results = []
         
-        for fund in funds.values():
+        def matches(fund: Dict[str, Any]) -> bool:
             if fund_type and fund.get("fund_type") != fund_type:
-                continue
+                return False
             if base_currency and fund.get("base_currency") != base_currency:
-                continue
+                return False
             if manager_id and fund.get("manager_id") != manager_id:
-                continue
+                return False
             if status and fund.get("status") != status:
-                continue
+                return False
             if name and name.lower() not in fund.get("name", "").lower():
-                continue
-            results.append(fund)
+                return False
+            return True
         
-        return json.dumps(results)
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            # Narrow the scan through the case-insensitive name index when available
+            rows = funds.values()
+            if hasattr(funds, "search") and name:
+                rows = funds.search("name", name)
+            return json.dumps([fund for fund in rows if matches(fund)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(funds, "search_items") and name:
+            items = funds.search_items("name", name)
+        query = {"fund_type": fund_type, "base_currency": base_currency, "manager_id": manager_id,
+                 "status": status, "name": name}
+        return json.dumps(paginate(funds, matches, limit, cursor, query, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -39,7 +55,9 @@ class get_funds(Tool):
                         "base_currency": {"type": "string", "description": "Filter by base currency (USD, EUR, GBP, NGN)"},
                         "manager_id": {"type": "string", "description": "Filter by manager ID"},
                         "status": {"type": "string", "description": "Filter by status (open, closed)"},
-                        "name": {"type": "string", "description": "Filter by fund name (partial match)"}
+                        "name": {"type": "string", "description": "Filter by fund name (partial match)"},
+                        "limit": {"type": "integer", "description": "Maximum number of funds to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -8,9 +8,24 @@ class get_instruments_prices(Tool):
                price_date: Optional[str] = None, ticker: Optional[str] = None) -> str:
         instrument_prices = data.get("instrument_prices", {})
         instruments = data.get("instruments", {})
+        price_series = getattr(data, "price_series", None)
         results = []
         
-        for price in instrument_prices.values():
+        # Narrow the scans through secondary indexes when the tables have them
+        def instrument_rows(instrument_id: Any):
+            if hasattr(instruments, "candidates"):
+                return instruments.candidates({"instrument_id": instrument_id})
+            return instruments.values()
+        
+        rows = instrument_prices.values()
+        if price_series is not None and instrument_id and price_date:
+            rows = price_series.records_on(instrument_id, price_date)
+        elif price_series is not None and price_date:
+            rows = price_series.records_on_date(price_date)
+        elif hasattr(instrument_prices, "candidates"):
+            rows = instrument_prices.candidates({"instrument_id": instrument_id, "price_date": price_date})
+        
+        for price in rows:
             if instrument_id and price.get("instrument_id") != instrument_id:
                 continue
             if price_date and price.get("price_date") != price_date:
@@ -19,7 +34,7 @@ class get_instruments_prices(Tool):
             # If ticker filter is provided, need to check instrument data
             if ticker:
                 instrument = None
-                for inst in instruments.values():
+                for inst in instrument_rows(price.get("instrument_id")):
                     if inst.get("instrument_id") == price.get("instrument_id"):
                         instrument = inst
                         break
@@ -28,7 +43,7 @@ class get_instruments_prices(Tool):
             
             # Merge instrument data with price data
             instrument_with_price = dict(price)
-            for inst in instruments.values():
+            for inst in instrument_rows(price.get("instrument_id")):
                 if inst.get("instrument_id") == price.get("instrument_id"):
                     instrument_with_price.update(inst)
                     break
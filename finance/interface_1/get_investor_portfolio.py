@@ -6,8 +6,16 @@ class get_investor_portfolio(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], investor_id: str) -> str:
         portfolios = data.get("portfolios", {})
+        holdings_view = getattr(data, "holdings_view", None)
         
-        for portfolio in portfolios.values():
+        # Narrow the scan through the holdings view or secondary indexes when available
+        rows = portfolios.values()
+        if holdings_view is not None:
+            rows = holdings_view.portfolios_of(investor_id)
+        elif hasattr(portfolios, "candidates"):
+            rows = portfolios.candidates({"investor_id": investor_id})
+        
+        for portfolio in rows:
             if portfolio.get("investor_id") == investor_id:
                 return json.dumps(portfolio)
         
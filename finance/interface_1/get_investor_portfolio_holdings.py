@@ -6,9 +6,17 @@ class get_investor_portfolio_holdings(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], portfolio_id: str) -> str:
         portfolio_holdings = data.get("portfolio_holdings", {})
+        holdings_view = getattr(data, "holdings_view", None)
         results = []
         
-        for holding in portfolio_holdings.values():
+        # Narrow the scan through the holdings view or secondary indexes when available
+        rows = portfolio_holdings.values()
+        if holdings_view is not None:
+            rows = holdings_view.holdings_of(portfolio_id)
+        elif hasattr(portfolio_holdings, "candidates"):
+            rows = portfolio_holdings.candidates({"portfolio_id": portfolio_id})
+        
+        for holding in rows:
             if holding.get("portfolio_id") == portfolio_id:
                 results.append(holding)
         
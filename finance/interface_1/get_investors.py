@@ -6,22 +6,38 @@ class get_investors(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], employee_id: Optional[str] = None,
                investor_type: Optional[str] = None, accreditation_status: Optional[str] = None,
-               name: Optional[str] = None) -> str:
+               name: Optional[str] = None, limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> str:
         investors = data.get("investors", {})
-        results = []
         
-        for investor in investors.values():
+        def matches(investor: Dict[str, Any]) -> bool:
             if employee_id and investor.get("employee_id") != employee_id:
-                continue
+                return False
             if investor_type and investor.get("investor_type") != investor_type:
-                continue
+                return False
             if accreditation_status and investor.get("accreditation_status") != accreditation_status:
-                continue
+                return False
             if name and name.lower() not in investor.get("name", "").lower():
-                continue
-            results.append(investor)
+                return False
+            return True
         
-        return json.dumps(results)
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            # Narrow the scan through the case-insensitive name index when available
+            rows = investors.values()
+            if hasattr(investors, "search") and name:
+                rows = investors.search("name", name)
+            return json.dumps([investor for investor in rows if matches(investor)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(investors, "search_items") and name:
+            items = investors.search_items("name", name)
+        query = {"employee_id": employee_id, "investor_type": investor_type,
+                 "accreditation_status": accreditation_status, "name": name}
+        return json.dumps(paginate(investors, matches, limit, cursor, query, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -36,7 +52,9 @@ class get_investors(Tool):
                         "employee_id": {"type": "string", "description": "Filter by employee ID"},
                         "investor_type": {"type": "string", "description": "Filter by investor type (organization, retail, high_net_worth)"},
                         "accreditation_status": {"type": "string", "description": "Filter by accreditation status (accredited, non_accredited)"},
-                        "name": {"type": "string", "description": "Filter by investor name (partial match)"}
+                        "name": {"type": "string", "description": "Filter by investor name (partial match)"},
+                        "limit": {"type": "integer", "description": "Maximum number of investors to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -7,10 +7,16 @@ class get_portfolio_status_by_date(Tool):
     def invoke(data: Dict[str, Any], portfolio_id: str, date: str) -> str:
         portfolio_holdings = data.get("portfolio_holdings", {})
         instrument_prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         
         total_value = 0.0
         
-        for holding in portfolio_holdings.values():
+        # Narrow the scans through secondary indexes when the tables have them
+        rows = portfolio_holdings.values()
+        if hasattr(portfolio_holdings, "candidates"):
+            rows = portfolio_holdings.candidates({"portfolio_id": portfolio_id})
+        
+        for holding in rows:
             if holding.get("portfolio_id") != portfolio_id:
                 continue
             
@@ -19,7 +25,12 @@ class get_portfolio_status_by_date(Tool):
             
             # Find the price for the given date
             price = None
-            for price_record in instrument_prices.values():
+            price_rows = instrument_prices.values()
+            if price_series is not None:
+                price_rows = price_series.records_on(instrument_id, date)
+            elif hasattr(instrument_prices, "candidates"):
+                price_rows = instrument_prices.candidates({"instrument_id": instrument_id, "price_date": date})
+            for price_record in price_rows:
                 if (price_record.get("instrument_id") == instrument_id and 
                     price_record.get("price_date") == date):
                     price = float(price_record.get("close_price", 0))
@@ -10,7 +10,12 @@ class get_subscriptions(Tool):
         subscriptions = data.get("subscriptions", {})
         results = []
         
-        for subscription in subscriptions.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = subscriptions.values()
+        if hasattr(subscriptions, "candidates"):
+            rows = subscriptions.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for subscription in rows:
             if fund_id and subscription.get("fund_id") != fund_id:
                 continue
             if investor_id and subscription.get("investor_id") != investor_id:
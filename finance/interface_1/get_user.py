@@ -9,7 +9,20 @@ class get_user(Tool):
                last_name: Optional[str] = None) -> str:
         users = data.get("users", {})
         
-        for user in users.values():
+        # Narrow the scan through the user_id index or the case-insensitive text
+        # indexes when available (only for string queries, so errors stay the same)
+        rows = users.values()
+        text_queries = [(column, query) for column, query in
+                        (("email", email), ("first_name", first_name), ("last_name", last_name)) if query]
+        if hasattr(users, "search"):
+            if user_id:
+                rows = users.candidates({"user_id": user_id})
+            elif text_queries and all(isinstance(query, str) for _, query in text_queries):
+                column, query = text_queries[0]
+                rows = users.search(column, query, exact=column == "email",
+                                    guard=[column for column, _ in text_queries])
+        
+        for user in rows:
             if user_id and user.get("user_id") != user_id:
                 continue
             if email and user.get("email", "").lower() != email.lower():
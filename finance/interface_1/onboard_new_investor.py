@@ -8,6 +8,8 @@ class onboard_new_investor(Tool):
                investor_type: str, contact_email: str, accreditation_status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             if not table:
                 return "1"
             return str(max(int(k) for k in table.keys()) + 1)
@@ -15,7 +15,20 @@ class get_user(Tool):
                last_name: Optional[str] = None) -> str:
         users = data.get("users", {})
         
-        for user in users.values():
+        # Narrow the scan through the user_id index or the case-insensitive text
+        # indexes when available (only for string queries, so errors stay the same)
+        rows = users.values()
+        text_queries = [(column, query) for column, query in
+                        (("email", email), ("first_name", first_name), ("last_name", last_name)) if query]
+        if hasattr(users, "search"):
+            if user_id:
+                rows = users.candidates({"user_id": user_id})
+            elif text_queries and all(isinstance(query, str) for _, query in text_queries):
+                column, query = text_queries[0]
+                rows = users.search(column, query, exact=column == "email",
+                                    guard=[column for column, _ in text_queries])
+        
+        for user in rows:
             if user_id and user.get("user_id") != user_id:
                 continue
             if email and user.get("email", "").lower() != email.lower():
@@ -58,22 +71,38 @@ class get_investors(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], employee_id: Optional[str] = None,
                investor_type: Optional[str] = None, accreditation_status: Optional[str] = None,
-               name: Optional[str] = None) -> str:
+               name: Optional[str] = None, limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> str:
         investors = data.get("investors", {})
-        results = []
         
-        for investor in investors.values():
+        def matches(investor: Dict[str, Any]) -> bool:
             if employee_id and investor.get("employee_id") != employee_id:
-                continue
+                return False
             if investor_type and investor.get("investor_type") != investor_type:
-                continue
+                return False
             if accreditation_status and investor.get("accreditation_status") != accreditation_status:
-                continue
+                return False
             if name and name.lower() not in investor.get("name", "").lower():
-                continue
-            results.append(investor)
+                return False
+            return True
         
-        return json.dumps(results)
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            # Narrow the scan through the case-insensitive name index when available
+            rows = investors.values()
+            if hasattr(investors, "search") and name:
+                rows = investors.search("name", name)
+            return json.dumps([investor for investor in rows if matches(investor)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(investors, "search_items") and name:
+            items = investors.search_items("name", name)
+        query = {"employee_id": employee_id, "investor_type": investor_type,
+                 "accreditation_status": accreditation_status, "name": name}
+        return json.dumps(paginate(investors, matches, limit, cursor, query, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -88,7 +117,9 @@ class get_investors(Tool):
                         "employee_id": {"type": "string", "description": "Filter by employee ID"},
                         "investor_type": {"type": "string", "description": "Filter by investor type (organization, retail, high_net_worth)"},
                         "accreditation_status": {"type": "string", "description": "Filter by accreditation status (accredited, non_accredited)"},
-                        "name": {"type": "string", "description": "Filter by investor name (partial match)"}
+                        "name": {"type": "string", "description": "Filter by investor name (partial match)"},
+                        "limit": {"type": "integer", "description": "Maximum number of investors to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -105,24 +136,40 @@ class get_funds(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], fund_type: Optional[str] = None,
                base_currency: Optional[str] = None, manager_id: Optional[str] = None,
-               status: Optional[str] = None, name: Optional[str] = None) -> str:
+               status: Optional[str] = None, name: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
         funds = data.get("funds", {})
-        results = []
         
-        for fund in funds.values():
+        def matches(fund: Dict[str, Any]) -> bool:
             if fund_type and fund.get("fund_type") != fund_type:
-                continue
+                return False
             if base_currency and fund.get("base_currency") != base_currency:
-                continue
+                return False
             if manager_id and fund.get("manager_id") != manager_id:
-                continue
+                return False
             if status and fund.get("status") != status:
-                continue
+                return False
             if name and name.lower() not in fund.get("name", "").lower():
-                continue
-            results.append(fund)
+                return False
+            return True
         
-        return json.dumps(results)
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            # Narrow the scan through the case-insensitive name index when available
+            rows = funds.values()
+            if hasattr(funds, "search") and name:
+                rows = funds.search("name", name)
+            return json.dumps([fund for fund in rows if matches(fund)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(funds, "search_items") and name:
+            items = funds.search_items("name", name)
+        query = {"fund_type": fund_type, "base_currency": base_currency, "manager_id": manager_id,
+                 "status": status, "name": name}
+        return json.dumps(paginate(funds, matches, limit, cursor, query, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -138,7 +185,9 @@ class get_funds(Tool):
                         "base_currency": {"type": "string", "description": "Filter by base currency (USD, EUR, GBP, NGN)"},
                         "manager_id": {"type": "string", "description": "Filter by manager ID"},
                         "status": {"type": "string", "description": "Filter by status (open, closed)"},
-                        "name": {"type": "string", "description": "Filter by fund name (partial match)"}
+                        "name": {"type": "string", "description": "Filter by fund name (partial match)"},
+                        "limit": {"type": "integer", "description": "Maximum number of funds to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -155,8 +204,16 @@ class get_investor_portfolio(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], investor_id: str) -> str:
         portfolios = data.get("portfolios", {})
+        holdings_view = getattr(data, "holdings_view", None)
+        
+        # Narrow the scan through the holdings view or secondary indexes when available
+        rows = portfolios.values()
+        if holdings_view is not None:
+            rows = holdings_view.portfolios_of(investor_id)
+        elif hasattr(portfolios, "candidates"):
+            rows = portfolios.candidates({"investor_id": investor_id})
         
-        for portfolio in portfolios.values():
+        for portfolio in rows:
             if portfolio.get("investor_id") == investor_id:
                 return json.dumps(portfolio)
         
@@ -193,7 +250,12 @@ class get_subscriptions(Tool):
         subscriptions = data.get("subscriptions", {})
         results = []
         
-        for subscription in subscriptions.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = subscriptions.values()
+        if hasattr(subscriptions, "candidates"):
+            rows = subscriptions.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for subscription in rows:
             if fund_id and subscription.get("fund_id") != fund_id:
                 continue
             if investor_id and subscription.get("investor_id") != investor_id:
@@ -239,9 +301,17 @@ class get_investor_portfolio_holdings(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], portfolio_id: str) -> str:
         portfolio_holdings = data.get("portfolio_holdings", {})
+        holdings_view = getattr(data, "holdings_view", None)
         results = []
         
-        for holding in portfolio_holdings.values():
+        # Narrow the scan through the holdings view or secondary indexes when available
+        rows = portfolio_holdings.values()
+        if holdings_view is not None:
+            rows = holdings_view.holdings_of(portfolio_id)
+        elif hasattr(portfolio_holdings, "candidates"):
+            rows = portfolio_holdings.candidates({"portfolio_id": portfolio_id})
+        
+        for holding in rows:
             if holding.get("portfolio_id") == portfolio_id:
                 results.append(holding)
         
@@ -318,10 +388,16 @@ class get_portfolio_status_by_date(Tool):
     def invoke(data: Dict[str, Any], portfolio_id: str, date: str) -> str:
         portfolio_holdings = data.get("portfolio_holdings", {})
         instrument_prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         
         total_value = 0.0
         
-        for holding in portfolio_holdings.values():
+        # Narrow the scans through secondary indexes when the tables have them
+        rows = portfolio_holdings.values()
+        if hasattr(portfolio_holdings, "candidates"):
+            rows = portfolio_holdings.candidates({"portfolio_id": portfolio_id})
+        
+        for holding in rows:
             if holding.get("portfolio_id") != portfolio_id:
                 continue
             
@@ -330,7 +406,12 @@ class get_portfolio_status_by_date(Tool):
             
             # Find the price for the given date
             price = None
-            for price_record in instrument_prices.values():
+            price_rows = instrument_prices.values()
+            if price_series is not None:
+                price_rows = price_series.records_on(instrument_id, date)
+            elif hasattr(instrument_prices, "candidates"):
+                price_rows = instrument_prices.candidates({"instrument_id": instrument_id, "price_date": date})
+            for price_record in price_rows:
                 if (price_record.get("instrument_id") == instrument_id and 
                     price_record.get("price_date") == date):
                     price = float(price_record.get("close_price", 0))
@@ -371,9 +452,24 @@ class get_instruments_prices(Tool):
                price_date: Optional[str] = None, ticker: Optional[str] = None) -> str:
         instrument_prices = data.get("instrument_prices", {})
         instruments = data.get("instruments", {})
+        price_series = getattr(data, "price_series", None)
         results = []
         
-        for price in instrument_prices.values():
+        # Narrow the scans through secondary indexes when the tables have them
+        def instrument_rows(instrument_id: Any):
+            if hasattr(instruments, "candidates"):
+                return instruments.candidates({"instrument_id": instrument_id})
+            return instruments.values()
+        
+        rows = instrument_prices.values()
+        if price_series is not None and instrument_id and price_date:
+            rows = price_series.records_on(instrument_id, price_date)
+        elif price_series is not None and price_date:
+            rows = price_series.records_on_date(price_date)
+        elif hasattr(instrument_prices, "candidates"):
+            rows = instrument_prices.candidates({"instrument_id": instrument_id, "price_date": price_date})
+        
+        for price in rows:
             if instrument_id and price.get("instrument_id") != instrument_id:
                 continue
             if price_date and price.get("price_date") != price_date:
@@ -382,7 +478,7 @@ class get_instruments_prices(Tool):
             # If ticker filter is provided, need to check instrument data
             if ticker:
                 instrument = None
-                for inst in instruments.values():
+                for inst in instrument_rows(price.get("instrument_id")):
                     if inst.get("instrument_id") == price.get("instrument_id"):
                         instrument = inst
                         break
@@ -391,7 +487,7 @@ class get_instruments_prices(Tool):
             
             # Merge instrument data with price data
             instrument_with_price = dict(price)
-            for inst in instruments.values():
+            for inst in instrument_rows(price.get("instrument_id")):
                 if inst.get("instrument_id") == price.get("instrument_id"):
                     instrument_with_price.update(inst)
                     break
@@ -433,7 +529,12 @@ class get_commitments(Tool):
         commitments = data.get("commitments", {})
         results = []
         
-        for commitment in commitments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = commitments.values()
+        if hasattr(commitments, "candidates"):
+            rows = commitments.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for commitment in rows:
             if fund_id and commitment.get("fund_id") != fund_id:
                 continue
             if investor_id and commitment.get("investor_id") != investor_id:
@@ -479,6 +580,8 @@ class onboard_new_investor(Tool):
                investor_type: str, contact_email: str, accreditation_status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> str:
+            if hasattr(table, "next_id"):
+                return str(table.next_id())
             if not table:
                 return "1"
             return str(max(int(k) for k in table.keys()) + 1)
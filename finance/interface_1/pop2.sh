@@ -15,6 +15,8 @@ class CreateNewCommitment(Tool):
                commitment_amount: str, currency: str, commitment_date: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -86,6 +88,8 @@ class CreatePortfolio(Tool):
     def invoke(data: Dict[str, Any], investor_id: str, base_currency: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -149,6 +153,8 @@ class SubscribeInvestorToFund(Tool):
                request_date: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -229,6 +235,8 @@ class PurchaseInstrument(Tool):
                quantity: str, cost_basis: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -348,6 +356,9 @@ class UpdateInvestorDetails(Tool):
         investor["contact_email"] = contact_email
         investor["accreditation_status"] = accreditation_status
         
+        if hasattr(investors, "reindex"):
+            investors.reindex(str(investor_id))
+        
         return json.dumps(investor)
 
     @staticmethod
@@ -393,6 +404,9 @@ class UpdateInvestorPortfolioHolding(Tool):
         holding["quantity"] = quantity
         holding["cost_basis"] = cost_basis
         
+        if hasattr(portfolio_holdings, "reindex"):
+            portfolio_holdings.reindex(str(holding_id))
+        
         return json.dumps(holding)
 
     @staticmethod
@@ -449,6 +463,9 @@ class UpdateSubscription(Tool):
         if status == "approved":
             subscription["approval_date"] = timestamp.split("T")[0]  # Extract date part
         
+        if hasattr(subscriptions, "reindex"):
+            subscriptions.reindex(str(subscription_id))
+        
         return json.dumps(subscription)
 
     @staticmethod
@@ -483,6 +500,8 @@ class SendNotification(Tool):
                recipient_id: Optional[str] = None, email: Optional[str] = None) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
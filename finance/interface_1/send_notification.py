@@ -8,6 +8,8 @@ class SendNotification(Tool):
                recipient_id: Optional[str] = None, email: Optional[str] = None) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
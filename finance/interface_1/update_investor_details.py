@@ -24,6 +24,9 @@ class UpdateInvestorDetails(Tool):
         investor["contact_email"] = contact_email
         investor["accreditation_status"] = accreditation_status
         
+        if hasattr(investors, "reindex"):
+            investors.reindex(str(investor_id))
+        
         return json.dumps(investor)
 
     @staticmethod
@@ -18,6 +18,9 @@ class UpdateInvestorPortfolioHolding(Tool):
         holding["quantity"] = quantity
         holding["cost_basis"] = cost_basis
         
+        if hasattr(portfolio_holdings, "reindex"):
+            portfolio_holdings.reindex(str(holding_id))
+        
         return json.dumps(holding)
 
     @staticmethod
@@ -30,6 +30,9 @@ class UpdateSubscription(Tool):
         if status == "approved":
             subscription["approval_date"] = timestamp.split("T")[0]  # Extract date part
         
+        if hasattr(subscriptions, "reindex"):
+            subscriptions.reindex(str(subscription_id))
+        
         return json.dumps(subscription)
 
     @staticmethod
@@ -8,6 +8,8 @@ class AddNewTradeForFund(Tool):
                trade_date: str, quantity: float, price: float, side: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
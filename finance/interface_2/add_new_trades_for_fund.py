@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, List
+from tau_bench.envs.tool import Tool
+
+class AddNewTradesForFund(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], trades: List[Dict[str, Any]]) -> str:
+        
+        def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
+            if not table:
+                return 1
+            return max(int(k) for k in table.keys()) + 1
+        
+        trade_table = data.get("trades", {})
+        funds = data.get("funds", {})
+        instruments = data.get("instruments", {})
+        
+        required_fields = ["fund_id", "instrument_id", "trade_date", "quantity", "price", "side"]
+        valid_sides = ["buy", "sell"]
+        
+        # Validate every record against the referenced tables in one pass
+        accepted = []
+        errors = []
+        for index, trade in enumerate(trades):
+            if not isinstance(trade, dict):
+                errors.append({"index": index, "error": "Trade record must be an object"})
+                continue
+            missing = [field for field in required_fields if field not in trade]
+            unexpected = [field for field in trade if field not in required_fields]
+            if missing:
+                errors.append({"index": index, "error": f"Missing required fields: {missing}"})
+            elif unexpected:
+                errors.append({"index": index, "error": f"Unexpected fields: {unexpected}"})
+            elif str(trade["fund_id"]) not in funds:
+                errors.append({"index": index, "error": f"Fund with ID {trade['fund_id']} not found"})
+            elif str(trade["instrument_id"]) not in instruments:
+                errors.append({"index": index, "error": f"Instrument with ID {trade['instrument_id']} not found"})
+            elif trade["side"] not in valid_sides:
+                errors.append({"index": index, "error": f"Invalid side. Must be one of {valid_sides}"})
+            else:
+                accepted.append((index, trade))
+        
+        # Allocate the IDs of all accepted records in one block; sequential
+        # calls would hand out the same consecutive IDs
+        created = []
+        if accepted:
+            try:
+                next_id = generate_id(trade_table)
+            except ValueError as e:
+                errors.extend({"index": index, "error": str(e)} for index, _ in accepted)
+                accepted = []
+            timestamp = "2025-10-01T00:00:00"
+            for offset, (index, trade) in enumerate(accepted):
+                trade_id = next_id + offset
+                new_trade = {
+                    "trade_id": str(trade_id),
+                    "fund_id": str(trade["fund_id"]),
+                    "instrument_id": str(trade["instrument_id"]),
+                    "trade_date": trade["trade_date"],
+                    "quantity": trade["quantity"],
+                    "price": trade["price"],
+                    "side": trade["side"],
+                    "status": "executed",
+                    "created_at": timestamp
+                }
+                trade_table[str(trade_id)] = new_trade
+                created.append(new_trade)
+        
+        errors.sort(key=lambda error: error["index"])
+        return json.dumps({"created": created, "errors": errors})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "add_new_trades_for_fund",
+                "description": "Add several new trades for funds in one call; invalid records are reported per index and skipped",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "trades": {
+                            "type": "array",
+                            "description": "Trades to add",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "fund_id": {"type": "string", "description": "Fund ID"},
+                                    "instrument_id": {"type": "string", "description": "Instrument ID"},
+                                    "trade_date": {"type": "string", "description": "Trade date in ISO format"},
+                                    "quantity": {"type": "number", "description": "Trade quantity"},
+                                    "price": {"type": "number", "description": "Trade price"},
+                                    "side": {"type": "string", "description": "Trade side (buy, sell)"}
+                                },
+                                "required": ["fund_id", "instrument_id", "trade_date", "quantity", "price", "side"]
+                            }
+                        }
+                    },
+                    "required": ["trades"]
+                }
+            }
+        }
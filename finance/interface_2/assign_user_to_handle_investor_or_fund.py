@@ -22,6 +22,9 @@ class AssignUserToHandleInvestorOrFund(Tool):
             
             # Update investor's employee_id
             investors[str(investor_id)]["employee_id"] = str(user_id)
+            if hasattr(investors, "reindex"):
+                investors.reindex(str(investor_id))
+            
             return json.dumps(investors[str(investor_id)])
         
         elif fund_id:
@@ -32,6 +35,9 @@ class AssignUserToHandleInvestorOrFund(Tool):
             # Update fund's manager_id
             funds[str(fund_id)]["manager_id"] = str(user_id)
             funds[str(fund_id)]["updated_at"] = "2025-10-01T00:00:00"
+            if hasattr(funds, "reindex"):
+                funds.reindex(str(fund_id))
+            
             return json.dumps(funds[str(fund_id)])
         
         else:
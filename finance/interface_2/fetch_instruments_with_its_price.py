@@ -11,6 +11,7 @@ class FetchInstrumentsWithItsPrice(Tool):
                low_price: Optional[float] = None) -> str:
         instruments = data.get("instruments", {})
         prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         results = []
         
         for instrument in instruments.values():
@@ -21,9 +22,14 @@ class FetchInstrumentsWithItsPrice(Tool):
             if instrument_type and instrument.get("instrument_type") != instrument_type:
                 continue
             
-            # Get prices for this instrument
+            # Get prices for this instrument, narrowed through secondary indexes when available
             instrument_prices = []
-            for price in prices.values():
+            price_rows = prices.values()
+            if price_series is not None and date:
+                price_rows = price_series.records_on(instrument.get("instrument_id"), date)
+            elif hasattr(prices, "candidates"):
+                price_rows = prices.candidates({"instrument_id": instrument.get("instrument_id"), "price_date": date})
+            for price in price_rows:
                 if price.get("instrument_id") != instrument.get("instrument_id"):
                     continue
                 if date and price.get("price_date") != date:
@@ -9,6 +9,7 @@ class FetchInvestorsWithPortfolioHoldings(Tool):
         portfolios = data.get("portfolios", {})
         holdings = data.get("portfolio_holdings", {})
         instruments = data.get("instruments", {})
+        holdings_view = getattr(data, "holdings_view", None)
         results = []
         
         for investor in investors.values():
@@ -22,26 +23,40 @@ class FetchInvestorsWithPortfolioHoldings(Tool):
             if skip_investor:
                 continue
             
-            # Get investor's portfolios
+            if holdings_view is not None:
+                # Portfolios and holdings of the investor are maintained by the holdings view
+                portfolio_pairs = holdings_view.investor_holdings(investor.get("investor_id"))
+            else:
+                # Get investor's portfolios, narrowed through secondary indexes when available
+                portfolio_pairs = []
+                portfolio_rows = portfolios.values()
+                if hasattr(portfolios, "candidates"):
+                    portfolio_rows = portfolios.candidates({"investor_id": investor.get("investor_id")})
+                for portfolio in portfolio_rows:
+                    if portfolio.get("investor_id") == investor.get("investor_id"):
+                        # Get holdings for this portfolio
+                        holding_rows = holdings.values()
+                        if hasattr(holdings, "candidates"):
+                            holding_rows = holdings.candidates({"portfolio_id": portfolio.get("portfolio_id")})
+                        portfolio_pairs.append((portfolio, [holding for holding in holding_rows
+                                                            if holding.get("portfolio_id") == portfolio.get("portfolio_id")]))
+            
             investor_portfolios = []
-            for portfolio in portfolios.values():
-                if portfolio.get("investor_id") == investor.get("investor_id"):
-                    # Get holdings for this portfolio
-                    portfolio_holdings = []
-                    for holding in holdings.values():
-                        if holding.get("portfolio_id") == portfolio.get("portfolio_id"):
-                            # Enrich holding with instrument info
-                            instrument_id = holding.get("instrument_id")
-                            if instrument_id and str(instrument_id) in instruments:
-                                holding_with_instrument = holding.copy()
-                                holding_with_instrument["instrument"] = instruments[str(instrument_id)]
-                                portfolio_holdings.append(holding_with_instrument)
-                            else:
-                                portfolio_holdings.append(holding)
-                    
-                    portfolio_with_holdings = portfolio.copy()
-                    portfolio_with_holdings["holdings"] = portfolio_holdings
-                    investor_portfolios.append(portfolio_with_holdings)
+            for portfolio, holding_rows in portfolio_pairs:
+                portfolio_holdings = []
+                for holding in holding_rows:
+                    # Enrich holding with instrument info
+                    instrument_id = holding.get("instrument_id")
+                    if instrument_id and str(instrument_id) in instruments:
+                        holding_with_instrument = holding.copy()
+                        holding_with_instrument["instrument"] = instruments[str(instrument_id)]
+                        portfolio_holdings.append(holding_with_instrument)
+                    else:
+                        portfolio_holdings.append(holding)
+                
+                portfolio_with_holdings = portfolio.copy()
+                portfolio_with_holdings["holdings"] = portfolio_holdings
+                investor_portfolios.append(portfolio_with_holdings)
             
             investor_with_portfolios = investor.copy()
             investor_with_portfolios["portfolios"] = investor_portfolios
@@ -7,7 +7,12 @@ class FetchUserByMail(Tool):
     def invoke(data: Dict[str, Any], email: str) -> str:
         users = data.get("users", {})
         
-        for user in users.values():
+        # Narrow the scan through the case-insensitive email index when available
+        rows = users.values()
+        if hasattr(users, "search"):
+            rows = users.search("email", email, exact=True)
+        
+        for user in rows:
             if user.get("email", "").lower() == email.lower():
                 return json.dumps(user)
         
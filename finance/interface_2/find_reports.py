@@ -8,7 +8,13 @@ class FindReports(Tool):
         reports = data.get("reports", {})
         results = []
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        # (rows lacking a filtered key still match, so they are kept as candidates)
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates(filters, include_missing=True)
+        
+        for report in rows:
             # Apply filters
             skip_report = False
             for key, value in filters.items():
@@ -7,26 +7,39 @@ class GetDailyProfitLossByFund(Tool):
     def invoke(data: Dict[str, Any], fund_id: str, date: str) -> str:
         nav_records = data.get("nav_records", {})
         trades = data.get("trades", {})
+        nav_series = getattr(data, "nav_series", None)
         
         # Find NAV records for the fund on the specified date and previous date
         current_nav = None
         previous_nav = None
         
-        fund_navs = []
-        for nav in nav_records.values():
-            if nav.get("fund_id") == fund_id:
-                fund_navs.append(nav)
-        
-        # Sort by date
-        fund_navs.sort(key=lambda x: x.get("nav_date", ""))
-        
-        # Find current and previous NAV
-        for i, nav in enumerate(fund_navs):
-            if nav.get("nav_date") == date:
-                current_nav = nav.get("nav_value", 0)
-                if i > 0:
-                    previous_nav = fund_navs[i-1].get("nav_value", 0)
-                break
+        if nav_series is not None and isinstance(fund_id, str):
+            # The fund's date-sorted series answers both lookups with a bisect
+            current, previous = nav_series.current_and_previous(fund_id, date)
+            if current is not None:
+                current_nav = current.get("nav_value", 0)
+            if previous is not None:
+                previous_nav = previous.get("nav_value", 0)
+        else:
+            fund_navs = []
+            # Narrow the scan through secondary indexes when the table has them
+            rows = nav_records.values()
+            if hasattr(nav_records, "candidates"):
+                rows = nav_records.candidates({"fund_id": fund_id})
+            for nav in rows:
+                if nav.get("fund_id") == fund_id:
+                    fund_navs.append(nav)
+            
+            # Sort by date
+            fund_navs.sort(key=lambda x: x.get("nav_date", ""))
+            
+            # Find current and previous NAV
+            for i, nav in enumerate(fund_navs):
+                if nav.get("nav_date") == date:
+                    current_nav = nav.get("nav_value", 0)
+                    if i > 0:
+                        previous_nav = fund_navs[i-1].get("nav_value", 0)
+                    break
         
         if current_nav is None:
             raise ValueError(f"No NAV record found for fund {fund_id} on date {date}")
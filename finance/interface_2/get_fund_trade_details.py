@@ -11,7 +11,12 @@ class GetFundTradeDetails(Tool):
         trades = data.get("trades", {})
         results = []
         
-        for trade in trades.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = trades.values()
+        if hasattr(trades, "candidates"):
+            rows = trades.candidates({"fund_id": fund_id, "instrument_id": instrument_id})
+        
+        for trade in rows:
             if trade.get("fund_id") != fund_id:
                 continue
             if instrument_id and trade.get("instrument_id") != instrument_id:
@@ -7,12 +7,21 @@ class GetFundValuation(Tool):
     def invoke(data: Dict[str, Any], fund_id: str, date: str) -> str:
         nav_records = data.get("nav_records", {})
         funds = data.get("funds", {})
+        nav_series = getattr(data, "nav_series", None)
         
         # Find NAV record for the fund on the specified date
         nav_value = None
         nav_details = None
         
-        for nav in nav_records.values():
+        # Narrow the scans through secondary indexes when the tables have them
+        rows = nav_records.values()
+        if nav_series is not None and isinstance(fund_id, str) and isinstance(date, str):
+            nav = nav_series.nav_on(fund_id, date)
+            rows = [nav] if nav is not None else []
+        elif hasattr(nav_records, "candidates"):
+            rows = nav_records.candidates({"fund_id": fund_id, "nav_date": date})
+        
+        for nav in rows:
             if nav.get("fund_id") == fund_id and nav.get("nav_date") == date:
                 nav_value = nav.get("nav_value")
                 nav_details = nav
@@ -23,7 +32,10 @@ class GetFundValuation(Tool):
         
         # Get fund details
         fund_details = None
-        for fund in funds.values():
+        fund_rows = funds.values()
+        if hasattr(funds, "candidates"):
+            fund_rows = funds.candidates({"fund_id": fund_id})
+        for fund in fund_rows:
             if fund.get("fund_id") == fund_id:
                 fund_details = fund
                 break
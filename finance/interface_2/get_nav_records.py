@@ -8,7 +8,13 @@ class GetNAVRecords(Tool):
         nav_records = data.get("nav_records", {})
         results = []
         
-        for nav in nav_records.values():
+        # Narrow the scan through secondary indexes when the table has them
+        # (rows lacking a filtered key still match, so they are kept as candidates)
+        rows = nav_records.values()
+        if hasattr(nav_records, "candidates"):
+            rows = nav_records.candidates(filters, include_missing=True)
+        
+        for nav in rows:
             # Apply filters
             skip_record = False
             for key, value in filters.items():
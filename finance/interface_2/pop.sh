@@ -15,7 +15,12 @@ class FetchUserByMail(Tool):
     def invoke(data: Dict[str, Any], email: str) -> str:
         users = data.get("users", {})
         
-        for user in users.values():
+        # Narrow the scan through the case-insensitive email index when available
+        rows = users.values()
+        if hasattr(users, "search"):
+            rows = users.search("email", email, exact=True)
+        
+        for user in rows:
             if user.get("email", "").lower() == email.lower():
                 return json.dumps(user)
         
@@ -106,6 +111,7 @@ class FetchInvestorsWithPortfolioHoldings(Tool):
         portfolios = data.get("portfolios", {})
         holdings = data.get("portfolio_holdings", {})
         instruments = data.get("instruments", {})
+        holdings_view = getattr(data, "holdings_view", None)
         results = []
         
         for investor in investors.values():
@@ -119,26 +125,40 @@ class FetchInvestorsWithPortfolioHoldings(Tool):
             if skip_investor:
                 continue
             
-            # Get investor's portfolios
+            if holdings_view is not None:
+                # Portfolios and holdings of the investor are maintained by the holdings view
+                portfolio_pairs = holdings_view.investor_holdings(investor.get("investor_id"))
+            else:
+                # Get investor's portfolios, narrowed through secondary indexes when available
+                portfolio_pairs = []
+                portfolio_rows = portfolios.values()
+                if hasattr(portfolios, "candidates"):
+                    portfolio_rows = portfolios.candidates({"investor_id": investor.get("investor_id")})
+                for portfolio in portfolio_rows:
+                    if portfolio.get("investor_id") == investor.get("investor_id"):
+                        # Get holdings for this portfolio
+                        holding_rows = holdings.values()
+                        if hasattr(holdings, "candidates"):
+                            holding_rows = holdings.candidates({"portfolio_id": portfolio.get("portfolio_id")})
+                        portfolio_pairs.append((portfolio, [holding for holding in holding_rows
+                                                            if holding.get("portfolio_id") == portfolio.get("portfolio_id")]))
+            
             investor_portfolios = []
-            for portfolio in portfolios.values():
-                if portfolio.get("investor_id") == investor.get("investor_id"):
-                    # Get holdings for this portfolio
-                    portfolio_holdings = []
-                    for holding in holdings.values():
-                        if holding.get("portfolio_id") == portfolio.get("portfolio_id"):
-                            # Enrich holding with instrument info
-                            instrument_id = holding.get("instrument_id")
-                            if instrument_id and str(instrument_id) in instruments:
-                                holding_with_instrument = holding.copy()
-                                holding_with_instrument["instrument"] = instruments[str(instrument_id)]
-                                portfolio_holdings.append(holding_with_instrument)
-                            else:
-                                portfolio_holdings.append(holding)
-                    
-                    portfolio_with_holdings = portfolio.copy()
-                    portfolio_with_holdings["holdings"] = portfolio_holdings
-                    investor_portfolios.append(portfolio_with_holdings)
+            for portfolio, holding_rows in portfolio_pairs:
+                portfolio_holdings = []
+                for holding in holding_rows:
+                    # Enrich holding with instrument info
+                    instrument_id = holding.get("instrument_id")
+                    if instrument_id and str(instrument_id) in instruments:
+                        holding_with_instrument = holding.copy()
+                        holding_with_instrument["instrument"] = instruments[str(instrument_id)]
+                        portfolio_holdings.append(holding_with_instrument)
+                    else:
+                        portfolio_holdings.append(holding)
+                
+                portfolio_with_holdings = portfolio.copy()
+                portfolio_with_holdings["holdings"] = portfolio_holdings
+                investor_portfolios.append(portfolio_with_holdings)
             
             investor_with_portfolios = investor.copy()
             investor_with_portfolios["portfolios"] = investor_portfolios
@@ -179,6 +199,7 @@ class FetchInstrumentsWithItsPrice(Tool):
                low_price: Optional[float] = None) -> str:
         instruments = data.get("instruments", {})
         prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         results = []
         
         for instrument in instruments.values():
@@ -189,9 +210,14 @@ class FetchInstrumentsWithItsPrice(Tool):
             if instrument_type and instrument.get("instrument_type") != instrument_type:
                 continue
             
-            # Get prices for this instrument
+            # Get prices for this instrument, narrowed through secondary indexes when available
             instrument_prices = []
-            for price in prices.values():
+            price_rows = prices.values()
+            if price_series is not None and date:
+                price_rows = price_series.records_on(instrument.get("instrument_id"), date)
+            elif hasattr(prices, "candidates"):
+                price_rows = prices.candidates({"instrument_id": instrument.get("instrument_id"), "price_date": date})
+            for price in price_rows:
                 if price.get("instrument_id") != instrument.get("instrument_id"):
                     continue
                 if date and price.get("price_date") != date:
@@ -255,7 +281,12 @@ class GetFundTradeDetails(Tool):
         trades = data.get("trades", {})
         results = []
         
-        for trade in trades.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = trades.values()
+        if hasattr(trades, "candidates"):
+            rows = trades.candidates({"fund_id": fund_id, "instrument_id": instrument_id})
+        
+        for trade in rows:
             if trade.get("fund_id") != fund_id:
                 continue
             if instrument_id and trade.get("instrument_id") != instrument_id:
@@ -314,7 +345,13 @@ class GetNAVRecords(Tool):
         nav_records = data.get("nav_records", {})
         results = []
         
-        for nav in nav_records.values():
+        # Narrow the scan through secondary indexes when the table has them
+        # (rows lacking a filtered key still match, so they are kept as candidates)
+        rows = nav_records.values()
+        if hasattr(nav_records, "candidates"):
+            rows = nav_records.candidates(filters, include_missing=True)
+        
+        for nav in rows:
             # Apply filters
             skip_record = False
             for key, value in filters.items():
@@ -356,26 +393,39 @@ class GetDailyProfitLossByFund(Tool):
     def invoke(data: Dict[str, Any], fund_id: str, date: str) -> str:
         nav_records = data.get("nav_records", {})
         trades = data.get("trades", {})
+        nav_series = getattr(data, "nav_series", None)
         
         # Find NAV records for the fund on the specified date and previous date
         current_nav = None
         previous_nav = None
         
-        fund_navs = []
-        for nav in nav_records.values():
-            if nav.get("fund_id") == fund_id:
-                fund_navs.append(nav)
-        
-        # Sort by date
-        fund_navs.sort(key=lambda x: x.get("nav_date", ""))
-        
-        # Find current and previous NAV
-        for i, nav in enumerate(fund_navs):
-            if nav.get("nav_date") == date:
-                current_nav = nav.get("nav_value", 0)
-                if i > 0:
-                    previous_nav = fund_navs[i-1].get("nav_value", 0)
-                break
+        if nav_series is not None and isinstance(fund_id, str):
+            # The fund's date-sorted series answers both lookups with a bisect
+            current, previous = nav_series.current_and_previous(fund_id, date)
+            if current is not None:
+                current_nav = current.get("nav_value", 0)
+            if previous is not None:
+                previous_nav = previous.get("nav_value", 0)
+        else:
+            fund_navs = []
+            # Narrow the scan through secondary indexes when the table has them
+            rows = nav_records.values()
+            if hasattr(nav_records, "candidates"):
+                rows = nav_records.candidates({"fund_id": fund_id})
+            for nav in rows:
+                if nav.get("fund_id") == fund_id:
+                    fund_navs.append(nav)
+            
+            # Sort by date
+            fund_navs.sort(key=lambda x: x.get("nav_date", ""))
+            
+            # Find current and previous NAV
+            for i, nav in enumerate(fund_navs):
+                if nav.get("nav_date") == date:
+                    current_nav = nav.get("nav_value", 0)
+                    if i > 0:
+                        previous_nav = fund_navs[i-1].get("nav_value", 0)
+                    break
         
         if current_nav is None:
             raise ValueError(f"No NAV record found for fund {fund_id} on date {date}")
@@ -418,12 +468,21 @@ class GetFundValuation(Tool):
     def invoke(data: Dict[str, Any], fund_id: str, date: str) -> str:
         nav_records = data.get("nav_records", {})
         funds = data.get("funds", {})
+        nav_series = getattr(data, "nav_series", None)
         
         # Find NAV record for the fund on the specified date
         nav_value = None
         nav_details = None
         
-        for nav in nav_records.values():
+        # Narrow the scans through secondary indexes when the tables have them
+        rows = nav_records.values()
+        if nav_series is not None and isinstance(fund_id, str) and isinstance(date, str):
+            nav = nav_series.nav_on(fund_id, date)
+            rows = [nav] if nav is not None else []
+        elif hasattr(nav_records, "candidates"):
+            rows = nav_records.candidates({"fund_id": fund_id, "nav_date": date})
+        
+        for nav in rows:
             if nav.get("fund_id") == fund_id and nav.get("nav_date") == date:
                 nav_value = nav.get("nav_value")
                 nav_details = nav
@@ -434,7 +493,10 @@ class GetFundValuation(Tool):
         
         # Get fund details
         fund_details = None
-        for fund in funds.values():
+        fund_rows = funds.values()
+        if hasattr(funds, "candidates"):
+            fund_rows = funds.candidates({"fund_id": fund_id})
+        for fund in fund_rows:
             if fund.get("fund_id") == fund_id:
                 fund_details = fund
                 break
@@ -478,18 +540,34 @@ from tau_bench.envs.tool import Tool
 class RetrieveSubscriptions(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], investor_id: Optional[str] = None, 
-               fund_id: Optional[str] = None) -> str:
+               fund_id: Optional[str] = None, limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> str:
         subscriptions = data.get("subscriptions", {})
-        results = []
         
-        for subscription in subscriptions.values():
+        def matches(subscription: Dict[str, Any]) -> bool:
             if investor_id and subscription.get("investor_id") != investor_id:
-                continue
+                return False
             if fund_id and subscription.get("fund_id") != fund_id:
-                continue
-            results.append(subscription)
-        
-        return json.dumps(results)
+                return False
+            return True
+        
+        # Narrow the scan through secondary indexes when the table has them
+        criteria = {"investor_id": investor_id, "fund_id": fund_id}
+        
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            rows = subscriptions.values()
+            if hasattr(subscriptions, "candidates"):
+                rows = subscriptions.candidates(criteria)
+            return json.dumps([subscription for subscription in rows if matches(subscription)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(subscriptions, "candidate_items"):
+            items = subscriptions.candidate_items(criteria)
+        return json.dumps(paginate(subscriptions, matches, limit, cursor, criteria, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -502,7 +580,9 @@ class RetrieveSubscriptions(Tool):
                     "type": "object",
                     "properties": {
                         "investor_id": {"type": "string", "description": "Investor ID"},
-                        "fund_id": {"type": "string", "description": "Fund ID"}
+                        "fund_id": {"type": "string", "description": "Fund ID"},
+                        "limit": {"type": "integer", "description": "Maximum number of subscriptions to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -522,7 +602,13 @@ class FindReports(Tool):
         reports = data.get("reports", {})
         results = []
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        # (rows lacking a filtered key still match, so they are kept as candidates)
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates(filters, include_missing=True)
+        
+        for report in rows:
             # Apply filters
             skip_report = False
             for key, value in filters.items():
@@ -565,6 +651,8 @@ class AddNewUser(Tool):
                role: str, timezone: str, status: str = "active") -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -639,6 +727,8 @@ class CreateNewFund(Tool):
                manager_id: str, size: float, status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -718,6 +808,8 @@ class AddNewTradeForFund(Tool):
                trade_date: str, quantity: float, price: float, side: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -806,6 +898,9 @@ class AssignUserToHandleInvestorOrFund(Tool):
             
             # Update investor's employee_id
             investors[str(investor_id)]["employee_id"] = str(user_id)
+            if hasattr(investors, "reindex"):
+                investors.reindex(str(investor_id))
+            
             return json.dumps(investors[str(investor_id)])
         
         elif fund_id:
@@ -816,6 +911,9 @@ class AssignUserToHandleInvestorOrFund(Tool):
             # Update fund's manager_id
             funds[str(fund_id)]["manager_id"] = str(user_id)
             funds[str(fund_id)]["updated_at"] = "2025-10-01T00:00:00"
+            if hasattr(funds, "reindex"):
+                funds.reindex(str(fund_id))
+            
             return json.dumps(funds[str(fund_id)])
         
         else:
@@ -853,6 +951,8 @@ class CreateNAVRecord(Tool):
                nav_value: float, currency: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -930,6 +1030,9 @@ class UpdateNAVRecords(Tool):
         nav_records[str(nav_id)]["currency"] = currency
         nav_records[str(nav_id)]["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(nav_records, "reindex"):
+            nav_records.reindex(str(nav_id))
+        
         return json.dumps(nav_records[str(nav_id)])
 
     @staticmethod
@@ -991,6 +1094,9 @@ class UpdateFundDetails(Tool):
         funds[str(fund_id)]["status"] = status
         funds[str(fund_id)]["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(funds, "reindex"):
+            funds.reindex(str(fund_id))
+        
         return json.dumps(funds[str(fund_id)])
 
     @staticmethod
@@ -1029,6 +1135,8 @@ class UpdateInstrumentPrice(Tool):
                close_price: float) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -1040,9 +1148,12 @@ class UpdateInstrumentPrice(Tool):
         if str(instrument_id) not in instruments:
             raise ValueError(f"Instrument with ID {instrument_id} not found")
         
-        # Check if price record exists for this instrument and date
+        # Check if price record exists for this instrument and date (indexed when available)
         existing_price_id = None
-        for price_id, price in instrument_prices.items():
+        price_items = instrument_prices.items()
+        if hasattr(instrument_prices, "candidate_items"):
+            price_items = instrument_prices.candidate_items({"instrument_id": str(instrument_id), "price_date": price_date})
+        for price_id, price in price_items:
             if (price.get("instrument_id") == str(instrument_id) and 
                 price.get("price_date") == price_date):
                 existing_price_id = price_id
@@ -1054,6 +1165,9 @@ class UpdateInstrumentPrice(Tool):
             instrument_prices[existing_price_id]["high_price"] = high_price
             instrument_prices[existing_price_id]["low_price"] = low_price
             instrument_prices[existing_price_id]["close_price"] = close_price
+            if hasattr(instrument_prices, "reindex"):
+                instrument_prices.reindex(existing_price_id)
+            
             return json.dumps(instrument_prices[existing_price_id])
         else:
             # Create new price record
@@ -1119,6 +1233,9 @@ class UpdateTradeForFund(Tool):
         trades[str(trade_id)]["price"] = price
         trades[str(trade_id)]["status"] = status
         
+        if hasattr(trades, "reindex"):
+            trades.reindex(str(trade_id))
+        
         return json.dumps(trades[str(trade_id)])
 
     @staticmethod
@@ -1154,6 +1271,8 @@ class NotifyUser(Tool):
                type: str, reference_id: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -1208,7 +1327,115 @@ class NotifyUser(Tool):
         }
 EOF
 
-echo "All 20 database tools have been created successfully!"
+# Tool 21: AddNewTradesForFund
+cat > add_new_trades_for_fund.py << 'EOF'
+import json
+from typing import Any, Dict, List
+from tau_bench.envs.tool import Tool
+
+class AddNewTradesForFund(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], trades: List[Dict[str, Any]]) -> str:
+        
+        def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
+            if not table:
+                return 1
+            return max(int(k) for k in table.keys()) + 1
+        
+        trade_table = data.get("trades", {})
+        funds = data.get("funds", {})
+        instruments = data.get("instruments", {})
+        
+        required_fields = ["fund_id", "instrument_id", "trade_date", "quantity", "price", "side"]
+        valid_sides = ["buy", "sell"]
+        
+        # Validate every record against the referenced tables in one pass
+        accepted = []
+        errors = []
+        for index, trade in enumerate(trades):
+            if not isinstance(trade, dict):
+                errors.append({"index": index, "error": "Trade record must be an object"})
+                continue
+            missing = [field for field in required_fields if field not in trade]
+            unexpected = [field for field in trade if field not in required_fields]
+            if missing:
+                errors.append({"index": index, "error": f"Missing required fields: {missing}"})
+            elif unexpected:
+                errors.append({"index": index, "error": f"Unexpected fields: {unexpected}"})
+            elif str(trade["fund_id"]) not in funds:
+                errors.append({"index": index, "error": f"Fund with ID {trade['fund_id']} not found"})
+            elif str(trade["instrument_id"]) not in instruments:
+                errors.append({"index": index, "error": f"Instrument with ID {trade['instrument_id']} not found"})
+            elif trade["side"] not in valid_sides:
+                errors.append({"index": index, "error": f"Invalid side. Must be one of {valid_sides}"})
+            else:
+                accepted.append((index, trade))
+        
+        # Allocate the IDs of all accepted records in one block; sequential
+        # calls would hand out the same consecutive IDs
+        created = []
+        if accepted:
+            try:
+                next_id = generate_id(trade_table)
+            except ValueError as e:
+                errors.extend({"index": index, "error": str(e)} for index, _ in accepted)
+                accepted = []
+            timestamp = "2025-10-01T00:00:00"
+            for offset, (index, trade) in enumerate(accepted):
+                trade_id = next_id + offset
+                new_trade = {
+                    "trade_id": str(trade_id),
+                    "fund_id": str(trade["fund_id"]),
+                    "instrument_id": str(trade["instrument_id"]),
+                    "trade_date": trade["trade_date"],
+                    "quantity": trade["quantity"],
+                    "price": trade["price"],
+                    "side": trade["side"],
+                    "status": "executed",
+                    "created_at": timestamp
+                }
+                trade_table[str(trade_id)] = new_trade
+                created.append(new_trade)
+        
+        errors.sort(key=lambda error: error["index"])
+        return json.dumps({"created": created, "errors": errors})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "add_new_trades_for_fund",
+                "description": "Add several new trades for funds in one call; invalid records are reported per index and skipped",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "trades": {
+                            "type": "array",
+                            "description": "Trades to add",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "fund_id": {"type": "string", "description": "Fund ID"},
+                                    "instrument_id": {"type": "string", "description": "Instrument ID"},
+                                    "trade_date": {"type": "string", "description": "Trade date in ISO format"},
+                                    "quantity": {"type": "number", "description": "Trade quantity"},
+                                    "price": {"type": "number", "description": "Trade price"},
+                                    "side": {"type": "string", "description": "Trade side (buy, sell)"}
+                                },
+                                "required": ["fund_id", "instrument_id", "trade_date", "quantity", "price", "side"]
+                            }
+                        }
+                    },
+                    "required": ["trades"]
+                }
+            }
+        }
+EOF
+
+echo "All 21 database tools have been created successfully!"
 echo "Files created:"
 echo "1. fetch_user_by_mail.py"
 echo "2. retrieve_funds_with_filter.py"
@@ -1229,4 +1456,5 @@ echo "16. update_nav_records.py"
 echo "17. update_fund_details.py"
 echo "18. update_instrument_price.py"
 echo "19. update_trade_for_fund.py"
-echo "20. notify_user.py"
\ No newline at end of file
+echo "20. notify_user.py"
+echo "21. add_new_trades_for_fund.py"
\ No newline at end of file
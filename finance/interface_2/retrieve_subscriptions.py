@@ -5,18 +5,34 @@ from tau_bench.envs.tool import Tool
 class RetrieveSubscriptions(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], investor_id: Optional[str] = None, 
-               fund_id: Optional[str] = None) -> str:
+               fund_id: Optional[str] = None, limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> str:
         subscriptions = data.get("subscriptions", {})
-        results = []
         
-        for subscription in subscriptions.values():
+        def matches(subscription: Dict[str, Any]) -> bool:
             if investor_id and subscription.get("investor_id") != investor_id:
-                continue
+                return False
             if fund_id and subscription.get("fund_id") != fund_id:
-                continue
-            results.append(subscription)
+                return False
+            return True
         
-        return json.dumps(results)
+        # Narrow the scan through secondary indexes when the table has them
+        criteria = {"investor_id": investor_id, "fund_id": fund_id}
+        
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            rows = subscriptions.values()
+            if hasattr(subscriptions, "candidates"):
+                rows = subscriptions.candidates(criteria)
+            return json.dumps([subscription for subscription in rows if matches(subscription)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(subscriptions, "candidate_items"):
+            items = subscriptions.candidate_items(criteria)
+        return json.dumps(paginate(subscriptions, matches, limit, cursor, criteria, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -29,7 +45,9 @@ class RetrieveSubscriptions(Tool):
                     "type": "object",
                     "properties": {
                         "investor_id": {"type": "string", "description": "Investor ID"},
-                        "fund_id": {"type": "string", "description": "Fund ID"}
+                        "fund_id": {"type": "string", "description": "Fund ID"},
+                        "limit": {"type": "integer", "description": "Maximum number of subscriptions to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -35,6 +35,9 @@ class UpdateFundDetails(Tool):
         funds[str(fund_id)]["status"] = status
         funds[str(fund_id)]["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(funds, "reindex"):
+            funds.reindex(str(fund_id))
+        
         return json.dumps(funds[str(fund_id)])
 
     @staticmethod
@@ -9,6 +9,8 @@ class UpdateInstrumentPrice(Tool):
                close_price: float) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -20,9 +22,12 @@ class UpdateInstrumentPrice(Tool):
         if str(instrument_id) not in instruments:
             raise ValueError(f"Instrument with ID {instrument_id} not found")
         
-        # Check if price record exists for this instrument and date
+        # Check if price record exists for this instrument and date (indexed when available)
         existing_price_id = None
-        for price_id, price in instrument_prices.items():
+        price_items = instrument_prices.items()
+        if hasattr(instrument_prices, "candidate_items"):
+            price_items = instrument_prices.candidate_items({"instrument_id": str(instrument_id), "price_date": price_date})
+        for price_id, price in price_items:
             if (price.get("instrument_id") == str(instrument_id) and 
                 price.get("price_date") == price_date):
                 existing_price_id = price_id
@@ -34,6 +39,9 @@ class UpdateInstrumentPrice(Tool):
             instrument_prices[existing_price_id]["high_price"] = high_price
             instrument_prices[existing_price_id]["low_price"] = low_price
             instrument_prices[existing_price_id]["close_price"] = close_price
+            if hasattr(instrument_prices, "reindex"):
+                instrument_prices.reindex(existing_price_id)
+            
             return json.dumps(instrument_prices[existing_price_id])
         else:
             # Create new price record
@@ -21,6 +21,9 @@ class UpdateNAVRecords(Tool):
         nav_records[str(nav_id)]["currency"] = currency
         nav_records[str(nav_id)]["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(nav_records, "reindex"):
+            nav_records.reindex(str(nav_id))
+        
         return json.dumps(nav_records[str(nav_id)])
 
     @staticmethod
@@ -22,6 +22,9 @@ class UpdateTradeForFund(Tool):
         trades[str(trade_id)]["price"] = price
         trades[str(trade_id)]["status"] = status
         
+        if hasattr(trades, "reindex"):
+            trades.reindex(str(trade_id))
+        
         return json.dumps(trades[str(trade_id)])
 
     @staticmethod
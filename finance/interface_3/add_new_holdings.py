@@ -0,0 +1,96 @@
+import json
+from typing import Any, Dict, List
+from tau_bench.envs.tool import Tool
+
+class AddNewHoldings(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], holdings: List[Dict[str, Any]]) -> str:
+        
+        def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
+            if not table:
+                return 1
+            return max(int(k) for k in table.keys()) + 1
+        
+        portfolios = data.get("portfolios", {})
+        instruments = data.get("instruments", {})
+        holding_table = data.get("portfolio_holdings", {})
+        
+        required_fields = ["portfolio_id", "instrument_id", "quantity", "cost_basis"]
+        
+        # Validate every record against the referenced tables in one pass
+        accepted = []
+        errors = []
+        for index, holding in enumerate(holdings):
+            if not isinstance(holding, dict):
+                errors.append({"index": index, "error": "Holding record must be an object"})
+                continue
+            missing = [field for field in required_fields if field not in holding]
+            unexpected = [field for field in holding if field not in required_fields]
+            if missing:
+                errors.append({"index": index, "error": f"Missing required fields: {missing}"})
+            elif unexpected:
+                errors.append({"index": index, "error": f"Unexpected fields: {unexpected}"})
+            elif str(holding["portfolio_id"]) not in portfolios:
+                errors.append({"index": index, "error": f"Portfolio {holding['portfolio_id']} not found"})
+            elif str(holding["instrument_id"]) not in instruments:
+                errors.append({"index": index, "error": f"Instrument {holding['instrument_id']} not found"})
+            else:
+                accepted.append((index, holding))
+        
+        # Allocate the IDs of all accepted records in one block; sequential
+        # calls would hand out the same consecutive IDs
+        created = []
+        if accepted:
+            try:
+                next_id = generate_id(holding_table)
+            except ValueError as e:
+                errors.extend({"index": index, "error": str(e)} for index, _ in accepted)
+                accepted = []
+            timestamp = "2025-10-01T00:00:00"
+            for offset, (index, holding) in enumerate(accepted):
+                holding_id = next_id + offset
+                new_holding = {
+                    "holding_id": holding_id,
+                    "portfolio_id": holding["portfolio_id"],
+                    "instrument_id": holding["instrument_id"],
+                    "quantity": holding["quantity"],
+                    "cost_basis": holding["cost_basis"],
+                    "created_at": timestamp
+                }
+                holding_table[str(holding_id)] = new_holding
+                created.append(new_holding)
+        
+        errors.sort(key=lambda error: error["index"])
+        return json.dumps({"created": created, "errors": errors})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "add_new_holdings",
+                "description": "Add several new holdings to portfolios in one call; invalid records are reported per index and skipped",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "holdings": {
+                            "type": "array",
+                            "description": "Holdings to add",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "portfolio_id": {"type": "string", "description": "ID of the portfolio"},
+                                    "instrument_id": {"type": "string", "description": "ID of the instrument"},
+                                    "quantity": {"type": "string", "description": "Quantity of the holding"},
+                                    "cost_basis": {"type": "string", "description": "Cost basis of the holding"}
+                                },
+                                "required": ["portfolio_id", "instrument_id", "quantity", "cost_basis"]
+                            }
+                        }
+                    },
+                    "required": ["holdings"]
+                }
+            }
+        }
@@ -8,12 +8,15 @@ class AddNewInstrumentPrice(Tool):
                open_price: float, high_price: float, low_price: float, close_price: float) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
         
         instruments = data.get("instruments", {})
         prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         
         # Validate instrument exists
         if str(instrument_id) not in instruments:
@@ -25,8 +28,13 @@ class AddNewInstrumentPrice(Tool):
         if low_price > min(open_price, close_price, high_price):
             raise ValueError("Low price must be <= open, close, and high prices")
         
-        # Check if price already exists for this instrument and date
-        for price in prices.values():
+        # Check if price already exists for this instrument and date (indexed when available)
+        price_rows = prices.values()
+        if price_series is not None:
+            price_rows = price_series.records_on(instrument_id, price_date)
+        elif hasattr(prices, "candidates"):
+            price_rows = prices.candidates({"instrument_id": instrument_id, "price_date": price_date})
+        for price in price_rows:
             if (str(price.get("instrument_id")) == str(instrument_id) and 
                 price.get("price_date") == price_date):
                 raise ValueError(f"Price already exists for instrument {instrument_id} on {price_date}")
@@ -8,7 +8,12 @@ class FetchInvoices(Tool):
         invoices = data.get("invoices", {})
         results = []
         
-        for invoice in invoices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = invoices.values()
+        if hasattr(invoices, "candidates"):
+            rows = invoices.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for invoice in rows:
             # Apply filters
             if fund_id and str(invoice.get("fund_id")) != str(fund_id):
                 continue
@@ -11,7 +11,20 @@ class FindUser(Tool):
         if filters is None:
             filters = {}
         
-        for user in users.values():
+        # Narrow the scan through the user_id index or the case-insensitive text
+        # indexes when available (only for string queries, so errors stay the same)
+        rows = users.values()
+        if hasattr(users, "search") and isinstance(filters, dict):
+            text_queries = [(column, filters[column]) for column in ("email", "first_name", "last_name")
+                            if filters.get(column)]
+            if filters.get("user_id"):
+                rows = users.candidates({"user_id": filters["user_id"]})
+            elif text_queries and all(isinstance(query, str) for _, query in text_queries):
+                column, query = text_queries[0]
+                rows = users.search(column, query, exact=column == "email",
+                                    guard=[column for column, _ in text_queries])
+        
+        for user in rows:
             # Apply filters
             if filters.get("user_id") and str(user.get("user_id")) != str(filters["user_id"]):
                 continue
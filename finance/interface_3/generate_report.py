@@ -8,6 +8,8 @@ class GenerateReport(Tool):
                report_type: str, generated_by: str, export_period_end: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
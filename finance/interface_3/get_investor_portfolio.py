@@ -12,8 +12,11 @@ class GetInvestorPortfolio(Tool):
         if str(investor_id) not in investors:
             raise ValueError(f"Investor {investor_id} not found")
         
-        # Find portfolio for the investor
-        for portfolio in portfolios.values():
+        # Find portfolio for the investor, narrowed through secondary indexes when available
+        rows = portfolios.values()
+        if hasattr(portfolios, "candidates"):
+            rows = portfolios.candidates({"investor_id": investor_id})
+        for portfolio in rows:
             if str(portfolio.get("investor_id")) == str(investor_id):
                 return json.dumps(portfolio)
         
@@ -13,7 +13,11 @@ class GetPortfolioHoldings(Tool):
             raise ValueError(f"Portfolio {portfolio_id} not found")
         
         results = []
-        for holding in holdings.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = holdings.values()
+        if hasattr(holdings, "candidates"):
+            rows = holdings.candidates({"portfolio_id": portfolio_id})
+        for holding in rows:
             if str(holding.get("portfolio_id")) == str(portfolio_id):
                 results.append(holding)
         
@@ -21,7 +21,20 @@ class FindUser(Tool):
         if filters is None:
             filters = {}
         
-        for user in users.values():
+        # Narrow the scan through the user_id index or the case-insensitive text
+        # indexes when available (only for string queries, so errors stay the same)
+        rows = users.values()
+        if hasattr(users, "search") and isinstance(filters, dict):
+            text_queries = [(column, filters[column]) for column in ("email", "first_name", "last_name")
+                            if filters.get(column)]
+            if filters.get("user_id"):
+                rows = users.candidates({"user_id": filters["user_id"]})
+            elif text_queries and all(isinstance(query, str) for _, query in text_queries):
+                column, query = text_queries[0]
+                rows = users.search(column, query, exact=column == "email",
+                                    guard=[column for column, _ in text_queries])
+        
+        for user in rows:
             # Apply filters
             if filters.get("user_id") and str(user.get("user_id")) != str(filters["user_id"]):
                 continue
@@ -148,8 +161,11 @@ class GetInvestorPortfolio(Tool):
         if str(investor_id) not in investors:
             raise ValueError(f"Investor {investor_id} not found")
         
-        # Find portfolio for the investor
-        for portfolio in portfolios.values():
+        # Find portfolio for the investor, narrowed through secondary indexes when available
+        rows = portfolios.values()
+        if hasattr(portfolios, "candidates"):
+            rows = portfolios.candidates({"investor_id": investor_id})
+        for portfolio in rows:
             if str(portfolio.get("investor_id")) == str(investor_id):
                 return json.dumps(portfolio)
         
@@ -191,7 +207,11 @@ class GetPortfolioHoldings(Tool):
             raise ValueError(f"Portfolio {portfolio_id} not found")
         
         results = []
-        for holding in holdings.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = holdings.values()
+        if hasattr(holdings, "candidates"):
+            rows = holdings.candidates({"portfolio_id": portfolio_id})
+        for holding in rows:
             if str(holding.get("portfolio_id")) == str(portfolio_id):
                 results.append(holding)
         
@@ -290,7 +310,11 @@ class RetrieveInstrumentPrices(Tool):
             raise ValueError(f"Instrument {instrument_id} not found")
         
         results = []
-        for price in prices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = prices.values()
+        if hasattr(prices, "candidates"):
+            rows = prices.candidates({"instrument_id": instrument_id})
+        for price in rows:
             if str(price.get("instrument_id")) != str(instrument_id):
                 continue
                 
@@ -339,6 +363,7 @@ class SummaryOfInstrumentTypesByPrices(Tool):
     def invoke(data: Dict[str, Any], date: str) -> str:
         instruments = data.get("instruments", {})
         prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         
         # Group instruments by type
         instrument_types = {}
@@ -348,9 +373,14 @@ class SummaryOfInstrumentTypesByPrices(Tool):
                 instrument_types[inst_type] = []
             instrument_types[inst_type].append(instrument.get("instrument_id"))
         
-        # Find prices for the specific date
+        # Find prices for the specific date, narrowed through secondary indexes when available
         date_prices = {}
-        for price in prices.values():
+        rows = prices.values()
+        if price_series is not None:
+            rows = price_series.records_on_date(date)
+        elif hasattr(prices, "candidates"):
+            rows = prices.candidates({"price_date": date})
+        for price in rows:
             if price.get("price_date") == date:
                 date_prices[str(price.get("instrument_id"))] = price
         
@@ -412,7 +442,12 @@ class RetrieveReports(Tool):
         reports = data.get("reports", {})
         results = []
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for report in rows:
             # Apply filters
             if fund_id and str(report.get("fund_id")) != str(fund_id):
                 continue
@@ -513,7 +548,12 @@ class FetchInvoices(Tool):
         invoices = data.get("invoices", {})
         results = []
         
-        for invoice in invoices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = invoices.values()
+        if hasattr(invoices, "candidates"):
+            rows = invoices.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for invoice in rows:
             # Apply filters
             if fund_id and str(invoice.get("fund_id")) != str(fund_id):
                 continue
@@ -561,6 +601,8 @@ class AddNewInstrument(Tool):
     def invoke(data: Dict[str, Any], ticker: str, name: str, instrument_type: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -621,12 +663,15 @@ class AddNewInstrumentPrice(Tool):
                open_price: float, high_price: float, low_price: float, close_price: float) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
         
         instruments = data.get("instruments", {})
         prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         
         # Validate instrument exists
         if str(instrument_id) not in instruments:
@@ -638,8 +683,13 @@ class AddNewInstrumentPrice(Tool):
         if low_price > min(open_price, close_price, high_price):
             raise ValueError("Low price must be <= open, close, and high prices")
         
-        # Check if price already exists for this instrument and date
-        for price in prices.values():
+        # Check if price already exists for this instrument and date (indexed when available)
+        price_rows = prices.values()
+        if price_series is not None:
+            price_rows = price_series.records_on(instrument_id, price_date)
+        elif hasattr(prices, "candidates"):
+            price_rows = prices.candidates({"instrument_id": instrument_id, "price_date": price_date})
+        for price in price_rows:
             if (str(price.get("instrument_id")) == str(instrument_id) and 
                 price.get("price_date") == price_date):
                 raise ValueError(f"Price already exists for instrument {instrument_id} on {price_date}")
@@ -694,6 +744,8 @@ class GenerateReport(Tool):
                report_type: str, generated_by: str, export_period_end: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -777,6 +829,8 @@ class AddNewHolding(Tool):
                quantity: str, cost_basis: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -881,6 +935,8 @@ class AddPayment(Tool):
                amount: str, payment_method: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -967,6 +1023,9 @@ class UpdateInstrument(Tool):
         if instrument_type is not None:
             instrument["instrument_type"] = instrument_type
         
+        if hasattr(instruments, "reindex"):
+            instruments.reindex(str(instrument_id))
+        
         return json.dumps(instrument)
 
     @staticmethod
@@ -1020,6 +1079,9 @@ class UpdateInstrumentPrice(Tool):
         if close_price is not None:
             price_record["close_price"] = close_price
         
+        if hasattr(prices, "reindex"):
+            prices.reindex(str(price_id))
+        
         return json.dumps(price_record)
 
     @staticmethod
@@ -1069,6 +1131,9 @@ class UpdateReport(Tool):
         report["status"] = status
         report["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(reports, "reindex"):
+            reports.reindex(str(report_id))
+        
         return json.dumps(report)
 
     @staticmethod
@@ -1102,6 +1167,8 @@ class EmailUser(Tool):
     def invoke(data: Dict[str, Any], user_id: str, class_: str, reference_id: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -1159,6 +1226,106 @@ class EmailUser(Tool):
         }
 EOF
 
+# Create AddNewHoldings tool
+cat > db_tools/add_new_holdings.py << 'EOF'
+import json
+from typing import Any, Dict, List
+from tau_bench.envs.tool import Tool
+
+class AddNewHoldings(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], holdings: List[Dict[str, Any]]) -> str:
+        
+        def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
+            if not table:
+                return 1
+            return max(int(k) for k in table.keys()) + 1
+        
+        portfolios = data.get("portfolios", {})
+        instruments = data.get("instruments", {})
+        holding_table = data.get("portfolio_holdings", {})
+        
+        required_fields = ["portfolio_id", "instrument_id", "quantity", "cost_basis"]
+        
+        # Validate every record against the referenced tables in one pass
+        accepted = []
+        errors = []
+        for index, holding in enumerate(holdings):
+            if not isinstance(holding, dict):
+                errors.append({"index": index, "error": "Holding record must be an object"})
+                continue
+            missing = [field for field in required_fields if field not in holding]
+            unexpected = [field for field in holding if field not in required_fields]
+            if missing:
+                errors.append({"index": index, "error": f"Missing required fields: {missing}"})
+            elif unexpected:
+                errors.append({"index": index, "error": f"Unexpected fields: {unexpected}"})
+            elif str(holding["portfolio_id"]) not in portfolios:
+                errors.append({"index": index, "error": f"Portfolio {holding['portfolio_id']} not found"})
+            elif str(holding["instrument_id"]) not in instruments:
+                errors.append({"index": index, "error": f"Instrument {holding['instrument_id']} not found"})
+            else:
+                accepted.append((index, holding))
+        
+        # Allocate the IDs of all accepted records in one block; sequential
+        # calls would hand out the same consecutive IDs
+        created = []
+        if accepted:
+            try:
+                next_id = generate_id(holding_table)
+            except ValueError as e:
+                errors.extend({"index": index, "error": str(e)} for index, _ in accepted)
+                accepted = []
+            timestamp = "2025-10-01T00:00:00"
+            for offset, (index, holding) in enumerate(accepted):
+                holding_id = next_id + offset
+                new_holding = {
+                    "holding_id": holding_id,
+                    "portfolio_id": holding["portfolio_id"],
+                    "instrument_id": holding["instrument_id"],
+                    "quantity": holding["quantity"],
+                    "cost_basis": holding["cost_basis"],
+                    "created_at": timestamp
+                }
+                holding_table[str(holding_id)] = new_holding
+                created.append(new_holding)
+        
+        errors.sort(key=lambda error: error["index"])
+        return json.dumps({"created": created, "errors": errors})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "add_new_holdings",
+                "description": "Add several new holdings to portfolios in one call; invalid records are reported per index and skipped",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "holdings": {
+                            "type": "array",
+                            "description": "Holdings to add",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "portfolio_id": {"type": "string", "description": "ID of the portfolio"},
+                                    "instrument_id": {"type": "string", "description": "ID of the instrument"},
+                                    "quantity": {"type": "string", "description": "Quantity of the holding"},
+                                    "cost_basis": {"type": "string", "description": "Cost basis of the holding"}
+                                },
+                                "required": ["portfolio_id", "instrument_id", "quantity", "cost_basis"]
+                            }
+                        }
+                    },
+                    "required": ["holdings"]
+                }
+            }
+        }
+EOF
+
 echo "All database tools have been created successfully!"
 echo "Files created:"
 echo "- db_tools/add_new_holding.py"
@@ -1167,4 +1334,5 @@ echo "- db_tools/add_payment.py"
 echo "- db_tools/update_instrument.py"
 echo "- db_tools/update_instrument_price.py"
 echo "- db_tools/update_report.py"
-echo "- db_tools/email_user.py"
\ No newline at end of file
+echo "- db_tools/email_user.py"
+echo "- db_tools/add_new_holdings.py"
\ No newline at end of file
@@ -14,7 +14,11 @@ class RetrieveInstrumentPrices(Tool):
             raise ValueError(f"Instrument {instrument_id} not found")
         
         results = []
-        for price in prices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = prices.values()
+        if hasattr(prices, "candidates"):
+            rows = prices.candidates({"instrument_id": instrument_id})
+        for price in rows:
             if str(price.get("instrument_id")) != str(instrument_id):
                 continue
                 
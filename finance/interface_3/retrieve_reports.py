@@ -8,7 +8,12 @@ class RetrieveReports(Tool):
         reports = data.get("reports", {})
         results = []
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for report in rows:
             # Apply filters
             if fund_id and str(report.get("fund_id")) != str(fund_id):
                 continue
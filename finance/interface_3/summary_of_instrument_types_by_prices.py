@@ -7,6 +7,7 @@ class SummaryOfInstrumentTypesByPrices(Tool):
     def invoke(data: Dict[str, Any], date: str) -> str:
         instruments = data.get("instruments", {})
         prices = data.get("instrument_prices", {})
+        price_series = getattr(data, "price_series", None)
         
         # Group instruments by type
         instrument_types = {}
@@ -16,9 +17,14 @@ class SummaryOfInstrumentTypesByPrices(Tool):
                 instrument_types[inst_type] = []
             instrument_types[inst_type].append(instrument.get("instrument_id"))
         
-        # Find prices for the specific date
+        # Find prices for the specific date, narrowed through secondary indexes when available
         date_prices = {}
-        for price in prices.values():
+        rows = prices.values()
+        if price_series is not None:
+            rows = price_series.records_on_date(date)
+        elif hasattr(prices, "candidates"):
+            rows = prices.candidates({"price_date": date})
+        for price in rows:
             if price.get("price_date") == date:
                 date_prices[str(price.get("instrument_id"))] = price
         
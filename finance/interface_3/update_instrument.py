@@ -29,6 +29,9 @@ class UpdateInstrument(Tool):
         if instrument_type is not None:
             instrument["instrument_type"] = instrument_type
         
+        if hasattr(instruments, "reindex"):
+            instruments.reindex(str(instrument_id))
+        
         return json.dumps(instrument)
 
     @staticmethod
@@ -26,6 +26,9 @@ class UpdateInstrumentPrice(Tool):
         if close_price is not None:
             price_record["close_price"] = close_price
         
+        if hasattr(prices, "reindex"):
+            prices.reindex(str(price_id))
+        
         return json.dumps(price_record)
 
     @staticmethod
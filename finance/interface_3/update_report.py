@@ -21,6 +21,9 @@ class UpdateReport(Tool):
         report["status"] = status
         report["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(reports, "reindex"):
+            reports.reindex(str(report_id))
+        
         return json.dumps(report)
 
     @staticmethod
@@ -8,6 +8,8 @@ class CreateCommitment(Tool):
                commitment_amount: str, currency: str, commitment_date: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -9,6 +9,7 @@ class GetCommitmentFulfillmentPercentage(Tool):
         commitments = data.get("commitments", {})
         invoices = data.get("invoices", {})
         payments = data.get("payments", {})
+        rollup = getattr(data, "commitment_rollup", None)
         
         if str(commitment_id) not in commitments:
             raise ValueError(f"Commitment {commitment_id} not found")
@@ -19,20 +20,30 @@ class GetCommitmentFulfillmentPercentage(Tool):
         if commitment_amount == 0:
             return json.dumps({"fulfilled_percent": "0.00"})
         
-        # Find all invoices for this commitment
-        commitment_invoices = []
-        for invoice in invoices.values():
-            if invoice.get("commitment_id") == commitment_id:
-                commitment_invoices.append(invoice)
-        
-        # Calculate total paid amount
-        total_paid = Decimal("0")
-        for invoice in commitment_invoices:
-            invoice_id = invoice.get("invoice_id")
-            for payment in payments.values():
-                if (payment.get("invoice_id") == invoice_id and 
-                    payment.get("status") == "completed"):
-                    total_paid += Decimal(str(payment.get("amount", 0)))
+        if rollup is not None and isinstance(commitment_id, str):
+            # Completed-payment totals are maintained per invoice and commitment
+            total_paid = rollup.total_paid(commitment_id)
+        else:
+            # Find all invoices for this commitment (scans narrowed through secondary indexes when available)
+            commitment_invoices = []
+            invoice_rows = invoices.values()
+            if hasattr(invoices, "candidates"):
+                invoice_rows = invoices.candidates({"commitment_id": commitment_id})
+            for invoice in invoice_rows:
+                if invoice.get("commitment_id") == commitment_id:
+                    commitment_invoices.append(invoice)
+            
+            # Calculate total paid amount
+            total_paid = Decimal("0")
+            for invoice in commitment_invoices:
+                invoice_id = invoice.get("invoice_id")
+                payment_rows = payments.values()
+                if hasattr(payments, "candidates"):
+                    payment_rows = payments.candidates({"invoice_id": invoice_id, "status": "completed"})
+                for payment in payment_rows:
+                    if (payment.get("invoice_id") == invoice_id and 
+                        payment.get("status") == "completed"):
+                        total_paid += Decimal(str(payment.get("amount", 0)))
         
         # Calculate percentage
         if commitment_amount > 0:
@@ -11,7 +11,16 @@ class GetCommitments(Tool):
         if not filters:
             filters = {}
         
-        for commitment in commitments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = commitments.values()
+        if hasattr(commitments, "candidates"):
+            rows = commitments.candidates({
+                "commitment_id": filters.get("commitment_id"),
+                "fund_id": filters.get("fund_id"),
+                "investor_id": filters.get("investor_id"),
+            })
+        
+        for commitment in rows:
             # Apply filters
             if filters.get("commitment_id") and commitment.get("commitment_id") != filters["commitment_id"]:
                 continue
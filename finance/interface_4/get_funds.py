@@ -4,31 +4,46 @@ from tau_bench.envs.tool import Tool
 
 class GetFunds(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], filters: Optional[Dict[str, Any]] = None) -> str:
+    def invoke(data: Dict[str, Any], filters: Optional[Dict[str, Any]] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
         funds = data.get("funds", {})
-        results = []
         
         if not filters:
             filters = {}
         
-        for fund in funds.values():
+        def matches(fund: Dict[str, Any]) -> bool:
             # Apply filters
             if filters.get("fund_id") and fund.get("fund_id") != filters["fund_id"]:
-                continue
+                return False
             if filters.get("name") and filters["name"].lower() not in fund.get("name", "").lower():
-                continue
+                return False
             if filters.get("fund_type") and fund.get("fund_type") != filters["fund_type"]:
-                continue
+                return False
             if filters.get("base_currency") and fund.get("base_currency") != filters["base_currency"]:
-                continue
+                return False
             if filters.get("manager_id") and fund.get("manager_id") != filters["manager_id"]:
-                continue
+                return False
             if filters.get("status") and fund.get("status") != filters["status"]:
-                continue
-            
-            results.append(fund)
+                return False
+            return True
         
-        return json.dumps(results)
+        # Narrow the scan through the case-insensitive name index when available
+        searchable = isinstance(filters, dict) and filters.get("name")
+        
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            rows = funds.values()
+            if hasattr(funds, "search") and searchable:
+                rows = funds.search("name", filters["name"])
+            return json.dumps([fund for fund in rows if matches(fund)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(funds, "search_items") and searchable:
+            items = funds.search_items("name", filters["name"])
+        return json.dumps(paginate(funds, matches, limit, cursor, {"filters": filters}, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -43,7 +58,9 @@ class GetFunds(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Filters to apply (fund_id, name, fund_type, base_currency, manager_id, status)"
-                        }
+                        },
+                        "limit": {"type": "integer", "description": "Maximum number of funds to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
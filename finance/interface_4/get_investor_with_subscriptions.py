@@ -20,9 +20,12 @@ class GetInvestorWithSubscriptions(Tool):
             if employee_id and investor.get("employee_id") != employee_id:
                 continue
             
-            # Get investor's subscriptions
+            # Get investor's subscriptions, narrowed through secondary indexes when available
             investor_subscriptions = []
-            for subscription in subscriptions.values():
+            subscription_rows = subscriptions.values()
+            if hasattr(subscriptions, "candidates"):
+                subscription_rows = subscriptions.candidates({"investor_id": investor.get("investor_id")})
+            for subscription in subscription_rows:
                 if subscription.get("investor_id") == investor.get("investor_id"):
                     if subscription_id and subscription.get("subscription_id") != subscription_id:
                         continue
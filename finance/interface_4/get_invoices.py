@@ -11,7 +11,17 @@ class GetInvoices(Tool):
         if not filters:
             filters = {}
         
-        for invoice in invoices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = invoices.values()
+        if hasattr(invoices, "candidates"):
+            rows = invoices.candidates({
+                "invoice_id": filters.get("invoice_id"),
+                "fund_id": filters.get("fund_id"),
+                "investor_id": filters.get("investor_id"),
+                "commitment_id": filters.get("commitment_id"),
+            })
+        
+        for invoice in rows:
             # Apply filters
             if filters.get("invoice_id") and invoice.get("invoice_id") != filters["invoice_id"]:
                 continue
@@ -9,7 +9,12 @@ class GetPayments(Tool):
         payments = data.get("payments", {})
         results = []
         
-        for payment in payments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = payments.values()
+        if hasattr(payments, "candidates"):
+            rows = payments.candidates({"invoice_id": invoice_id})
+        
+        for payment in rows:
             if invoice_id and payment.get("invoice_id") != invoice_id:
                 continue
             if status and payment.get("status") != status:
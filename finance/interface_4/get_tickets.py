@@ -9,7 +9,12 @@ class GetTickets(Tool):
         tickets = data.get("tickets", {})
         results = []
         
-        for ticket in tickets.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = tickets.values()
+        if hasattr(tickets, "candidates"):
+            rows = tickets.candidates({"invoice_id": invoice_id})
+        
+        for ticket in rows:
             if invoice_id and ticket.get("invoice_id") != invoice_id:
                 continue
             if status and ticket.get("status") != status:
@@ -11,7 +11,18 @@ class IdentifyUser(Tool):
         if not email and not user_id:
             raise ValueError("Either email or user_id must be provided")
         
-        for user in users.values():
+        # Narrow the scan to users matching the email (case-insensitive) or the
+        # user_id through indexes when available, keeping table order
+        rows = users.values()
+        if hasattr(users, "search_items") and (not email or isinstance(email, str)):
+            items = []
+            if email:
+                items.extend(users.search_items("email", email, exact=True))
+            if user_id:
+                items.extend(users.candidate_items({"user_id": user_id}))
+            rows = dict(sorted(items, key=lambda item: users.position(item[0]))).values()
+        
+        for user in rows:
             if email and user.get("email", "").lower() == email.lower():
                 return json.dumps(user)
             if user_id and user.get("user_id") == user_id:
@@ -18,7 +18,18 @@ class IdentifyUser(Tool):
         if not email and not user_id:
             raise ValueError("Either email or user_id must be provided")
         
-        for user in users.values():
+        # Narrow the scan to users matching the email (case-insensitive) or the
+        # user_id through indexes when available, keeping table order
+        rows = users.values()
+        if hasattr(users, "search_items") and (not email or isinstance(email, str)):
+            items = []
+            if email:
+                items.extend(users.search_items("email", email, exact=True))
+            if user_id:
+                items.extend(users.candidate_items({"user_id": user_id}))
+            rows = dict(sorted(items, key=lambda item: users.position(item[0]))).values()
+        
+        for user in rows:
             if email and user.get("email", "").lower() == email.lower():
                 return json.dumps(user)
             if user_id and user.get("user_id") == user_id:
@@ -69,9 +80,12 @@ class GetInvestorWithSubscriptions(Tool):
             if employee_id and investor.get("employee_id") != employee_id:
                 continue
             
-            # Get investor's subscriptions
+            # Get investor's subscriptions, narrowed through secondary indexes when available
             investor_subscriptions = []
-            for subscription in subscriptions.values():
+            subscription_rows = subscriptions.values()
+            if hasattr(subscriptions, "candidates"):
+                subscription_rows = subscriptions.candidates({"investor_id": investor.get("investor_id")})
+            for subscription in subscription_rows:
                 if subscription.get("investor_id") == investor.get("investor_id"):
                     if subscription_id and subscription.get("subscription_id") != subscription_id:
                         continue
@@ -116,31 +130,46 @@ from tau_bench.envs.tool import Tool
 
 class GetFunds(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], filters: Optional[Dict[str, Any]] = None) -> str:
+    def invoke(data: Dict[str, Any], filters: Optional[Dict[str, Any]] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
         funds = data.get("funds", {})
-        results = []
         
         if not filters:
             filters = {}
         
-        for fund in funds.values():
+        def matches(fund: Dict[str, Any]) -> bool:
             # Apply filters
             if filters.get("fund_id") and fund.get("fund_id") != filters["fund_id"]:
-                continue
+                return False
             if filters.get("name") and filters["name"].lower() not in fund.get("name", "").lower():
-                continue
+                return False
             if filters.get("fund_type") and fund.get("fund_type") != filters["fund_type"]:
-                continue
+                return False
             if filters.get("base_currency") and fund.get("base_currency") != filters["base_currency"]:
-                continue
+                return False
             if filters.get("manager_id") and fund.get("manager_id") != filters["manager_id"]:
-                continue
+                return False
             if filters.get("status") and fund.get("status") != filters["status"]:
-                continue
-            
-            results.append(fund)
-        
-        return json.dumps(results)
+                return False
+            return True
+        
+        # Narrow the scan through the case-insensitive name index when available
+        searchable = isinstance(filters, dict) and filters.get("name")
+        
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            rows = funds.values()
+            if hasattr(funds, "search") and searchable:
+                rows = funds.search("name", filters["name"])
+            return json.dumps([fund for fund in rows if matches(fund)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(funds, "search_items") and searchable:
+            items = funds.search_items("name", filters["name"])
+        return json.dumps(paginate(funds, matches, limit, cursor, {"filters": filters}, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -155,7 +184,9 @@ class GetFunds(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Filters to apply (fund_id, name, fund_type, base_currency, manager_id, status)"
-                        }
+                        },
+                        "limit": {"type": "integer", "description": "Maximum number of funds to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -178,7 +209,16 @@ class GetCommitments(Tool):
         if not filters:
             filters = {}
         
-        for commitment in commitments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = commitments.values()
+        if hasattr(commitments, "candidates"):
+            rows = commitments.candidates({
+                "commitment_id": filters.get("commitment_id"),
+                "fund_id": filters.get("fund_id"),
+                "investor_id": filters.get("investor_id"),
+            })
+        
+        for commitment in rows:
             # Apply filters
             if filters.get("commitment_id") and commitment.get("commitment_id") != filters["commitment_id"]:
                 continue
@@ -233,7 +273,17 @@ class GetInvoices(Tool):
         if not filters:
             filters = {}
         
-        for invoice in invoices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = invoices.values()
+        if hasattr(invoices, "candidates"):
+            rows = invoices.candidates({
+                "invoice_id": filters.get("invoice_id"),
+                "fund_id": filters.get("fund_id"),
+                "investor_id": filters.get("investor_id"),
+                "commitment_id": filters.get("commitment_id"),
+            })
+        
+        for invoice in rows:
             # Apply filters
             if filters.get("invoice_id") and invoice.get("invoice_id") != filters["invoice_id"]:
                 continue
@@ -288,7 +338,12 @@ class GetPayments(Tool):
         payments = data.get("payments", {})
         results = []
         
-        for payment in payments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = payments.values()
+        if hasattr(payments, "candidates"):
+            rows = payments.candidates({"invoice_id": invoice_id})
+        
+        for payment in rows:
             if invoice_id and payment.get("invoice_id") != invoice_id:
                 continue
             if status and payment.get("status") != status:
@@ -367,7 +422,12 @@ class GetTickets(Tool):
         tickets = data.get("tickets", {})
         results = []
         
-        for ticket in tickets.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = tickets.values()
+        if hasattr(tickets, "candidates"):
+            rows = tickets.candidates({"invoice_id": invoice_id})
+        
+        for ticket in rows:
             if invoice_id and ticket.get("invoice_id") != invoice_id:
                 continue
             if status and ticket.get("status") != status:
@@ -411,7 +471,16 @@ class RetrieveReports(Tool):
         if not filters:
             filters = {}
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates({
+                "report_id": filters.get("report_id"),
+                "fund_id": filters.get("fund_id"),
+                "investor_id": filters.get("investor_id"),
+            })
+        
+        for report in rows:
             # Apply filters
             if filters.get("report_id") and report.get("report_id") != filters["report_id"]:
                 continue
@@ -464,6 +533,7 @@ class GetCommitmentFulfillmentPercentage(Tool):
         commitments = data.get("commitments", {})
         invoices = data.get("invoices", {})
         payments = data.get("payments", {})
+        rollup = getattr(data, "commitment_rollup", None)
         
         if str(commitment_id) not in commitments:
             raise ValueError(f"Commitment {commitment_id} not found")
@@ -474,20 +544,30 @@ class GetCommitmentFulfillmentPercentage(Tool):
         if commitment_amount == 0:
             return json.dumps({"fulfilled_percent": "0.00"})
         
-        # Find all invoices for this commitment
-        commitment_invoices = []
-        for invoice in invoices.values():
-            if invoice.get("commitment_id") == commitment_id:
-                commitment_invoices.append(invoice)
-        
-        # Calculate total paid amount
-        total_paid = Decimal("0")
-        for invoice in commitment_invoices:
-            invoice_id = invoice.get("invoice_id")
-            for payment in payments.values():
-                if (payment.get("invoice_id") == invoice_id and 
-                    payment.get("status") == "completed"):
-                    total_paid += Decimal(str(payment.get("amount", 0)))
+        if rollup is not None and isinstance(commitment_id, str):
+            # Completed-payment totals are maintained per invoice and commitment
+            total_paid = rollup.total_paid(commitment_id)
+        else:
+            # Find all invoices for this commitment (scans narrowed through secondary indexes when available)
+            commitment_invoices = []
+            invoice_rows = invoices.values()
+            if hasattr(invoices, "candidates"):
+                invoice_rows = invoices.candidates({"commitment_id": commitment_id})
+            for invoice in invoice_rows:
+                if invoice.get("commitment_id") == commitment_id:
+                    commitment_invoices.append(invoice)
+            
+            # Calculate total paid amount
+            total_paid = Decimal("0")
+            for invoice in commitment_invoices:
+                invoice_id = invoice.get("invoice_id")
+                payment_rows = payments.values()
+                if hasattr(payments, "candidates"):
+                    payment_rows = payments.candidates({"invoice_id": invoice_id, "status": "completed"})
+                for payment in payment_rows:
+                    if (payment.get("invoice_id") == invoice_id and 
+                        payment.get("status") == "completed"):
+                        total_paid += Decimal(str(payment.get("amount", 0)))
         
         # Calculate percentage
         if commitment_amount > 0:
@@ -529,6 +609,8 @@ class CreateReport(Tool):
                export_period_end: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -621,6 +703,9 @@ class UpdateCommitmentDetails(Tool):
         commitment["status"] = status
         commitment["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(commitments, "reindex"):
+            commitments.reindex(str(commitment_id))
+        
         return json.dumps(commitment)
 
     @staticmethod
@@ -669,6 +754,9 @@ class UpdateInvoice(Tool):
         invoice["status"] = status
         invoice["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(invoices, "reindex"):
+            invoices.reindex(str(invoice_id))
+        
         return json.dumps(invoice)
 
     @staticmethod
@@ -722,6 +810,9 @@ class UpdatePaymentDetails(Tool):
         payment["payment_method"] = payment_method
         payment["status"] = status
         
+        if hasattr(payments, "reindex"):
+            payments.reindex(str(payment_id))
+        
         return json.dumps(payment)
 
     @staticmethod
@@ -757,6 +848,8 @@ class SendEmailNotification(Tool):
                reference_id: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -821,6 +914,8 @@ class CreateCommitment(Tool):
                commitment_amount: str, currency: str, commitment_date: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -894,6 +989,8 @@ class IssueInvoice(Tool):
                amount: str, currency: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -976,6 +1073,8 @@ class RegisterPayment(Tool):
                amount: str, payment_method: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -1076,6 +1175,8 @@ class CreateTicket(Tool):
                type: str, status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -11,7 +11,16 @@ class RetrieveReports(Tool):
         if not filters:
             filters = {}
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates({
+                "report_id": filters.get("report_id"),
+                "fund_id": filters.get("fund_id"),
+                "investor_id": filters.get("investor_id"),
+            })
+        
+        for report in rows:
             # Apply filters
             if filters.get("report_id") and report.get("report_id") != filters["report_id"]:
                 continue
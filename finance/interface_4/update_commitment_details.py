@@ -21,6 +21,9 @@ class UpdateCommitmentDetails(Tool):
         commitment["status"] = status
         commitment["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(commitments, "reindex"):
+            commitments.reindex(str(commitment_id))
+        
         return json.dumps(commitment)
 
     @staticmethod
@@ -22,6 +22,9 @@ class UpdateInvoice(Tool):
         invoice["status"] = status
         invoice["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(invoices, "reindex"):
+            invoices.reindex(str(invoice_id))
+        
         return json.dumps(invoice)
 
     @staticmethod
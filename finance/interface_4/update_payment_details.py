@@ -26,6 +26,9 @@ class UpdatePaymentDetails(Tool):
         payment["payment_method"] = payment_method
         payment["status"] = status
         
+        if hasattr(payments, "reindex"):
+            payments.reindex(str(payment_id))
+        
         return json.dumps(payment)
 
     @staticmethod
@@ -8,28 +8,43 @@ class FetchInvestorPortfolio(Tool):
         portfolios = data.get("portfolios", {})
         portfolio_holdings = data.get("portfolio_holdings", {})
         instruments = data.get("instruments", {})
+        holdings_view = getattr(data, "holdings_view", None)
+        
+        if holdings_view is not None:
+            # Portfolios and holdings of the investor are maintained by the holdings view
+            portfolio_pairs = holdings_view.investor_holdings(investor_id)
+        else:
+            # Find portfolios for the investor (scans narrowed through secondary indexes when available)
+            portfolio_pairs = []
+            portfolio_rows = portfolios.values()
+            if hasattr(portfolios, "candidates"):
+                portfolio_rows = portfolios.candidates({"investor_id": investor_id})
+            for portfolio in portfolio_rows:
+                if portfolio.get("investor_id") == investor_id:
+                    # Get holdings for this portfolio
+                    holding_rows = portfolio_holdings.values()
+                    if hasattr(portfolio_holdings, "candidates"):
+                        holding_rows = portfolio_holdings.candidates({"portfolio_id": portfolio.get("portfolio_id")})
+                    portfolio_pairs.append((portfolio, [holding for holding in holding_rows
+                                                        if holding.get("portfolio_id") == portfolio.get("portfolio_id")]))
         
-        # Find portfolios for the investor
         investor_portfolios = []
-        for portfolio in portfolios.values():
-            if portfolio.get("investor_id") == investor_id:
-                portfolio_with_holdings = portfolio.copy()
+        for portfolio, portfolio_holding_rows in portfolio_pairs:
+            portfolio_with_holdings = portfolio.copy()
+            
+            holdings = []
+            for holding in portfolio_holding_rows:
+                holding_with_instrument = holding.copy()
                 
-                # Get holdings for this portfolio
-                holdings = []
-                for holding in portfolio_holdings.values():
-                    if holding.get("portfolio_id") == portfolio.get("portfolio_id"):
-                        holding_with_instrument = holding.copy()
-                        
-                        # Add instrument details
-                        instrument_id = holding.get("instrument_id")
-                        if instrument_id and str(instrument_id) in instruments:
-                            holding_with_instrument["instrument"] = instruments[str(instrument_id)]
-                        
-                        holdings.append(holding_with_instrument)
+                # Add instrument details
+                instrument_id = holding.get("instrument_id")
+                if instrument_id and str(instrument_id) in instruments:
+                    holding_with_instrument["instrument"] = instruments[str(instrument_id)]
                 
-                portfolio_with_holdings["holdings"] = holdings
-                investor_portfolios.append(portfolio_with_holdings)
+                holdings.append(holding_with_instrument)
+            
+            portfolio_with_holdings["holdings"] = holdings
+            investor_portfolios.append(portfolio_with_holdings)
         
         return json.dumps(investor_portfolios)
 
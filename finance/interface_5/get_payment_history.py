@@ -5,24 +5,37 @@ from tau_bench.envs.tool import Tool
 class GetPaymentHistory(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], invoice_id: Optional[str] = None,
-               investor_id: Optional[str] = None, fund_id: Optional[str] = None) -> str:
+               investor_id: Optional[str] = None, fund_id: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
+        if cursor is not None and limit is None:
+            raise ValueError("cursor requires limit")
         payments = data.get("payments", {})
         invoices = data.get("invoices", {})
         results = []
         
-        # Get relevant invoice IDs based on filters
+        # Get relevant invoice IDs based on filters (narrowed through secondary indexes when available)
         relevant_invoice_ids = set()
         
         if invoice_id:
             relevant_invoice_ids.add(invoice_id)
         else:
-            for invoice in invoices.values():
+            invoice_rows = invoices.values()
+            if hasattr(invoices, "candidates"):
+                invoice_rows = invoices.candidates({"investor_id": investor_id, "fund_id": fund_id})
+            for invoice in invoice_rows:
                 if investor_id and invoice.get("investor_id") != investor_id:
                     continue
                 if fund_id and invoice.get("fund_id") != fund_id:
                     continue
                 relevant_invoice_ids.add(invoice.get("invoice_id"))
         
+        if limit is not None:
+            # Paginated: resume after the last payment of the previous page
+            from DB_runtime.streaming import paginate
+            query = {"invoice_id": invoice_id, "investor_id": investor_id, "fund_id": fund_id}
+            return json.dumps(paginate(payments, lambda payment: payment.get("invoice_id") in relevant_invoice_ids,
+                                       limit, cursor, query))
+        
         # Filter payments by relevant invoices
         for payment in payments.values():
             if payment.get("invoice_id") in relevant_invoice_ids:
@@ -42,7 +55,9 @@ class GetPaymentHistory(Tool):
                     "properties": {
                         "invoice_id": {"type": "string", "description": "Filter by invoice ID"},
                         "investor_id": {"type": "string", "description": "Filter by investor ID"},
-                        "fund_id": {"type": "string", "description": "Filter by fund ID"}
+                        "fund_id": {"type": "string", "description": "Filter by fund ID"},
+                        "limit": {"type": "integer", "description": "Maximum number of payments to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -10,7 +10,12 @@ class GetReports(Tool):
         reports = data.get("reports", {})
         results = []
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for report in rows:
             if fund_id and report.get("fund_id") != fund_id:
                 continue
             if investor_id and report.get("investor_id") != investor_id:
@@ -10,7 +10,12 @@ class GetTickets(Tool):
         tickets = data.get("tickets", {})
         results = []
         
-        for ticket in tickets.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = tickets.values()
+        if hasattr(tickets, "candidates"):
+            rows = tickets.candidates({"ticket_id": ticket_id, "invoice_id": invoice_id})
+        
+        for ticket in rows:
             if ticket_id and ticket.get("ticket_id") != ticket_id:
                 continue
             if invoice_id and ticket.get("invoice_id") != invoice_id:
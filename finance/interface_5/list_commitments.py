@@ -10,7 +10,16 @@ class ListCommitments(Tool):
         commitments = data.get("commitments", {})
         results = []
         
-        for commitment in commitments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = commitments.values()
+        if hasattr(commitments, "candidates"):
+            rows = commitments.candidates({
+                "commitment_id": commitment_id,
+                "investor_id": investor_id,
+                "fund_id": fund_id,
+            })
+        
+        for commitment in rows:
             if commitment_id and commitment.get("commitment_id") != commitment_id:
                 continue
             if investor_id and commitment.get("investor_id") != investor_id:
@@ -39,6 +39,9 @@ class ModifySubscription(Tool):
         
         subscription["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(subscriptions, "reindex"):
+            subscriptions.reindex(str(subscription_id))
+        
         return json.dumps(subscription)
 
     @staticmethod
@@ -118,13 +118,16 @@ class RetrieveInvestorWithSubscriptions(Tool):
                 continue
             matching_investors.append(investor)
         
-        # Add subscriptions to each matching investor
+        # Add subscriptions to each matching investor, narrowed through secondary indexes when available
         results = []
         for investor in matching_investors:
             investor_with_subs = investor.copy()
             investor_subs = []
             
-            for subscription in subscriptions.values():
+            subscription_rows = subscriptions.values()
+            if hasattr(subscriptions, "candidates"):
+                subscription_rows = subscriptions.candidates({"investor_id": investor.get("investor_id")})
+            for subscription in subscription_rows:
                 if subscription.get("investor_id") == investor.get("investor_id"):
                     if subscription_id and subscription.get("subscription_id") != subscription_id:
                         continue
@@ -171,7 +174,16 @@ class ListCommitments(Tool):
         commitments = data.get("commitments", {})
         results = []
         
-        for commitment in commitments.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = commitments.values()
+        if hasattr(commitments, "candidates"):
+            rows = commitments.candidates({
+                "commitment_id": commitment_id,
+                "investor_id": investor_id,
+                "fund_id": fund_id,
+            })
+        
+        for commitment in rows:
             if commitment_id and commitment.get("commitment_id") != commitment_id:
                 continue
             if investor_id and commitment.get("investor_id") != investor_id:
@@ -221,7 +233,12 @@ class RetrieveInvoices(Tool):
         invoices = data.get("invoices", {})
         results = []
         
-        for invoice in invoices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = invoices.values()
+        if hasattr(invoices, "candidates"):
+            rows = invoices.candidates({"investor_id": investor_id, "fund_id": fund_id})
+        
+        for invoice in rows:
             if investor_id and invoice.get("investor_id") != investor_id:
                 continue
             if fund_id and invoice.get("fund_id") != fund_id:
@@ -261,24 +278,37 @@ from tau_bench.envs.tool import Tool
 class GetPaymentHistory(Tool):
     @staticmethod
     def invoke(data: Dict[str, Any], invoice_id: Optional[str] = None,
-               investor_id: Optional[str] = None, fund_id: Optional[str] = None) -> str:
+               investor_id: Optional[str] = None, fund_id: Optional[str] = None,
+               limit: Optional[int] = None, cursor: Optional[str] = None) -> str:
+        if cursor is not None and limit is None:
+            raise ValueError("cursor requires limit")
         payments = data.get("payments", {})
         invoices = data.get("invoices", {})
         results = []
         
-        # Get relevant invoice IDs based on filters
+        # Get relevant invoice IDs based on filters (narrowed through secondary indexes when available)
         relevant_invoice_ids = set()
         
         if invoice_id:
             relevant_invoice_ids.add(invoice_id)
         else:
-            for invoice in invoices.values():
+            invoice_rows = invoices.values()
+            if hasattr(invoices, "candidates"):
+                invoice_rows = invoices.candidates({"investor_id": investor_id, "fund_id": fund_id})
+            for invoice in invoice_rows:
                 if investor_id and invoice.get("investor_id") != investor_id:
                     continue
                 if fund_id and invoice.get("fund_id") != fund_id:
                     continue
                 relevant_invoice_ids.add(invoice.get("invoice_id"))
         
+        if limit is not None:
+            # Paginated: resume after the last payment of the previous page
+            from DB_runtime.streaming import paginate
+            query = {"invoice_id": invoice_id, "investor_id": investor_id, "fund_id": fund_id}
+            return json.dumps(paginate(payments, lambda payment: payment.get("invoice_id") in relevant_invoice_ids,
+                                       limit, cursor, query))
+        
         # Filter payments by relevant invoices
         for payment in payments.values():
             if payment.get("invoice_id") in relevant_invoice_ids:
@@ -298,7 +328,9 @@ class GetPaymentHistory(Tool):
                     "properties": {
                         "invoice_id": {"type": "string", "description": "Filter by invoice ID"},
                         "investor_id": {"type": "string", "description": "Filter by investor ID"},
-                        "fund_id": {"type": "string", "description": "Filter by fund ID"}
+                        "fund_id": {"type": "string", "description": "Filter by fund ID"},
+                        "limit": {"type": "integer", "description": "Maximum number of payments to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": []
                 }
@@ -320,7 +352,12 @@ class GetTickets(Tool):
         tickets = data.get("tickets", {})
         results = []
         
-        for ticket in tickets.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = tickets.values()
+        if hasattr(tickets, "candidates"):
+            rows = tickets.candidates({"ticket_id": ticket_id, "invoice_id": invoice_id})
+        
+        for ticket in rows:
             if ticket_id and ticket.get("ticket_id") != ticket_id:
                 continue
             if invoice_id and ticket.get("invoice_id") != invoice_id:
@@ -368,7 +405,12 @@ class GetReports(Tool):
         reports = data.get("reports", {})
         results = []
         
-        for report in reports.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = reports.values()
+        if hasattr(reports, "candidates"):
+            rows = reports.candidates({"fund_id": fund_id, "investor_id": investor_id})
+        
+        for report in rows:
             if fund_id and report.get("fund_id") != fund_id:
                 continue
             if investor_id and report.get("investor_id") != investor_id:
@@ -414,28 +456,43 @@ class FetchInvestorPortfolio(Tool):
         portfolios = data.get("portfolios", {})
         portfolio_holdings = data.get("portfolio_holdings", {})
         instruments = data.get("instruments", {})
+        holdings_view = getattr(data, "holdings_view", None)
+        
+        if holdings_view is not None:
+            # Portfolios and holdings of the investor are maintained by the holdings view
+            portfolio_pairs = holdings_view.investor_holdings(investor_id)
+        else:
+            # Find portfolios for the investor (scans narrowed through secondary indexes when available)
+            portfolio_pairs = []
+            portfolio_rows = portfolios.values()
+            if hasattr(portfolios, "candidates"):
+                portfolio_rows = portfolios.candidates({"investor_id": investor_id})
+            for portfolio in portfolio_rows:
+                if portfolio.get("investor_id") == investor_id:
+                    # Get holdings for this portfolio
+                    holding_rows = portfolio_holdings.values()
+                    if hasattr(portfolio_holdings, "candidates"):
+                        holding_rows = portfolio_holdings.candidates({"portfolio_id": portfolio.get("portfolio_id")})
+                    portfolio_pairs.append((portfolio, [holding for holding in holding_rows
+                                                        if holding.get("portfolio_id") == portfolio.get("portfolio_id")]))
         
-        # Find portfolios for the investor
         investor_portfolios = []
-        for portfolio in portfolios.values():
-            if portfolio.get("investor_id") == investor_id:
-                portfolio_with_holdings = portfolio.copy()
+        for portfolio, portfolio_holding_rows in portfolio_pairs:
+            portfolio_with_holdings = portfolio.copy()
+            
+            holdings = []
+            for holding in portfolio_holding_rows:
+                holding_with_instrument = holding.copy()
                 
-                # Get holdings for this portfolio
-                holdings = []
-                for holding in portfolio_holdings.values():
-                    if holding.get("portfolio_id") == portfolio.get("portfolio_id"):
-                        holding_with_instrument = holding.copy()
-                        
-                        # Add instrument details
-                        instrument_id = holding.get("instrument_id")
-                        if instrument_id and str(instrument_id) in instruments:
-                            holding_with_instrument["instrument"] = instruments[str(instrument_id)]
-                        
-                        holdings.append(holding_with_instrument)
+                # Add instrument details
+                instrument_id = holding.get("instrument_id")
+                if instrument_id and str(instrument_id) in instruments:
+                    holding_with_instrument["instrument"] = instruments[str(instrument_id)]
                 
-                portfolio_with_holdings["holdings"] = holdings
-                investor_portfolios.append(portfolio_with_holdings)
+                holdings.append(holding_with_instrument)
+            
+            portfolio_with_holdings["holdings"] = holdings
+            investor_portfolios.append(portfolio_with_holdings)
         
         return json.dumps(investor_portfolios)
 
@@ -460,27 +517,37 @@ EOF
 # 10. RetrieveNotifications
 cat > db_tools/retrieve_notifications.py << 'EOF'
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
 class RetrieveNotifications(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], filters: Dict[str, Any]) -> str:
+    def invoke(data: Dict[str, Any], filters: Dict[str, Any], limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> str:
         notifications = data.get("notifications", {})
-        results = []
         
-        for notification in notifications.values():
-            match = True
-            
+        def matches(notification: Dict[str, Any]) -> bool:
             for key, value in filters.items():
                 if key in notification and notification[key] != value:
-                    match = False
-                    break
-            
-            if match:
-                results.append(notification)
-        
-        return json.dumps(results)
+                    return False
+            return True
+        
+        # Narrow the scan through secondary indexes when the table has them
+        # (rows lacking a filtered key still match, so they are kept as candidates)
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            rows = notifications.values()
+            if hasattr(notifications, "candidates"):
+                rows = notifications.candidates(filters, include_missing=True)
+            return json.dumps([notification for notification in rows if matches(notification)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(notifications, "candidate_items"):
+            items = notifications.candidate_items(filters, include_missing=True)
+        return json.dumps(paginate(notifications, matches, limit, cursor, {"filters": filters}, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -502,7 +569,9 @@ class RetrieveNotifications(Tool):
                                 "reference_id": {"type": "string", "description": "Filter by reference ID"},
                                 "status": {"type": "string", "description": "Filter by status (pending, sent, failed)"}
                             }
-                        }
+                        },
+                        "limit": {"type": "integer", "description": "Maximum number of notifications to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": ["filters"]
                 }
@@ -524,6 +593,8 @@ class CreateFund(Tool):
                manager_id: str, size: str, status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -603,6 +674,8 @@ class RecordPayment(Tool):
                amount: str, payment_method: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -668,6 +741,8 @@ class CreateInvestor(Tool):
                investor_type: str, contact_email: str, accreditation_status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -740,6 +815,8 @@ class CreateInvoice(Tool):
                amount: str, currency: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -822,6 +899,8 @@ class SubmitTicket(Tool):
                type: str, status: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -895,6 +974,8 @@ class AddSubscription(Tool):
                request_date: str) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -1044,6 +1125,9 @@ class ModifySubscription(Tool):
         
         subscription["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(subscriptions, "reindex"):
+            subscriptions.reindex(str(subscription_id))
+        
         return json.dumps(subscription)
 
     @staticmethod
@@ -1107,6 +1191,9 @@ class UpdateTicket(Tool):
         
         ticket["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(tickets, "reindex"):
+            tickets.reindex(str(ticket_id))
+        
         return json.dumps(ticket)
 
     @staticmethod
@@ -1142,6 +1229,8 @@ class SendUpdatesViaEmail(Tool):
                message_body: str, reference_id: Optional[str] = None) -> str:
         
         def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
             if not table:
                 return 1
             return max(int(k) for k in table.keys()) + 1
@@ -1188,7 +1277,108 @@ class SendUpdatesViaEmail(Tool):
         }
 EOF
 
-echo "All 20 database tools have been created successfully!"
+# 21. RecordPayments
+cat > db_tools/record_payments.py << 'EOF'
+import json
+from typing import Any, Dict, List
+from tau_bench.envs.tool import Tool
+
+class RecordPayments(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], payments: List[Dict[str, Any]]) -> str:
+        
+        def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
+            if not table:
+                return 1
+            return max(int(k) for k in table.keys()) + 1
+        
+        payment_table = data.get("payments", {})
+        invoices = data.get("invoices", {})
+        
+        required_fields = ["invoice_id", "payment_date", "amount", "payment_method"]
+        valid_methods = ["wire", "cheque", "credit_card", "bank_transfer"]
+        
+        # Validate every record against the referenced tables in one pass
+        accepted = []
+        errors = []
+        for index, payment in enumerate(payments):
+            if not isinstance(payment, dict):
+                errors.append({"index": index, "error": "Payment record must be an object"})
+                continue
+            missing = [field for field in required_fields if field not in payment]
+            unexpected = [field for field in payment if field not in required_fields]
+            if missing:
+                errors.append({"index": index, "error": f"Missing required fields: {missing}"})
+            elif unexpected:
+                errors.append({"index": index, "error": f"Unexpected fields: {unexpected}"})
+            elif str(payment["invoice_id"]) not in invoices:
+                errors.append({"index": index, "error": f"Invoice {payment['invoice_id']} not found"})
+            elif payment["payment_method"] not in valid_methods:
+                errors.append({"index": index, "error": f"Invalid payment_method. Must be one of {valid_methods}"})
+            else:
+                accepted.append((index, payment))
+        
+        # Allocate the IDs of all accepted records in one block; sequential
+        # calls would hand out the same consecutive IDs
+        created = []
+        if accepted:
+            try:
+                next_id = generate_id(payment_table)
+            except ValueError as e:
+                errors.extend({"index": index, "error": str(e)} for index, _ in accepted)
+                accepted = []
+            timestamp = "2025-10-01T00:00:00"
+            for offset, (index, payment) in enumerate(accepted):
+                payment_id = next_id + offset
+                new_payment = {
+                    "payment_id": str(payment_id),
+                    "invoice_id": payment["invoice_id"],
+                    "payment_date": payment["payment_date"],
+                    "amount": payment["amount"],
+                    "payment_method": payment["payment_method"],
+                    "status": "completed",
+                    "created_at": timestamp
+                }
+                payment_table[str(payment_id)] = new_payment
+                created.append(new_payment)
+        
+        errors.sort(key=lambda error: error["index"])
+        return json.dumps({"created": created, "errors": errors})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "record_payments",
+                "description": "Record several new payments for invoices in one call; invalid records are reported per index and skipped",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "payments": {
+                            "type": "array",
+                            "description": "Payments to record",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "invoice_id": {"type": "string", "description": "ID of the invoice"},
+                                    "payment_date": {"type": "string", "description": "Payment date"},
+                                    "amount": {"type": "string", "description": "Payment amount"},
+                                    "payment_method": {"type": "string", "description": "Payment method (wire, cheque, credit_card, bank_transfer)"}
+                                },
+                                "required": ["invoice_id", "payment_date", "amount", "payment_method"]
+                            }
+                        }
+                    },
+                    "required": ["payments"]
+                }
+            }
+        }
+EOF
+
+echo "All 21 database tools have been created successfully!"
 echo "Files created in db_tools/ directory:"
 echo "Read APIs:"
 echo "  - get_user_information.py"
@@ -1212,4 +1402,5 @@ echo "  - add_subscription.py"
 echo "  - delete_invoice.py"
 echo "  - modify_subscription.py"
 echo "  - update_ticket.py"
-echo "  - send_updates_via_email.py"
\ No newline at end of file
+echo "  - send_updates_via_email.py"
+echo "  - record_payments.py"
\ No newline at end of file
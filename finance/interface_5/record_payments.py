@@ -0,0 +1,97 @@
+import json
+from typing import Any, Dict, List
+from tau_bench.envs.tool import Tool
+
+class RecordPayments(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], payments: List[Dict[str, Any]]) -> str:
+        
+        def generate_id(table: Dict[str, Any]) -> int:
+            if hasattr(table, "next_id"):
+                return table.next_id()
+            if not table:
+                return 1
+            return max(int(k) for k in table.keys()) + 1
+        
+        payment_table = data.get("payments", {})
+        invoices = data.get("invoices", {})
+        
+        required_fields = ["invoice_id", "payment_date", "amount", "payment_method"]
+        valid_methods = ["wire", "cheque", "credit_card", "bank_transfer"]
+        
+        # Validate every record against the referenced tables in one pass
+        accepted = []
+        errors = []
+        for index, payment in enumerate(payments):
+            if not isinstance(payment, dict):
+                errors.append({"index": index, "error": "Payment record must be an object"})
+                continue
+            missing = [field for field in required_fields if field not in payment]
+            unexpected = [field for field in payment if field not in required_fields]
+            if missing:
+                errors.append({"index": index, "error": f"Missing required fields: {missing}"})
+            elif unexpected:
+                errors.append({"index": index, "error": f"Unexpected fields: {unexpected}"})
+            elif str(payment["invoice_id"]) not in invoices:
+                errors.append({"index": index, "error": f"Invoice {payment['invoice_id']} not found"})
+            elif payment["payment_method"] not in valid_methods:
+                errors.append({"index": index, "error": f"Invalid payment_method. Must be one of {valid_methods}"})
+            else:
+                accepted.append((index, payment))
+        
+        # Allocate the IDs of all accepted records in one block; sequential
+        # calls would hand out the same consecutive IDs
+        created = []
+        if accepted:
+            try:
+                next_id = generate_id(payment_table)
+            except ValueError as e:
+                errors.extend({"index": index, "error": str(e)} for index, _ in accepted)
+                accepted = []
+            timestamp = "2025-10-01T00:00:00"
+            for offset, (index, payment) in enumerate(accepted):
+                payment_id = next_id + offset
+                new_payment = {
+                    "payment_id": str(payment_id),
+                    "invoice_id": payment["invoice_id"],
+                    "payment_date": payment["payment_date"],
+                    "amount": payment["amount"],
+                    "payment_method": payment["payment_method"],
+                    "status": "completed",
+                    "created_at": timestamp
+                }
+                payment_table[str(payment_id)] = new_payment
+                created.append(new_payment)
+        
+        errors.sort(key=lambda error: error["index"])
+        return json.dumps({"created": created, "errors": errors})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "record_payments",
+                "description": "Record several new payments for invoices in one call; invalid records are reported per index and skipped",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "payments": {
+                            "type": "array",
+                            "description": "Payments to record",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "invoice_id": {"type": "string", "description": "ID of the invoice"},
+                                    "payment_date": {"type": "string", "description": "Payment date"},
+                                    "amount": {"type": "string", "description": "Payment amount"},
+                                    "payment_method": {"type": "string", "description": "Payment method (wire, cheque, credit_card, bank_transfer)"}
+                                },
+                                "required": ["invoice_id", "payment_date", "amount", "payment_method"]
+                            }
+                        }
+                    },
+                    "required": ["payments"]
+                }
+            }
+        }
@@ -23,13 +23,16 @@ class RetrieveInvestorWithSubscriptions(Tool):
                 continue
             matching_investors.append(investor)
         
-        # Add subscriptions to each matching investor
+        # Add subscriptions to each matching investor, narrowed through secondary indexes when available
         results = []
         for investor in matching_investors:
             investor_with_subs = investor.copy()
             investor_subs = []
             
-            for subscription in subscriptions.values():
+            subscription_rows = subscriptions.values()
+            if hasattr(subscriptions, "candidates"):
+                subscription_rows = subscriptions.candidates({"investor_id": investor.get("investor_id")})
+            for subscription in subscription_rows:
                 if subscription.get("investor_id") == investor.get("investor_id"):
                     if subscription_id and subscription.get("subscription_id") != subscription_id:
                         continue
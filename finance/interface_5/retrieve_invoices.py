@@ -9,7 +9,12 @@ class RetrieveInvoices(Tool):
         invoices = data.get("invoices", {})
         results = []
         
-        for invoice in invoices.values():
+        # Narrow the scan through secondary indexes when the table has them
+        rows = invoices.values()
+        if hasattr(invoices, "candidates"):
+            rows = invoices.candidates({"investor_id": investor_id, "fund_id": fund_id})
+        
+        for invoice in rows:
             if investor_id and invoice.get("investor_id") != investor_id:
                 continue
             if fund_id and invoice.get("fund_id") != fund_id:
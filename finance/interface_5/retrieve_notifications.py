@@ -1,25 +1,35 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
 class RetrieveNotifications(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], filters: Dict[str, Any]) -> str:
+    def invoke(data: Dict[str, Any], filters: Dict[str, Any], limit: Optional[int] = None,
+               cursor: Optional[str] = None) -> str:
         notifications = data.get("notifications", {})
-        results = []
         
-        for notification in notifications.values():
-            match = True
-            
+        def matches(notification: Dict[str, Any]) -> bool:
             for key, value in filters.items():
                 if key in notification and notification[key] != value:
-                    match = False
-                    break
-            
-            if match:
-                results.append(notification)
+                    return False
+            return True
         
-        return json.dumps(results)
+        # Narrow the scan through secondary indexes when the table has them
+        # (rows lacking a filtered key still match, so they are kept as candidates)
+        if limit is None:
+            if cursor is not None:
+                raise ValueError("cursor requires limit")
+            rows = notifications.values()
+            if hasattr(notifications, "candidates"):
+                rows = notifications.candidates(filters, include_missing=True)
+            return json.dumps([notification for notification in rows if matches(notification)])
+        
+        # Paginated: resume after the last row of the previous page
+        from DB_runtime.streaming import paginate
+        items = None
+        if hasattr(notifications, "candidate_items"):
+            items = notifications.candidate_items(filters, include_missing=True)
+        return json.dumps(paginate(notifications, matches, limit, cursor, {"filters": filters}, items))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -41,7 +51,9 @@ class RetrieveNotifications(Tool):
                                 "reference_id": {"type": "string", "description": "Filter by reference ID"},
                                 "status": {"type": "string", "description": "Filter by status (pending, sent, failed)"}
                             }
-                        }
+                        },
+                        "limit": {"type": "integer", "description": "Maximum number of notifications to return; the response then becomes {\"results\": [...], \"next_cursor\": ...}"},
+                        "cursor": {"type": "string", "description": "next_cursor from a previous paginated call, to fetch the following page"}
                     },
                     "required": ["filters"]
                 }
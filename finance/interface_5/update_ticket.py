@@ -36,6 +36,9 @@ class UpdateTicket(Tool):
         
         ticket["updated_at"] = "2025-10-01T00:00:00"
         
+        if hasattr(tickets, "reindex"):
+            tickets.reindex(str(ticket_id))
+        
         return json.dumps(ticket)
 
     @staticmethod